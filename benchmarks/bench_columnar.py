@@ -0,0 +1,92 @@
+"""
+Бенчмарк аналитических запросов по году и статусу: циклы Python по объектам Book
+(как до появления ColumnarView) и ColumnarView.
+
+Агрегаты (количество книг по десятилетиям, количество выданных книг, количество
+доступных книг 2000-2010 годов) вычисляются по таблице счетчиков и не зависят от
+NumPy; отбор ID доступных книг 2000-2010 годов сравнивается с NumPy и без него.
+Дополнительно измеряется построение представления и стоимость его
+инкрементального обновления (добавление, изменение статуса, удаление).
+
+Запуск:
+    python -m benchmarks.bench_columnar [количество книг]
+"""
+import sys
+import time
+from collections import Counter
+from library.catalog import BookCatalog
+from library.columnar import ColumnarView, numpy
+from library.models import STATUS_AVAILABLE, STATUS_BORROWED, Book
+from benchmarks.catalog_generator import generate_books
+
+
+def best_time(function, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def object_aggregates(books: list[Book]) -> tuple:
+    """
+    Агрегаты циклами Python по объектам Book.
+    """
+    decades = Counter(book.year // 10 * 10 for book in books)
+    borrowed = sum(1 for book in books if book.status_code == STATUS_BORROWED)
+    available = sum(1 for book in books if book.status_code == STATUS_AVAILABLE and 2000 <= book.year <= 2010)
+    return dict(sorted(decades.items())), borrowed, available
+
+
+def object_filter(books: list[Book]) -> list[int]:
+    return [book.id for book in books if book.status_code == STATUS_AVAILABLE and 2000 <= book.year <= 2010]
+
+
+def view_aggregates(view: ColumnarView) -> tuple:
+    return view.histogram(10), view.count(status="borrowed"), view.count(2000, 2010, "available")
+
+
+def report(name: str, seconds: float, baseline: float) -> None:
+    print(f"{name:<28} {seconds * 1000:>10.3f} ms   x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    books = list(generate_books(count))
+    print(f"Books: {count}, NumPy: {numpy.__version__ if numpy is not None else 'not installed'}")
+
+    started = time.perf_counter()
+    view = ColumnarView(books, use_numpy=False)
+    build = time.perf_counter() - started
+    row_bytes = view.ids.itemsize + view.years.itemsize + view.statuses.itemsize
+    print(f"Columns built in {build:.1f} s, {row_bytes * len(view) / 2 ** 20:.0f} MiB ({row_bytes} bytes/row)")
+
+    expected = object_aggregates(books)
+    baseline = best_time(lambda: object_aggregates(books), repeat=1)
+    print(f"{'aggregates, Book objects':<28} {baseline * 1000:>10.3f} ms")
+    assert view_aggregates(view) == expected
+    report("aggregates, ColumnarView", best_time(lambda: view_aggregates(view), repeat=5), baseline)
+
+    expected = object_filter(books)
+    baseline = best_time(lambda: object_filter(books), repeat=1)
+    print(f"{'filter, Book objects':<28} {baseline * 1000:>10.3f} ms   ({len(expected)} IDs)")
+    backends = [("filter, columns + Python", False)] + ([("filter, columns + NumPy", True)] if numpy else [])
+    for name, use_numpy in backends:
+        view.use_numpy = use_numpy
+        assert view.select_ids(2000, 2010, "available") == expected
+        report(name, best_time(lambda: view.select_ids(2000, 2010, "available"), repeat=3), baseline)
+    del books
+
+    # Инкрементальное обновление представления, подключенного к каталогу
+    catalog = BookCatalog(generate_books(100_000))
+    view = ColumnarView()
+    catalog.add_index(view)
+    operations = 10_000
+    started = time.perf_counter()
+    for i in range(operations):
+        catalog.append(Book(catalog.allocate_id(), f"Title {i}", "Author", 2000))
+        catalog.update_status(i + 1, "borrowed")
+        catalog.remove_by_id(50_000 + i)
+    per_operation = (time.perf_counter() - started) / (3 * operations)
+    print(f"Incremental updates (catalog with indexes): {per_operation * 1e6:.1f} us per add/status/delete")
@@ -0,0 +1,51 @@
+"""
+Бенчмарк политик сохранения: пропускная способность серии изменений статуса
+при сохранении каждого изменения, каждых N изменений и фоновом сохранении раз в T мс.
+
+Запуск:
+    python -m benchmarks.bench_commit [количество книг] [количество изменений]
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from library.library_management import Library
+from library.models import Book
+
+POLICIES = (
+    ("immediate", {}),
+    ("every 10", {"commit_every": 10}),
+    ("every 100", {"commit_every": 100}),
+    ("every 50 ms", {"commit_interval_ms": 50}),
+)
+
+
+def run(books_file: str, changes: int, **policy) -> float:
+    """
+    Выполняет серию изменений статуса и возвращает количество изменений в секунду,
+    включая итоговое сохранение при закрытии.
+    """
+    library = Library(books_file=books_file, **policy)
+    started = time.perf_counter()
+    for i in range(changes):
+        book_id = i % len(library.books) + 1
+        # Статус всегда меняется на противоположный, чтобы каждое изменение сохранялось
+        library.set_status(book_id, "available" if library.get(book_id).status == "borrowed" else "borrowed")
+    library.close()
+    return changes / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    with tempfile.TemporaryDirectory() as directory:
+        books_file = os.path.join(directory, "books.json")
+        with redirect_stdout(None):
+            library = Library(books_file=books_file)
+        library.books.extend(Book(i, f"Title {i}", f"Author {i % 1000}", 1900 + i % 120) for i in range(1, count + 1))
+        library.save_books()
+
+        print(f"Books: {count}, status changes: {changes}")
+        for name, policy in POLICIES:
+            print(f"{name:<12} {run(books_file, changes, **policy):>10.0f} changes/s")
@@ -0,0 +1,69 @@
+"""
+Бенчмарк логирования: операций в секунду при выключенном логировании, синхронной
+записи в файл (прежний basicConfig) и асинхронной записи через очередь (текст и JSON).
+
+Операции (добавление и изменение статуса) пишут отладочную запись на каждый вызов;
+сохранение отложено до конца, чтобы измерялась стоимость логирования, а не диска.
+
+Запуск:
+    python -m benchmarks.bench_logging [количество операций]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from library.library_management import Library
+from library.logging_setup import setup_logging
+
+
+def run(directory: str, operations: int) -> float:
+    """
+    Выполняет операции и возвращает количество операций в секунду.
+    """
+    books_file = os.path.join(directory, "books.json")
+    if os.path.exists(books_file):
+        os.remove(books_file)
+    with redirect_stdout(None):
+        library = Library(books_file=books_file, commit_every=operations * 2)
+    started = time.perf_counter()
+    for i in range(operations // 2):
+        book = library.add(f"Title {i}", "Author", 2000)
+        library.set_status(book.id, "borrowed")
+    elapsed = time.perf_counter() - started
+    library.close()
+    return operations / elapsed
+
+
+def reset_logging() -> None:
+    for handler in logging.root.handlers[:]:
+        logging.root.removeHandler(handler)
+        handler.close()
+
+
+if __name__ == "__main__":
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directory:
+        log_file = os.path.join(directory, "app.log")
+        results = {}
+
+        reset_logging()
+        # NullHandler не дает logging.warning() настроить вывод в stderr автоматически
+        logging.root.addHandler(logging.NullHandler())
+        logging.root.setLevel(logging.CRITICAL)
+        results["off"] = run(directory, operations)
+
+        logging.basicConfig(filename=log_file, level=logging.DEBUG,
+                            format="%(asctime)s - %(levelname)s - %(message)s", force=True)
+        results["sync file"] = run(directory, operations)
+        reset_logging()
+
+        for name, json_format in (("async text", False), ("async json", True)):
+            log_setup = setup_logging(filename=log_file, level=logging.DEBUG, json_format=json_format)
+            results[name] = run(directory, operations)
+            log_setup.shutdown()
+
+    print(f"Operations: {operations}")
+    for name, rate in results.items():
+        print(f"{name:<11} {rate:>10.0f} ops/s")
@@ -0,0 +1,57 @@
+"""
+Бенчмарк памяти: сколько байт занимает одна книга в памяти до и после
+перехода Book на __slots__, коды статусов и интернирование авторов.
+
+Запуск:
+    python -m benchmarks.bench_memory [количество книг]
+"""
+import sys
+import tracemalloc
+from library.models import Book
+
+
+class LegacyBook:
+    """
+    Прежнее представление книги: обычный класс с __dict__ и статусом-строкой.
+    """
+
+    def __init__(self, book_id: int, title: str, author: str, year: int, status: str = "available"):
+        self.id = book_id
+        self.title = title
+        self.author = author
+        self.year = year
+        self.status = status
+
+
+def measure(book_class, count: int) -> float:
+    """
+    Измеряет средний объем памяти на одну книгу.
+
+    Аргументы:
+        book_class: Класс книги (Book или LegacyBook).
+        count (int): Количество создаваемых книг.
+
+    Возвращает:
+        float: Байт на книгу.
+    """
+    tracemalloc.start()
+    books = [
+        # Строки строятся заново для каждой книги, как при разборе JSON
+        book_class(i, f"Title {i}", "".join(["Author ", str(i % 1000)]), 1900 + i % 120,
+                   "".join(["avail", "able"]) if i % 3 else "".join(["borr", "owed"]))
+        for i in range(count)
+    ]
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del books
+    return used / count
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    before = measure(LegacyBook, count)
+    after = measure(Book, count)
+    print(f"Books:          {count}")
+    print(f"Before (dict):  {before:.1f} bytes/book")
+    print(f"After (slots):  {after:.1f} bytes/book")
+    print(f"Saved:          {100 * (1 - after / before):.1f}%")
@@ -0,0 +1,50 @@
+"""
+Бенчмарк накладных расходов метрик: время Library.get у библиотеки, на которой
+метрики ни разу не включались, с включенными метриками и после их выключения
+(обертки сняты).
+
+Замеры чередуются по раундам, и для каждого варианта берется лучшее время:
+если мерить выключенные метрики только после тяжелого прогона с включенными,
+в разницу попадает шум машины (частота процессора, сборка мусора), а не обертки.
+
+Запуск:
+    python -m benchmarks.bench_metrics [количество вызовов] [раунды]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from contextlib import redirect_stdout
+from library.library_management import Library
+from library.models import Book
+
+
+def make_library(directory: str) -> Library:
+    with redirect_stdout(None):
+        library = Library(books_file=os.path.join(directory, "books.json"))
+    library.books.extend(Book(i, f"Title {i}", "Author", 2000) for i in range(1, 1001))
+    return library
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = make_library(directory)
+        library = make_library(directory)
+
+    def measure(target: Library) -> float:
+        return min(timeit.repeat(lambda: target.get(500), number=calls, repeat=3))
+
+    disabled = enabled = disabled_again = float("inf")
+    for _ in range(rounds):
+        disabled = min(disabled, measure(baseline))
+        library.metrics.enable()
+        enabled = min(enabled, measure(library))
+        library.metrics.disable()
+        disabled_again = min(disabled_again, measure(library))
+
+    print(f"Calls: {calls}, rounds: {rounds}")
+    print(f"{'metrics never enabled':<28} {disabled / calls * 1e9:8.0f} ns/call")
+    for name, seconds in (("metrics enabled", enabled), ("disabled again (unwrapped)", disabled_again)):
+        print(f"{name:<28} {seconds / calls * 1e9:8.0f} ns/call ({(seconds / disabled - 1) * 100:+.1f}%)")
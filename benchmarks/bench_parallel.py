@@ -0,0 +1,57 @@
+"""
+Бенчмарк параллельного поиска по шардам: время запросов, требующих просмотра
+всего каталога, в одном процессе (filter_books) и в ShardedSearch с 1..N процессами.
+
+Ускорение ограничено количеством ядер: на одном ядре параллельный поиск
+медленнее последовательного из-за передачи результатов между процессами.
+
+Запуск:
+    python -m benchmarks.bench_parallel [количество книг] [наибольшее количество процессов]
+"""
+import os
+import sys
+import time
+from benchmarks.catalog_generator import generate_books
+from library.catalog import BookCatalog
+from library.parallel_search import ShardedSearch
+import library.helper_functions as helper_functions
+
+# Запросы короче триграммы и широкий диапазон лет не сужаются индексами
+QUERIES = (("title", "wa"), ("author", "ol"), ("year", ">=1900"))
+
+
+def best_time(function, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_queries(search) -> None:
+    for search_type, query in QUERIES:
+        search(search_type, query)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    books = BookCatalog(generate_books(count))
+    print(f"Books: {count}, CPU cores: {os.cpu_count()}, queries per run: {len(QUERIES)}")
+
+    serial = best_time(lambda: run_queries(lambda search_type, query:
+                                           helper_functions.filter_books(books, search_type, query)))
+    print(f"{'serial':<12} {serial * 1000:>10.1f} ms")
+
+    workers = 1
+    while workers <= max_workers:
+        search = ShardedSearch(workers=workers, min_size=0)
+        started = time.perf_counter()
+        search.search(books, "title", "wa")
+        sharding = time.perf_counter() - started
+        seconds = best_time(lambda: run_queries(lambda search_type, query: search.search(books, search_type, query)))
+        search.close()
+        print(f"{workers:>2} workers   {seconds * 1000:>10.1f} ms   x{serial / seconds:.2f}   "
+              f"(sharding {sharding:.1f} s)")
+        workers *= 2
@@ -0,0 +1,138 @@
+"""
+Нагрузочный тест HTTP-сервера библиотеки: запросов в секунду и задержки p50/p99.
+
+Если адрес не указан, сервер запускается в отдельном потоке поверх временного
+каталога со сгенерированными книгами. Клиенты используют keep-alive соединения.
+
+Запуск:
+    python -m benchmarks.bench_server [--connections 32] [--requests 20000] [--write-ratio 0.1]
+    python -m benchmarks.bench_server --target 127.0.0.1:8080
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from library.library_management import Library
+from library.models import Book
+from library.server import LibraryServer
+
+
+def start_server(book_count: int, books_file: str) -> tuple[LibraryServer, asyncio.AbstractEventLoop]:
+    """
+    Запускает сервер в отдельном потоке со своим циклом событий.
+
+    Возвращает:
+        tuple[LibraryServer, asyncio.AbstractEventLoop]: Сервер и его цикл событий.
+    """
+    with redirect_stdout(None):
+        library = Library(books_file=books_file)
+    library.books.extend(
+        Book(i, f"Title {i}", f"Author {i % 1000}", 1900 + i % 120) for i in range(1, book_count + 1)
+    )
+    library.save_books()
+    server = LibraryServer(library, port=0)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return server, loop
+
+
+def make_request(rng: random.Random, book_count: int, write_ratio: float) -> bytes:
+    """
+    Формирует случайный запрос: поиск, получение по ID или изменение статуса.
+    """
+    if rng.random() < write_ratio:
+        status = rng.choice(("available", "borrowed"))
+        body = json.dumps({"status": status}).encode("utf-8")
+        return (f"PUT /books/{rng.randint(1, book_count)}/status HTTP/1.1\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+    if rng.random() < 0.5:
+        return f"GET /books/{rng.randint(1, book_count)} HTTP/1.1\r\n\r\n".encode("latin-1")
+    return f"GET /books?type=author&query=author%20{rng.randint(0, 999)} HTTP/1.1\r\n\r\n".encode("latin-1")
+
+
+async def client(host: str, port: int, count: int, book_count: int, write_ratio: float,
+                 seed: int, latencies: list[float]) -> None:
+    """
+    Отправляет count запросов по одному keep-alive соединению и записывает задержки.
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in range(count):
+        started = time.perf_counter()
+        writer.write(make_request(rng, book_count, write_ratio))
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - started)
+    writer.close()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(host: str, port: int, connections: int, requests: int, book_count: int,
+                   write_ratio: float) -> tuple[float, list[float]]:
+    """
+    Запускает клиентов параллельно.
+
+    Возвращает:
+        tuple[float, list[float]]: Общее время в секундах и задержки всех запросов.
+    """
+    latencies: list[float] = []
+    per_client = max(1, requests // connections)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, per_client, book_count, write_ratio, seed, latencies)
+        for seed in range(connections)
+    ))
+    return time.perf_counter() - started, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_server")
+    parser.add_argument("--target", help="Адрес работающего сервера host:port")
+    parser.add_argument("--books", type=int, default=10_000, help="Количество книг (для встроенного сервера)")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Доля запросов на изменение")
+    args = parser.parse_args()
+
+    server = loop = None
+    with tempfile.TemporaryDirectory() as directory:
+        if args.target:
+            host, _, port = args.target.rpartition(":")
+            port = int(port)
+        else:
+            server, loop = start_server(args.books, os.path.join(directory, "books.json"))
+            host, port = server.host, server.port
+        elapsed, latencies = asyncio.run(run_load(host, port, args.connections, args.requests,
+                                                  args.books, args.write_ratio))
+        if server is not None:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+    print(f"Requests:     {len(latencies)} over {args.connections} connections")
+    print(f"Throughput:   {len(latencies) / elapsed:.0f} req/s")
+    print(f"Latency p50:  {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"Latency p99:  {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Набор бенчмарков основных операций библиотеки на синтетическом каталоге.
+
+Для каждого размера каталога измеряются: загрузка (load_books), сохранение
+(save_books), проверка дубликата при добавлении, поиск по ID, filter_books по
+каждому типу поиска (полный просмотр), Library.query по каждому типу (с индексами,
+без кэша) и вывод таблицы display_books. Результаты записываются в JSON-файл,
+который можно сравнить с результатами другого коммита.
+
+Запуск:
+    python -m benchmarks.bench_suite --sizes 1000 10000 100000 --output results.json
+    python -m benchmarks.bench_suite --sizes 1000 --compare baseline.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from benchmarks.catalog_generator import DEFAULT_SEED, generate_books
+from library.library_management import Library
+import library.helper_functions as helper_functions
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Количество повторов точечных операций (поиск по ID, проверка дубликата)
+LOOKUPS = 1_000
+
+
+def measure(function, repeat: int = 3) -> float:
+    """
+    Возвращает лучшее время выполнения функции в секундах из repeat запусков.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_size(size: int, directory: str, repeat: int) -> list[dict]:
+    """
+    Выполняет все бенчмарки для каталога заданного размера.
+
+    Возвращает:
+        list[dict]: Записи {"size", "operation", "seconds", "ops"}; ops - количество
+        операций в замере (для точечных операций время одной операции = seconds / ops).
+    """
+    books_file = os.path.join(directory, f"books_{size}.json")
+    with redirect_stdout(io.StringIO()):
+        library = Library(books_file=books_file, query_cache_size=0)
+    library.books.extend(generate_books(size))
+    library.save_books()
+
+    rng = random.Random(DEFAULT_SEED)
+    sample = [library.books[rng.randrange(size)] for _ in range(LOOKUPS)]
+    ids = [book.id for book in sample] + [size + i for i in range(1, 11)]
+    queries = {
+        "title": sample[0].title.split()[0].lower(),
+        "author": sample[1].author.split()[-1].lower(),
+        "year": str(sample[2].year),
+    }
+
+    results = []
+
+    def record(operation: str, seconds: float, ops: int = 1) -> None:
+        results.append({"size": size, "operation": operation, "seconds": seconds, "ops": ops})
+        print(f"{size:>10} {operation:<22} {seconds * 1000 / ops:>12.4f} ms/op")
+
+    record("load_books", measure(library.load_books, repeat))
+    record("save_books", measure(library.save_books, repeat))
+    books = library.books
+    record("duplicate_check", measure(lambda: [books.find_duplicate(b.title, b.author, b.year) for b in sample],
+                                      repeat), len(sample))
+    record("id_lookup", measure(lambda: [books.get_by_id(book_id) for book_id in ids], repeat), len(ids))
+    for search_type, query in queries.items():
+        record(f"filter_books.{search_type}",
+               measure(lambda: helper_functions.filter_books(books, search_type, query), repeat))
+        record(f"query.{search_type}", measure(lambda: library.query(search_type, query), repeat))
+    with redirect_stdout(io.StringIO()):
+        seconds = measure(library.display_books, repeat)
+    record("display_books", seconds)
+    return results
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    """
+    Печатает отношение времени к результатам из файла baseline_path (больше 1 - медленнее).
+    """
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = {(item["size"], item["operation"]): item for item in json.load(file)["results"]}
+    print(f"\nСравнение с {baseline_path}:")
+    for item in results:
+        before = baseline.get((item["size"], item["operation"]))
+        if before and before["seconds"]:
+            ratio = (item["seconds"] / item["ops"]) / (before["seconds"] / before["ops"])
+            print(f"{item['size']:>10} {item['operation']:<22} x{ratio:.2f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Размеры каталога (например, 1000 10000 10000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество повторов каждого замера")
+    parser.add_argument("--output", default="bench_results.json", help="Файл с результатами (JSON)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Файл результатов для сравнения")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            results.extend(bench_size(size, directory, args.repeat))
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": DEFAULT_SEED,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4)
+    print(f"\nРезультаты записаны в {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Бенчмарк вывода таблицы книг: прежний вывод print для каждой строки и
+TablePager (страница собирается в строку и выводится одним write).
+
+Вывод направляется в os.devnull с построчной буферизацией, как в терминале,
+где каждый перевод строки - отдельная запись. Измеряются вывод всего каталога,
+показ первой страницы и переход к странице с последней книгой.
+
+Каталог - упорядоченный по ID список книг: TablePager работает с ним так же,
+как с BookCatalog (срезами), а построение индексов BookCatalog на 10 млн книг
+не относится к выводу.
+
+Запуск:
+    python -m benchmarks.bench_table [количество книг] [книг в полном выводе]
+"""
+import os
+import sys
+import time
+from benchmarks.catalog_generator import generate_books
+from library.table_view import TablePager
+
+
+def print_rows(books, output) -> None:
+    """
+    Прежний вывод display_books: print для заголовка и каждой книги.
+    """
+    print(f"{'ID':<5} {'Название':<30} {'Автор':<20} {'Год':<6} {'Статус':<10}", file=output)
+    print("-" * 75, file=output)
+    for book in books:
+        print(f"{book.id:<5} {book.title:<30} {book.author:<20} {book.year:<6} {book.status:<10}", file=output)
+
+
+def timed(function) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    dump_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    books = list(generate_books(count))
+    print(f"Books: {count}")
+
+    with open(os.devnull, "w", buffering=1) as output:
+        pager = TablePager(books, output=output)
+        print(f"{'first page':<28} {timed(pager.render_page) * 1000:>10.3f} ms")
+        last_id = books[-1].id
+        print(f"{'jump to last ID':<28} {timed(lambda: pager.find_page(last_id)) * 1000:>10.3f} ms")
+
+        sample = books[:dump_count]
+        legacy = timed(lambda: print_rows(sample, output))
+        buffered = timed(lambda: TablePager(sample, output=output).show(interactive=False))
+        print(f"{f'full output ({len(sample)}), print':<28} {legacy * 1000:>10.1f} ms")
+        print(f"{f'full output ({len(sample)}), pager':<28} {buffered * 1000:>10.1f} ms   x{legacy / buffered:.1f}")
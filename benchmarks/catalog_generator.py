@@ -0,0 +1,99 @@
+"""
+Детерминированный генератор синтетического каталога для бенчмарков.
+
+Каталог похож на настоящий: названия и авторы на латинице и кириллице (как в
+books.json), популярность авторов распределена неравномерно (у немногих авторов
+много книг), годы смещены к современности, около пятой части книг выданы.
+При одинаковых параметрах генератор всегда возвращает одни и те же книги.
+
+Запуск (запись каталога в файл):
+    python -m benchmarks.catalog_generator 100000 books_100k.json
+"""
+import random
+import sys
+from collections.abc import Iterator
+from library.catalog import BookCatalog
+from library.models import Book
+from library.storage import open_storage
+
+DEFAULT_SEED = 20240101
+
+# Доля книг с названием и автором на кириллице
+CYRILLIC_SHARE = 0.3
+
+_LATIN_WORDS = (
+    "war", "peace", "night", "garden", "river", "shadow", "king", "stone", "winter", "city",
+    "secret", "journey", "house", "light", "sea", "fire", "dream", "road", "silver", "star",
+    "time", "lost", "last", "empire", "storm", "heart", "glass", "wind", "hidden", "golden",
+)
+_CYRILLIC_WORDS = (
+    "война", "мир", "ночь", "сад", "река", "тень", "король", "камень", "зима", "город",
+    "тайна", "путь", "дом", "свет", "море", "огонь", "сон", "дорога", "серебро", "звезда",
+    "время", "книга", "последний", "империя", "буря", "сердце", "стекло", "ветер", "новая", "ёлка",
+)
+_LATIN_FIRST = ("John", "Mary", "Ernest", "Agatha", "George", "Virginia", "Isaac", "Ursula", "Terry", "Jane")
+_LATIN_LAST = ("Smith", "Tolkien", "Christie", "Orwell", "Woolf", "Asimov", "Le Guin", "Pratchett", "Austen",
+               "Herbert", "Rowling", "King", "Brown", "Martin", "Gaiman")
+_CYRILLIC_FIRST = ("Лев", "Фёдор", "Анна", "Михаил", "Иван", "Марина", "Борис", "Александр", "Ольга", "Сергей")
+_CYRILLIC_LAST = ("Толстой", "Достоевский", "Ахматова", "Булгаков", "Тургенев", "Цветаева", "Пастернак",
+                  "Пушкин", "Берггольц", "Есенин", "Чехов", "Гоголь", "Арка")
+
+
+def _author_pool(rng: random.Random, size: int) -> list[str]:
+    """
+    Строит список уникальных авторов; к повторяющимся именам добавляется номер.
+    """
+    authors = []
+    seen = set()
+    while len(authors) < size:
+        if rng.random() < CYRILLIC_SHARE:
+            name = f"{rng.choice(_CYRILLIC_FIRST)} {rng.choice(_CYRILLIC_LAST)}"
+        else:
+            name = f"{rng.choice(_LATIN_FIRST)} {rng.choice(_LATIN_LAST)}"
+        if name in seen:
+            name = f"{name} {len(authors)}"
+        seen.add(name)
+        authors.append(name)
+    return authors
+
+
+def _title(rng: random.Random, cyrillic: bool) -> str:
+    words = _CYRILLIC_WORDS if cyrillic else _LATIN_WORDS
+    title = " ".join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+    return title[0].upper() + title[1:]
+
+
+def generate_books(count: int, seed: int = DEFAULT_SEED, current_year: int = 2024) -> Iterator[Book]:
+    """
+    Генерирует книги с ID от 1 до count.
+
+    Аргументы:
+        count (int): Количество книг.
+        seed (int): Зерно генератора случайных чисел.
+        current_year (int): Последний год издания (фиксирован ради воспроизводимости).
+
+    Возвращает:
+        Iterator[Book]: Книги в порядке ID.
+    """
+    rng = random.Random(seed)
+    authors = _author_pool(rng, max(10, int(count ** 0.75)))
+    for book_id in range(1, count + 1):
+        # Распределение Парето: первые авторы пула встречаются намного чаще остальных
+        author = authors[min(len(authors) - 1, int(rng.paretovariate(1.2)) - 1)] if rng.random() < 0.5 \
+            else rng.choice(authors)
+        cyrillic = not author.isascii()
+        # Чем ближе к текущему году, тем больше книг
+        year = int(rng.triangular(1800, current_year, current_year))
+        # Номер в конце названия делает почти все записи уникальными, как в настоящем каталоге
+        title = _title(rng, cyrillic)
+        if rng.random() < 0.5:
+            title = f"{title} {rng.randint(1, count)}"
+        status = "borrowed" if rng.random() < 0.2 else "available"
+        yield Book(book_id, title, author, year, status)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    path = sys.argv[2] if len(sys.argv) > 2 else "synthetic_books.json"
+    open_storage(path).save(BookCatalog(generate_books(count)))
+    print(f"Сгенерировано книг: {count} -> {path}")
@@ -0,0 +1,125 @@
+import json
+import logging
+from collections.abc import Iterable
+from itertools import islice
+from typing import IO
+from library.exceptions import LibraryError, ValidationError
+
+
+def execute_command(library, command: dict):
+    """
+    Выполняет одну команду пакетного режима через программный интерфейс Library.
+
+    Поддерживаемые команды:
+        {"op": "add", "title": ..., "author": ..., "year": ..., "status": ...}
+        {"op": "delete", "id": ...}
+        {"op": "get", "id": ...}
+        {"op": "search", "type": "title" | "author" | "year", "query": ...}
+        {"op": "find", "where": ..., "sort": ..., "limit": ..., "offset": ...} - составной запрос
+            (см. Library.find); результат - {"books": [...], "plan": {...}}
+        {"op": "status", "id": ..., "status": "available" | "borrowed"}
+        {"op": "stats"}
+
+    Аргументы:
+        library (Library): Библиотека.
+        command (dict): Команда.
+
+    Возвращает:
+        Результат команды, пригодный для сериализации в JSON.
+
+    Исключения:
+        LibraryError: Если команда некорректна или операция не удалась.
+    """
+    if not isinstance(command, dict):
+        raise ValidationError("command must be a JSON object")
+    op = command.get("op")
+    if op == "add":
+        book = library.add(command.get("title"), command.get("author"), command.get("year"),
+                           command.get("status", "available"))
+        return book.to_dict()
+    if op == "delete":
+        return library.delete(_book_id(command)).to_dict()
+    if op == "get":
+        return library.get(_book_id(command)).to_dict()
+    if op == "search":
+        return [book.to_dict() for book in library.query(command.get("type"), command.get("query"))]
+    if op == "find":
+        result = library.find(command.get("where"), sort=command.get("sort"), limit=command.get("limit"),
+                              offset=command.get("offset", 0))
+        return {"books": [book.to_dict() for book in result.books], "plan": result.plan}
+    if op == "status":
+        return library.set_status(_book_id(command), command.get("status")).to_dict()
+    if op == "stats":
+        return library.stats()
+    raise ValidationError(f"unknown op: {op!r}")
+
+
+def _book_id(command: dict) -> int:
+    """
+    Извлекает ID книги из команды.
+
+    Исключения:
+        ValidationError: Если ID отсутствует или не является целым числом.
+    """
+    book_id = command.get("id")
+    if isinstance(book_id, bool) or not isinstance(book_id, int):
+        raise ValidationError(f"invalid id: {book_id!r}")
+    return book_id
+
+
+def _run_line(library, line_number: int, line: str, summary: dict) -> dict:
+    """
+    Выполняет одну строку команды и формирует ответ, обновляя счетчики.
+    """
+    try:
+        result = execute_command(library, json.loads(line))
+    except json.JSONDecodeError as e:
+        summary["failed"] += 1
+        return {"line": line_number, "ok": False, "error": "JSONDecodeError", "message": str(e)}
+    except LibraryError as e:
+        summary["failed"] += 1
+        return {"line": line_number, "ok": False, "error": type(e).__name__, "message": str(e)}
+    except Exception as e:
+        # Непредвиденная ошибка одной команды не прерывает пакет
+        logging.error("Unexpected error in batch line %s: %s", line_number, e)
+        summary["failed"] += 1
+        return {"line": line_number, "ok": False, "error": type(e).__name__, "message": str(e)}
+    summary["ok"] += 1
+    return {"line": line_number, "ok": True, "result": result}
+
+
+def run_batch(library, lines: Iterable[str], output: IO[str], commit_every: int = 0) -> dict:
+    """
+    Выполняет поток команд JSON Lines и пишет по одной строке результата на команду.
+
+    Изменения сохраняются группами (Library.group_commit): один раз в конце
+    или каждые commit_every команд, а не после каждой команды.
+
+    Формат результата:
+        {"line": 1, "ok": true, "result": ...}
+        {"line": 2, "ok": false, "error": "BookNotFoundError", "message": "..."}
+
+    Аргументы:
+        library (Library): Библиотека.
+        lines (Iterable[str]): Строки с командами в формате JSON.
+        output (IO[str]): Поток для результатов.
+        commit_every (int): Размер группы сохранения; 0 - сохранить один раз в конце.
+
+    Возвращает:
+        dict: Количество успешных и неуспешных команд.
+    """
+    summary = {"ok": 0, "failed": 0}
+    numbered = enumerate(lines, start=1)
+    while True:
+        group = list(islice(numbered, commit_every)) if commit_every else numbered
+        if commit_every and not group:
+            break
+        with library.group_commit():
+            for line_number, line in group:
+                if line.strip():
+                    response = _run_line(library, line_number, line, summary)
+                    output.write(json.dumps(response, ensure_ascii=False) + "\n")
+        if not commit_every:
+            break
+    logging.info("Batch finished: %s succeeded, %s failed", summary['ok'], summary['failed'])
+    return summary
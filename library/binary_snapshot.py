@@ -0,0 +1,310 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from typing import Optional
+from library.models import Book, status_code, status_name
+from library.json_stream import iter_json_array, write_json_array
+
+# Расширение файла, по которому Library выбирает двоичный формат снимка
+BINARY_EXTENSION = ".bookdb"
+
+MAGIC = b"LIBBOOK1"
+VERSION = 1
+
+# Заголовок: magic, версия, порядок байт (0 - little, 1 - big), число книг,
+# размер таблицы статусов, размер кучи названий, размер кучи авторов
+_HEADER = struct.Struct("<8sIIQQQQ")
+_BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+
+def _align(offset: int) -> int:
+    """Выравнивает смещение по границе 8 байт."""
+    return (offset + 7) & ~7
+
+
+def _layout(count: int, statuses_size: int, titles_size: int) -> dict[str, int]:
+    """
+    Вычисляет смещения колонок и куч строк внутри файла.
+
+    Аргументы:
+        count (int): Количество книг.
+        statuses_size (int): Размер таблицы статусов в байтах.
+        titles_size (int): Размер кучи названий в байтах.
+
+    Возвращает:
+        dict[str, int]: Смещение каждой секции файла.
+    """
+    offsets = {}
+    position = _align(_HEADER.size + statuses_size)
+    for name, item_size, length in (
+        ("ids", 8, count),
+        ("title_offsets", 8, count + 1),
+        ("author_offsets", 8, count + 1),
+        ("years", 4, count),
+        ("statuses", 1, count),
+    ):
+        offsets[name] = position
+        position = _align(position + item_size * length)
+    offsets["titles"] = position
+    offsets["authors"] = position + titles_size
+    return offsets
+
+
+def write_snapshot(path: str, books: Iterable[Book]) -> None:
+    """
+    Записывает книги в двоичный снимок: колонки фиксированной ширины для
+    id/года/статуса и кучи строк для названий и авторов.
+
+    Файл сначала пишется во временный файл и затем атомарно заменяет старый, поэтому
+    читатели, открывшие старый снимок через mmap, продолжают видеть целые данные.
+
+    Аргументы:
+        path (str): Путь к файлу снимка.
+        books (Iterable[Book]): Книги, упорядоченные по ID.
+
+    Исключения:
+        ValueError: Если книги не упорядочены по ID.
+    """
+    ids = array("q")
+    years = array("i")
+    statuses = bytearray()
+    title_offsets = array("Q", [0])
+    author_offsets = array("Q", [0])
+    titles = bytearray()
+    authors = bytearray()
+    status_names: list[str] = []
+    local_codes: dict[int, int] = {}
+
+    for book in books:
+        if ids and book.id <= ids[-1]:
+            raise ValueError(f"Books must be ordered by id, got {book.id} after {ids[-1]}")
+        ids.append(book.id)
+        years.append(book.year)
+        # Коды статусов в файле не зависят от порядка регистрации статусов в процессе
+        local = local_codes.get(book.status_code)
+        if local is None:
+            local = local_codes[book.status_code] = len(status_names)
+            status_names.append(book.status)
+        statuses.append(local)
+        titles += book.title.encode("utf-8")
+        title_offsets.append(len(titles))
+        authors += book.author.encode("utf-8")
+        author_offsets.append(len(authors))
+
+    count = len(ids)
+    status_table = json.dumps(status_names).encode("utf-8")
+    offsets = _layout(count, len(status_table), len(titles))
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, _BYTE_ORDER, count, len(status_table), len(titles), len(authors)))
+        file.write(status_table)
+        for name, data in (
+            ("ids", ids.tobytes()),
+            ("title_offsets", title_offsets.tobytes()),
+            ("author_offsets", author_offsets.tobytes()),
+            ("years", years.tobytes()),
+            ("statuses", bytes(statuses)),
+            ("titles", titles),
+            ("authors", authors),
+        ):
+            file.write(b"\0" * (offsets[name] - file.tell()))
+            file.write(data)
+    os.replace(temp_path, path)
+
+
+class BinarySnapshot:
+    """
+    Двоичный снимок каталога, открытый через mmap.
+
+    Открытие файла не читает записи: колонки отображаются в память, а книга
+    декодируется только при обращении к ней. Поиск по ID выполняется двоичным
+    поиском по колонке ids.
+    """
+
+    def __init__(self, path: str):
+        """
+        Открывает снимок.
+
+        Аргументы:
+            path (str): Путь к файлу снимка.
+
+        Исключения:
+            ValueError: Если файл не является снимком поддерживаемой версии.
+            OSError: Если файл не удалось открыть.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{path} is not a book snapshot")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        magic, version, byte_order, count, statuses_size, titles_size, authors_size = \
+            _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a book snapshot of version {VERSION}")
+        if byte_order != _BYTE_ORDER:
+            self.close()
+            raise ValueError(f"{path} was written on a machine with a different byte order")
+
+        self._count = count
+        self._status_names = json.loads(bytes(self._mmap[_HEADER.size:_HEADER.size + statuses_size]))
+        self._status_codes = [status_code(name) for name in self._status_names]
+        offsets = _layout(count, statuses_size, titles_size)
+        view = memoryview(self._mmap)
+        self._views = [view]
+        self.ids = self._column(view, offsets["ids"], 8 * count, "q")
+        self.years = self._column(view, offsets["years"], 4 * count, "i")
+        self.statuses = self._column(view, offsets["statuses"], count, "B")
+        self._title_offsets = self._column(view, offsets["title_offsets"], 8 * (count + 1), "Q")
+        self._author_offsets = self._column(view, offsets["author_offsets"], 8 * (count + 1), "Q")
+        self._titles = self._column(view, offsets["titles"], titles_size, "B")
+        self._authors = self._column(view, offsets["authors"], authors_size, "B")
+
+    def _column(self, view: memoryview, start: int, length: int, fmt: str) -> memoryview:
+        """Возвращает типизированное представление секции файла без копирования."""
+        column = view[start:start + length].cast(fmt)
+        self._views.append(column)
+        return column
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> Book:
+        """
+        Декодирует книгу по позиции в снимке.
+
+        Аргументы:
+            position (int): Позиция книги (0..len-1).
+
+        Возвращает:
+            Book: Декодированная книга.
+        """
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("snapshot index out of range")
+        title_start, title_end = self._title_offsets[position], self._title_offsets[position + 1]
+        author_start, author_end = self._author_offsets[position], self._author_offsets[position + 1]
+        book = Book(
+            book_id=self.ids[position],
+            title=str(self._titles[title_start:title_end], "utf-8"),
+            author=str(self._authors[author_start:author_end], "utf-8"),
+            year=self.years[position],
+        )
+        book.status_code = self._status_codes[self.statuses[position]]
+        return book
+
+    def __iter__(self) -> Iterator[Book]:
+        """
+        Последовательно декодирует все книги. Колонки читаются целиком один раз,
+        что намного быстрее, чем обращение к каждой книге по позиции.
+        """
+        titles = self._titles.tobytes()
+        authors = self._authors.tobytes()
+        title_offsets = self._title_offsets.tolist()
+        author_offsets = self._author_offsets.tolist()
+        status_codes = self._status_codes
+        statuses = self.statuses
+        for position, (book_id, year) in enumerate(zip(self.ids.tolist(), self.years.tolist())):
+            book = Book(
+                book_id,
+                titles[title_offsets[position]:title_offsets[position + 1]].decode("utf-8"),
+                authors[author_offsets[position]:author_offsets[position + 1]].decode("utf-8"),
+                year,
+            )
+            book.status_code = status_codes[statuses[position]]
+            yield book
+
+    def get_by_id(self, book_id: int) -> Optional[Book]:
+        """
+        Находит книгу по ID двоичным поиском по колонке ids.
+
+        Аргументы:
+            book_id (int): ID книги.
+
+        Возвращает:
+            Optional[Book]: Книга или None, если книги с таким ID нет.
+        """
+        position = bisect_left(self.ids, book_id)
+        if position < self._count and self.ids[position] == book_id:
+            return self[position]
+        return None
+
+    def status_of(self, position: int) -> str:
+        """
+        Возвращает статус книги по позиции без декодирования строк.
+        """
+        return status_name(self._status_codes[self.statuses[position]])
+
+    def close(self) -> None:
+        """
+        Освобождает отображение файла в память и закрывает файл.
+        """
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._views = []
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "BinarySnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def json_to_binary(json_path: str, binary_path: str) -> int:
+    """
+    Конвертирует books.json в двоичный снимок.
+
+    Аргументы:
+        json_path (str): Путь к исходному JSON-файлу.
+        binary_path (str): Путь к создаваемому снимку.
+
+    Возвращает:
+        int: Количество сконвертированных книг.
+    """
+    with open(json_path, "r") as file:
+        books = sorted((Book.from_dict(data) for data in iter_json_array(file)), key=lambda book: book.id)
+    write_snapshot(binary_path, books)
+    return len(books)
+
+
+def binary_to_json(binary_path: str, json_path: str, compact: bool = False) -> int:
+    """
+    Конвертирует двоичный снимок обратно в формат books.json.
+
+    Аргументы:
+        binary_path (str): Путь к снимку.
+        json_path (str): Путь к создаваемому JSON-файлу.
+        compact (bool): Компактный формат JSON. По умолчанию False.
+
+    Возвращает:
+        int: Количество сконвертированных книг.
+    """
+    with BinarySnapshot(binary_path) as snapshot, open(json_path, "w") as file:
+        write_json_array(file, (book.to_dict() for book in snapshot), compact=compact)
+        return len(snapshot)
+
+
+if __name__ == "__main__":
+    # python -m library.binary_snapshot import books.json books.bookdb
+    # python -m library.binary_snapshot export books.bookdb books.json
+    if len(sys.argv) != 4 or sys.argv[1] not in ("import", "export"):
+        print("Использование: python -m library.binary_snapshot import|export <источник> <назначение>")
+        sys.exit(2)
+    command, source, target = sys.argv[1:]
+    converted = json_to_binary(source, target) if command == "import" else binary_to_json(source, target)
+    print(f"Сконвертировано книг: {converted}")
@@ -0,0 +1,232 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+from collections.abc import Iterator
+from datetime import datetime
+from typing import IO, Optional
+from library.models import Book
+import library.helper_functions as helper_functions
+
+# Поддерживаемые форматы файлов импорта и экспорта
+FORMATS = ("csv", "jsonl")
+
+CSV_FIELDS = ("id", "title", "author", "year", "status")
+
+
+class ImportReport:
+    """
+    Итоги пакетного импорта.
+    """
+
+    def __init__(self):
+        self.imported = 0
+        self.duplicates = 0
+        self.rejected = 0
+
+    @property
+    def processed(self) -> int:
+        return self.imported + self.duplicates + self.rejected
+
+    def to_dict(self) -> dict:
+        return {
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+        }
+
+
+def detect_format(path: str, file_format: Optional[str] = None) -> str:
+    """
+    Определяет формат файла по явному указанию или по расширению.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        file_format (Optional[str]): Явно указанный формат ("csv" или "jsonl").
+
+    Возвращает:
+        str: Формат файла.
+
+    Исключения:
+        ValueError: Если формат не поддерживается.
+    """
+    if file_format is None:
+        file_format = os.path.splitext(path)[1].lstrip(".").lower()
+        if file_format == "ndjson":
+            file_format = "jsonl"
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported format '{file_format}' for {path}. Use one of: {', '.join(FORMATS)}")
+    return file_format
+
+
+def iter_rows(file: IO[str], file_format: str) -> Iterator[tuple[int, object]]:
+    """
+    Потоково читает строки входного файла.
+
+    Аргументы:
+        file (IO[str]): Открытый входной файл.
+        file_format (str): Формат ("csv" или "jsonl").
+
+    Возвращает:
+        Iterator[tuple[int, object]]: Пары (номер строки, данные строки). Для JSONL
+        неразобранная строка возвращается как исходный текст.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, line.rstrip("\n")
+
+
+def validate_row(row, current_year: int) -> tuple[str, str, int, str]:
+    """
+    Проверяет строку импорта по тем же правилам, что и интерактивный ввод.
+
+    Аргументы:
+        row: Данные строки (словарь с полями title, author, year и необязательным status).
+        current_year (int): Текущий год.
+
+    Возвращает:
+        tuple[str, str, int, str]: Название, автор, год и статус.
+
+    Исключения:
+        ValueError: Если строка некорректна; сообщение содержит причину.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("malformed record")
+    title = helper_functions.parse_non_empty_string(row.get("title"), "title")
+    author = helper_functions.parse_non_empty_string(row.get("author"), "author")
+    year = helper_functions.parse_year(row.get("year"), current_year)
+    status = helper_functions.parse_status(row.get("status"))
+    return title, author, year, status
+
+
+def import_books(library, source_path: str, reject_path: Optional[str] = None,
+                 file_format: Optional[str] = None) -> ImportReport:
+    """
+    Импортирует книги из CSV или JSONL одним пакетом.
+
+    Строки читаются потоково и проверяются по правилам get_valid_year и
+    get_non_empty_string. Дубликаты (по названию, автору и году, в том числе внутри
+    самого файла) пропускаются, новым книгам выдаются ID, а сохранение выполняется
+    один раз в конце. Отклоненные строки и дубликаты записываются в файл отказов
+    (JSONL) с указанием причины. ID из входного файла не используются.
+
+    Аргументы:
+        library (Library): Библиотека, в которую импортируются книги.
+        source_path (str): Путь к входному файлу.
+        reject_path (Optional[str]): Путь к файлу отказов. По умолчанию отказы не пишутся.
+        file_format (Optional[str]): Формат входного файла; по умолчанию определяется по расширению.
+
+    Возвращает:
+        ImportReport: Итоги импорта.
+    """
+    file_format = detect_format(source_path, file_format)
+    current_year = datetime.now().year
+    report = ImportReport()
+    rejects = open(reject_path, "w", encoding="utf-8") if reject_path else None
+    # Весь импорт выполняется под блокировкой записи библиотеки
+    with library.group_commit():
+        books = library.books
+        try:
+            with open(source_path, "r", encoding="utf-8", newline="") as source:
+                for line_number, row in iter_rows(source, file_format):
+                    try:
+                        title, author, year, status = validate_row(row, current_year)
+                    except ValueError as e:
+                        report.rejected += 1
+                        if rejects is not None:
+                            rejects.write(json.dumps({"line": line_number, "reason": str(e), "row": row},
+                                                     ensure_ascii=False) + "\n")
+                        continue
+
+                    if books.find_duplicate(title, author, year):
+                        report.duplicates += 1
+                        if rejects is not None:
+                            rejects.write(json.dumps({"line": line_number, "reason": "duplicate", "row": row},
+                                                     ensure_ascii=False) + "\n")
+                        continue
+
+                    books.append(Book(books.allocate_id(), title, author, year, status))
+                    report.imported += 1
+        finally:
+            if rejects is not None:
+                rejects.close()
+
+        # Одно сохранение на весь пакет
+        if report.imported:
+            library.save_books()
+    logging.info("Bulk import from %s: %s", source_path, report.to_dict())
+    return report
+
+
+def export_books(library, target_path: str, file_format: Optional[str] = None) -> int:
+    """
+    Потоково экспортирует все книги в CSV или JSONL в порядке ID.
+
+    Аргументы:
+        library (Library): Библиотека.
+        target_path (str): Путь к выходному файлу.
+        file_format (Optional[str]): Формат; по умолчанию определяется по расширению.
+
+    Возвращает:
+        int: Количество экспортированных книг.
+    """
+    file_format = detect_format(target_path, file_format)
+    count = 0
+    with open(target_path, "w", encoding="utf-8", newline="") as target:
+        if file_format == "csv":
+            writer = csv.writer(target)
+            writer.writerow(CSV_FIELDS)
+            for book in library.books:
+                writer.writerow((book.id, book.title, book.author, book.year, book.status))
+                count += 1
+        else:
+            for book in library.books:
+                target.write(json.dumps(book.to_dict(), ensure_ascii=False) + "\n")
+                count += 1
+    logging.info("Bulk export to %s: %s books", target_path, count)
+    return count
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Точка входа командной строки:
+
+        python -m library.bulk import books.csv --rejects rejects.jsonl
+        python -m library.bulk export books.jsonl
+    """
+    from library.library_management import Library
+
+    parser = argparse.ArgumentParser(prog="python -m library.bulk", description="Пакетный импорт и экспорт книг.")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("path", help="Файл CSV или JSONL")
+    parser.add_argument("--books-file", default="books.json", help="Файл данных библиотеки")
+    parser.add_argument("--format", choices=FORMATS, help="Формат файла (по умолчанию - по расширению)")
+    parser.add_argument("--rejects", help="Файл для отклоненных строк (JSONL)")
+    args = parser.parse_args(argv)
+
+    library = Library(books_file=args.books_file)
+    try:
+        if args.command == "import":
+            report = import_books(library, args.path, reject_path=args.rejects, file_format=args.format)
+            print(f"Импортировано: {report.imported}, дубликатов: {report.duplicates}, отклонено: {report.rejected}")
+        else:
+            count = export_books(library, args.path, file_format=args.format)
+            print(f"Экспортировано книг: {count}")
+    finally:
+        library.storage.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, MutableSequence
+from operator import attrgetter
+from typing import Optional
+from library.models import Book
+from library.indexes import BookIndex, DuplicateKeyIndex, TrigramIndex, YearIndex, normalize_text, parse_year_query
+
+_book_id = attrgetter("id")
+
+
+class BookCatalog(MutableSequence):
+    """
+    Список книг с индексом id -> Book.
+
+    Ведет себя как обычный list[Book], но поддерживает книги упорядоченными по ID
+    и хранит словарь для поиска, удаления и изменения книги по ID за O(1).
+    Так как новые ID выдаются по возрастанию, добавление в конец не требует сортировки.
+
+    Вторичные индексы (BookIndex) обновляются инкрементально при каждом изменении.
+    """
+
+    def __init__(self, books: Iterable[Book] = ()):
+        """
+        Инициализирует каталог.
+
+        Аргументы:
+            books (Iterable[Book]): Начальный набор книг (в любом порядке).
+
+        Исключения:
+            ValueError: Если среди книг есть повторяющиеся ID.
+        """
+        self._items: list[Book] = []
+        self._by_id: dict[int, Book] = {}
+        self._next_id = 1
+        self.duplicates = DuplicateKeyIndex()
+        self.text_indexes = {"title": TrigramIndex("title"), "author": TrigramIndex("author")}
+        self.years = YearIndex()
+        self._indexes: list[BookIndex] = [self.duplicates, *self.text_indexes.values(), self.years]
+        # Сколько поисков сузили индексы, а сколько потребовали просмотра всего каталога
+        self.index_lookups = 0
+        self.full_scans = 0
+        self._rebuild(books)
+
+    # --- Вторичные индексы ---
+    def add_index(self, index: BookIndex) -> None:
+        """
+        Подключает вторичный индекс и заполняет его текущими книгами.
+
+        Аргументы:
+            index (BookIndex): Индекс для подключения.
+        """
+        index.clear()
+        for book in self._items:
+            index.add(book)
+        self._indexes.append(index)
+
+    def find_duplicate(self, title: str, author: str, year: int) -> bool:
+        """
+        Проверяет, есть ли книга с таким же названием, автором и годом (без учета регистра).
+
+        Аргументы:
+            title (str): Название книги.
+            author (str): Автор книги.
+            year (int): Год издания.
+
+        Возвращает:
+            bool: True, если такая книга уже есть в каталоге.
+        """
+        return self.duplicates.contains(title, author, year)
+
+    def find_candidates(self, search_type: str, search_query: str) -> list[Book]:
+        """
+        Сужает множество книг для поиска с помощью индексов.
+
+        Для названия и автора используется триграммный индекс (для запросов короче
+        триграммы возвращаются все книги), для года - упорядоченный индекс по году.
+        Результат упорядочен по ID; окончательную проверку выполняет filter_books.
+
+        Аргументы:
+            search_type (str): Поле для поиска ("title", "author" или "year").
+            search_query (str): Строка поиска.
+
+        Возвращает:
+            list[Book]: Книги-кандидаты.
+        """
+        if search_type == "year":
+            year_range = parse_year_query(search_query)
+            self.index_lookups += 1
+            return [] if year_range is None else self.find_by_year(*year_range)
+        index = self.text_indexes.get(search_type)
+        candidate_ids = index.candidate_ids(normalize_text(search_query)) if index is not None else None
+        if candidate_ids is None:
+            self.full_scans += 1
+            return self._items
+        self.index_lookups += 1
+        return [self._by_id[book_id] for book_id in sorted(candidate_ids)]
+
+    def estimate(self, search_type: str, search_query: str) -> Optional[int]:
+        """
+        Оценивает, сколько кандидатов вернет find_candidates, не строя их список
+        (для планировщика запросов).
+
+        Аргументы:
+            search_type (str): Поле для поиска ("title", "author" или "year").
+            search_query (str): Строка поиска.
+
+        Возвращает:
+            Optional[int]: Оценка количества кандидатов или None, если индекс не может
+            сузить поиск (потребуется просмотр всего каталога).
+        """
+        if search_type == "year":
+            year_range = parse_year_query(search_query)
+            return 0 if year_range is None else self.years.count(*year_range)
+        index = self.text_indexes.get(search_type)
+        return index.estimate(normalize_text(search_query)) if index is not None else None
+
+    def find_by_year(self, start: Optional[int] = None, end: Optional[int] = None) -> list[Book]:
+        """
+        Возвращает книги, изданные в диапазоне лет (включительно), упорядоченные по ID.
+
+        Аргументы:
+            start (Optional[int]): Нижняя граница или None (без ограничения).
+            end (Optional[int]): Верхняя граница или None (без ограничения).
+
+        Возвращает:
+            list[Book]: Найденные книги.
+        """
+        book_ids = self.years.range_ids(start, end)
+        book_ids.sort()
+        return [self._by_id[book_id] for book_id in book_ids]
+
+    # --- Выдача ID ---
+    @property
+    def next_id(self) -> int:
+        """
+        Следующий ID, который будет выдан. Счетчик монотонный: ID удаленных
+        книг повторно не используются.
+        """
+        return self._next_id
+
+    @next_id.setter
+    def next_id(self, value: int) -> None:
+        self._next_id = max(self._next_id, value)
+
+    def allocate_id(self) -> int:
+        """
+        Выдает новый уникальный ID.
+
+        Возвращает:
+            int: ID для новой книги.
+        """
+        book_id = self._next_id
+        self._next_id += 1
+        return book_id
+
+    # --- Индекс по ID ---
+    def get_by_id(self, book_id: int) -> Optional[Book]:
+        """
+        Возвращает книгу по ID.
+
+        Аргументы:
+            book_id (int): ID книги.
+
+        Возвращает:
+            Optional[Book]: Книга или None, если книги с таким ID нет.
+        """
+        return self._by_id.get(book_id)
+
+    def has_id(self, book_id: int) -> bool:
+        """
+        Проверяет, есть ли в каталоге книга с указанным ID.
+        """
+        return book_id in self._by_id
+
+    def remove_by_id(self, book_id: int) -> Book:
+        """
+        Удаляет книгу по ID.
+
+        Аргументы:
+            book_id (int): ID книги.
+
+        Возвращает:
+            Book: Удаленная книга.
+
+        Исключения:
+            KeyError: Если книги с таким ID нет.
+        """
+        book = self._by_id[book_id]
+        del self._items[self._position(book_id)]
+        self._forget(book)
+        return book
+
+    def update_status(self, book_id: int, status: str) -> Book:
+        """
+        Изменяет статус книги по ID.
+
+        Аргументы:
+            book_id (int): ID книги.
+            status (str): Новый статус.
+
+        Возвращает:
+            Book: Измененная книга.
+
+        Исключения:
+            KeyError: Если книги с таким ID нет.
+        """
+        book = self._by_id[book_id]
+        book.status = status
+        for index in self._indexes:
+            index.update_status(book)
+        return book
+
+    def iter_by_id(self) -> Iterator[Book]:
+        """
+        Итерирует книги в порядке возрастания ID без повторной сортировки.
+        """
+        return iter(self._items)
+
+    def max_id(self) -> int:
+        """
+        Возвращает наибольший ID в каталоге или 0, если каталог пуст.
+        """
+        return self._items[-1].id if self._items else 0
+
+    def _position(self, book_id: int) -> int:
+        """
+        Находит позицию книги с указанным ID в упорядоченном списке (двоичный поиск).
+        """
+        return bisect_left(self._items, book_id, key=_book_id)
+
+    def _forget(self, book: Book) -> None:
+        """
+        Удаляет книгу из всех индексов (список уже обновлен вызывающим кодом).
+        """
+        del self._by_id[book.id]
+        for index in self._indexes:
+            index.remove(book)
+
+    def _rebuild(self, books: Iterable[Book]) -> None:
+        """
+        Полностью перестраивает список и индексы из набора книг.
+        """
+        items = sorted(books, key=_book_id)
+        by_id = {}
+        for book in items:
+            if book.id in by_id:
+                raise ValueError(f"Duplicate book id: {book.id}")
+            by_id[book.id] = book
+        self._items = items
+        self._by_id = by_id
+        if items:
+            self.next_id = items[-1].id + 1
+        for index in self._indexes:
+            index.clear()
+            for book in items:
+                index.add(book)
+
+    # --- Интерфейс MutableSequence ---
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Book]:
+        return iter(self._items)
+
+    def __contains__(self, book) -> bool:
+        return isinstance(book, Book) and self._by_id.get(book.id) is book
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __setitem__(self, index, value) -> None:
+        items = list(self._items)
+        items[index] = value
+        self._rebuild(items)
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice):
+            items = list(self._items)
+            del items[index]
+            self._rebuild(items)
+            return
+        book = self._items[index]
+        del self._items[index]
+        self._forget(book)
+
+    def insert(self, index: int, book: Book) -> None:
+        """
+        Добавляет книгу. Позиция определяется ID книги, а не аргументом index,
+        чтобы каталог оставался упорядоченным по ID.
+
+        Исключения:
+            ValueError: Если книга с таким ID уже есть в каталоге.
+        """
+        if book.id in self._by_id:
+            raise ValueError(f"Duplicate book id: {book.id}")
+        if not self._items or book.id > self._items[-1].id:
+            self._items.append(book)
+        else:
+            self._items.insert(self._position(book.id), book)
+        self._by_id[book.id] = book
+        self.next_id = book.id + 1
+        for secondary in self._indexes:
+            secondary.add(book)
+
+    def append(self, book: Book) -> None:
+        self.insert(len(self._items), book)
+
+    def remove(self, book: Book) -> None:
+        if book not in self:
+            raise ValueError("BookCatalog.remove(x): x not in catalog")
+        self.remove_by_id(book.id)
+
+    def index(self, book: Book, start: int = 0, stop: Optional[int] = None) -> int:
+        if book not in self:
+            raise ValueError("BookCatalog.index(x): x not in catalog")
+        position = self._position(book.id)
+        if position < start or (stop is not None and position >= stop):
+            raise ValueError("BookCatalog.index(x): x not in range")
+        return position
+
+    def clear(self) -> None:
+        self._items = []
+        self._by_id = {}
+        for index in self._indexes:
+            index.clear()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BookCatalog):
+            return self._items == other._items
+        if isinstance(other, list):
+            return self._items == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"BookCatalog({self._items!r})"
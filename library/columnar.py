@@ -0,0 +1,251 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from typing import Optional
+from library.models import Book, status_code, status_name
+from library.indexes import BookIndex
+
+try:
+    import numpy
+except ImportError:  # NumPy не установлен: фильтры по строкам выполняются средствами Python
+    numpy = None
+
+# Код статуса удаленной строки (строки не удаляются из столбцов сразу, а помечаются)
+DELETED = 255
+
+# Доля удаленных строк, после которой столбцы уплотняются
+_COMPACT_FRACTION = 0.25
+
+# Наименьшее количество удаленных строк для уплотнения (на маленьких каталогах оно не нужно)
+_COMPACT_MIN_DELETED = 1024
+
+# Граница года для открытых диапазонов (столбец года - int32)
+_INT32_LIMIT = 2 ** 31 - 1
+
+
+class ColumnarView(BookIndex):
+    """
+    Столбцовое представление каталога для аналитических запросов по году и статусу:
+    ID (int64), год (int32) и код статуса (uint8) хранятся в трех плотных массивах,
+    упорядоченных по ID, а рядом ведется таблица количества книг по паре (год, статус).
+
+    Представление подключается к BookCatalog как вторичный индекс (add_index) и
+    обновляется инкрементально: добавление книги с новым ID - дозапись в конец,
+    удаление помечает строку кодом DELETED (столбцы уплотняются, когда таких строк
+    становится много), изменение статуса перезаписывает один байт. Каждое изменение
+    также меняет на единицу один или два счетчика таблицы.
+
+    Подсчеты, гистограммы и группировка по статусу или году вычисляются по таблице
+    счетчиков: их стоимость зависит от количества разных лет, а не книг. Отбор строк
+    (select_ids) выполняется векторно по столбцам, если установлен NumPy (массивы
+    NumPy читают буферы столбцов без копирования), и циклом Python по столбцам
+    в противном случае.
+    """
+
+    def __init__(self, books: Iterable[Book] = (), use_numpy: Optional[bool] = None):
+        """
+        Аргументы:
+            books (Iterable[Book]): Начальный набор книг, упорядоченный по ID.
+            use_numpy (Optional[bool]): Использовать NumPy. По умолчанию - если он установлен.
+
+        Исключения:
+            ValueError: Если NumPy запрошен, но не установлен.
+        """
+        if use_numpy and numpy is None:
+            raise ValueError("NumPy is not installed")
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        self.clear()
+        for book in books:
+            self.add(book)
+
+    # --- Синхронизация с каталогом (BookIndex) ---
+    def add(self, book: Book) -> None:
+        code = book.status_code
+        if code >= DELETED:
+            raise ValueError(f"too many statuses for a uint8 column: {book.status!r}")
+        ids = self.ids
+        if not ids or book.id > ids[-1]:
+            ids.append(book.id)
+            self.years.append(book.year)
+            self.statuses.append(code)
+        else:
+            position = bisect_left(ids, book.id)
+            if position < len(ids) and ids[position] == book.id:
+                # ID удаленной строки используется снова (например, при перестройке каталога)
+                self.deleted -= 1
+                self.years[position] = book.year
+                self.statuses[position] = code
+            else:
+                ids.insert(position, book.id)
+                self.years.insert(position, book.year)
+                self.statuses.insert(position, code)
+        self._count(book.year, code, 1)
+
+    def remove(self, book: Book) -> None:
+        position = self._position(book.id)
+        if position is None:
+            return
+        self._count(self.years[position], self.statuses[position], -1)
+        self.statuses[position] = DELETED
+        self.deleted += 1
+        if self.deleted >= _COMPACT_MIN_DELETED and self.deleted >= len(self.ids) * _COMPACT_FRACTION:
+            self.compact()
+
+    def update_status(self, book: Book) -> None:
+        position = self._position(book.id)
+        if position is None:
+            return
+        self._count(self.years[position], self.statuses[position], -1)
+        self._count(self.years[position], book.status_code, 1)
+        self.statuses[position] = book.status_code
+
+    def clear(self) -> None:
+        self.ids = array("q")
+        self.years = array("i")
+        self.statuses = array("B")
+        self.deleted = 0
+        # (год, код статуса) -> количество книг
+        self.counts: dict[tuple[int, int], int] = {}
+
+    def compact(self) -> None:
+        """
+        Удаляет из столбцов строки, помеченные как удаленные.
+        """
+        if not self.deleted:
+            return
+        live = [position for position, code in enumerate(self.statuses) if code != DELETED]
+        self.ids = array("q", [self.ids[position] for position in live])
+        self.years = array("i", [self.years[position] for position in live])
+        self.statuses = array("B", [self.statuses[position] for position in live])
+        self.deleted = 0
+
+    def _count(self, year: int, code: int, delta: int) -> None:
+        key = (year, code)
+        count = self.counts.get(key, 0) + delta
+        if count:
+            self.counts[key] = count
+        else:
+            del self.counts[key]
+
+    def _position(self, book_id: int) -> Optional[int]:
+        """
+        Находит строку книги (двоичный поиск по столбцу ID) или возвращает None.
+        """
+        position = bisect_left(self.ids, book_id)
+        if position < len(self.ids) and self.ids[position] == book_id and self.statuses[position] != DELETED:
+            return position
+        return None
+
+    def __len__(self) -> int:
+        return len(self.ids) - self.deleted
+
+    # --- Агрегаты по таблице счетчиков ---
+    def _matching_counts(self, start: Optional[int], end: Optional[int],
+                         status: Optional[str]) -> Iterator[tuple[int, int, int]]:
+        """
+        Итерирует (год, код статуса, количество) для пар, удовлетворяющих условиям.
+        """
+        code = None if status is None else status_code(status)
+        low = start if start is not None else -_INT32_LIMIT
+        high = end if end is not None else _INT32_LIMIT
+        for (year, row_code), count in self.counts.items():
+            if (code is None or row_code == code) and low <= year <= high:
+                yield year, row_code, count
+
+    def count(self, start: Optional[int] = None, end: Optional[int] = None, status: Optional[str] = None) -> int:
+        """
+        Считает книги, изданные в диапазоне лет (включительно) и с указанным статусом.
+
+        Аргументы:
+            start (Optional[int]): Нижняя граница года или None.
+            end (Optional[int]): Верхняя граница года или None.
+            status (Optional[str]): Статус или None (любой).
+
+        Возвращает:
+            int: Количество книг.
+        """
+        return sum(count for _, _, count in self._matching_counts(start, end, status))
+
+    def histogram(self, bucket: int = 10, start: Optional[int] = None, end: Optional[int] = None,
+                  status: Optional[str] = None) -> dict[int, int]:
+        """
+        Считает книги по интервалам лет одинаковой длины (по умолчанию - по десятилетиям).
+
+        Аргументы:
+            bucket (int): Длина интервала в годах (1 - группировка по году).
+            start (Optional[int]): Нижняя граница года или None.
+            end (Optional[int]): Верхняя граница года или None.
+            status (Optional[str]): Статус или None (любой).
+
+        Возвращает:
+            dict[int, int]: Первый год интервала -> количество книг (только непустые
+            интервалы, по возрастанию).
+
+        Исключения:
+            ValueError: Если bucket меньше 1.
+        """
+        if bucket < 1:
+            raise ValueError("bucket must be >= 1")
+        histogram: dict[int, int] = {}
+        for year, _, count in self._matching_counts(start, end, status):
+            key = year // bucket * bucket
+            histogram[key] = histogram.get(key, 0) + count
+        return dict(sorted(histogram.items()))
+
+    def count_by_status(self, start: Optional[int] = None, end: Optional[int] = None) -> dict[str, int]:
+        """
+        Считает книги каждого статуса (только встречающиеся статусы).
+
+        Аргументы:
+            start (Optional[int]): Нижняя граница года или None.
+            end (Optional[int]): Верхняя граница года или None.
+
+        Возвращает:
+            dict[str, int]: Статус -> количество книг, в порядке кодов статусов.
+        """
+        by_code: dict[int, int] = {}
+        for _, code, count in self._matching_counts(start, end, None):
+            by_code[code] = by_code.get(code, 0) + count
+        return {status_name(code): by_code[code] for code in sorted(by_code)}
+
+    # --- Отбор строк по столбцам ---
+    def _mask(self, start: Optional[int], end: Optional[int], status: Optional[str]):
+        """
+        Строит булеву маску NumPy строк, удовлетворяющих условиям.
+
+        Массивы NumPy - представления буферов array без копирования; они не
+        возвращаются вызывающему коду, чтобы столбцы можно было дополнять дальше.
+        """
+        statuses = numpy.frombuffer(self.statuses, dtype=numpy.uint8)
+        years = numpy.frombuffer(self.years, dtype=numpy.int32)
+        mask = statuses != DELETED if status is None else statuses == status_code(status)
+        if start is not None:
+            mask &= years >= start
+        if end is not None:
+            mask &= years <= end
+        return mask
+
+    def select_ids(self, start: Optional[int] = None, end: Optional[int] = None,
+                   status: Optional[str] = None) -> list[int]:
+        """
+        Возвращает ID книг, изданных в диапазоне лет (включительно) и с указанным
+        статусом, в порядке возрастания.
+
+        Аргументы:
+            start (Optional[int]): Нижняя граница года или None.
+            end (Optional[int]): Верхняя граница года или None.
+            status (Optional[str]): Статус или None (любой).
+
+        Возвращает:
+            list[int]: ID книг.
+        """
+        if self.use_numpy:
+            ids = numpy.frombuffer(self.ids, dtype=numpy.int64)
+            return ids[self._mask(start, end, status)].tolist()
+        low = start if start is not None else -_INT32_LIMIT
+        high = end if end is not None else _INT32_LIMIT
+        rows = zip(self.ids, self.years, self.statuses)
+        if status is None:
+            return [book_id for book_id, year, code in rows if code != DELETED and low <= year <= high]
+        wanted = status_code(status)
+        return [book_id for book_id, year, code in rows if code == wanted and low <= year <= high]
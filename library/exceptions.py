@@ -0,0 +1,38 @@
+class LibraryError(Exception):
+    """
+    Базовое исключение для ошибок операций библиотеки.
+    """
+
+
+class BookNotFoundError(LibraryError, KeyError):
+    """
+    Книга с указанным ID не найдена.
+    """
+
+    def __init__(self, book_id: int):
+        super().__init__(book_id)
+        self.book_id = book_id
+
+    def __str__(self) -> str:
+        return f"Book with ID {self.book_id} not found"
+
+
+class DuplicateBookError(LibraryError):
+    """
+    Книга с таким же названием, автором и годом уже существует.
+    """
+
+    def __init__(self, title: str, author: str, year: int):
+        super().__init__(title, author, year)
+        self.title = title
+        self.author = author
+        self.year = year
+
+    def __str__(self) -> str:
+        return f"Duplicate book: Title='{self.title}', Author='{self.author}', Year={self.year}"
+
+
+class ValidationError(LibraryError, ValueError):
+    """
+    Некорректные входные данные (пустое поле, недопустимый год, статус или тип поиска).
+    """
@@ -1,6 +1,11 @@
 import logging
 from datetime import datetime
-from library.models import Book
+from typing import Optional
+from library.models import Book, normalize_text
+from library.indexes import parse_year_query
+
+# Допустимые статусы книги
+VALID_STATUSES = ("available", "borrowed")
 
 def get_valid_id(books: list[Book]) -> int:
     """
@@ -18,15 +23,116 @@ def get_valid_id(books: list[Book]) -> int:
     while True:
         try:
             book_id = int(input("Введите ID книги: "))
-            if any(book.id == book_id for book in books):
+            if book_exists(books, book_id):
                 return book_id
             else:
                 print(f"Книга с ID {book_id} не найдена. Пожалуйста, попробуйте снова.")
-                logging.warning(f"Invalid book ID entered: {book_id}")
+                logging.warning("Invalid book ID entered: %s", book_id)
         except ValueError:
             print("Неверный ввод. Пожалуйста, введите числовой ID.")
             logging.warning("Non-numeric input entered for book ID.")
 
+def book_exists(books: list[Book], book_id: int) -> bool:
+    """
+    Проверяет, есть ли в библиотеке книга с указанным ID.
+
+    Для каталога (любого объекта с методом has_id) используется индекс по ID, для
+    обычного списка - перебор.
+
+    Аргументы:
+        books (list[Book]): Список книг в библиотеке.
+        book_id (int): ID книги.
+
+    Возвращает:
+        bool: True, если книга найдена, иначе False.
+    """
+    has_id = getattr(books, "has_id", None)
+    if has_id is not None:
+        return has_id(book_id)
+    return any(book.id == book_id for book in books)
+
+def is_valid_year(year: int, current_year: Optional[int] = None) -> bool:
+    """
+    Проверяет, что год публикации лежит в диапазоне от 1 до текущего года.
+
+    Аргументы:
+        year (int): Год публикации.
+        current_year (Optional[int]): Текущий год. По умолчанию вычисляется автоматически.
+
+    Возвращает:
+        bool: True, если год допустим.
+    """
+    if current_year is None:
+        current_year = datetime.now().year
+    return 0 < year <= current_year
+
+def parse_year(value, current_year: Optional[int] = None) -> int:
+    """
+    Проверяет год публикации без взаимодействия с пользователем (для пакетной обработки).
+
+    Аргументы:
+        value: Год в виде числа или строки.
+        current_year (Optional[int]): Текущий год. По умолчанию вычисляется автоматически.
+
+    Возвращает:
+        int: Действительный год.
+
+    Исключения:
+        ValueError: Если значение не является числом или год вне допустимого диапазона.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"invalid year: {value!r}")
+    try:
+        year = int(str(value).strip()) if not isinstance(value, int) else value
+    except ValueError:
+        raise ValueError(f"non-numeric year: {value!r}") from None
+    if not is_valid_year(year, current_year):
+        raise ValueError(f"year out of range: {year}")
+    return year
+
+def parse_non_empty_string(value, field: str) -> str:
+    """
+    Проверяет, что значение поля - непустая строка (без взаимодействия с пользователем).
+
+    Аргументы:
+        value: Значение поля.
+        field (str): Название поля для сообщения об ошибке.
+
+    Возвращает:
+        str: Строка без начальных и конечных пробелов.
+
+    Исключения:
+        ValueError: Если значение отсутствует или пусто.
+    """
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"empty {field}")
+    return value.strip()
+
+def parse_status(value, default: Optional[str] = "available") -> str:
+    """
+    Проверяет статус книги (без взаимодействия с пользователем). Пустое значение
+    означает статус по умолчанию.
+
+    Аргументы:
+        value: Статус.
+        default (Optional[str]): Статус для пустого значения (при добавлении и импорте
+            книг - "available"); None - пустое значение недопустимо (изменение статуса).
+
+    Возвращает:
+        str: Действительный статус ("available" или "borrowed").
+
+    Исключения:
+        ValueError: Если статус недопустим или не указан, а default равен None.
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if default is None:
+            raise ValueError("status is required")
+        return default
+    status = str(value).strip().lower()
+    if status not in VALID_STATUSES:
+        raise ValueError(f"invalid status: {value!r}")
+    return status
+
 def get_valid_year() -> int:
     """
     Запрашивает у пользователя действительный год публикации.
@@ -41,11 +147,11 @@ def get_valid_year() -> int:
     while True:
         try:
             year = int(input("Введите год публикации: "))
-            if 0 < year <= current_year:
+            if is_valid_year(year, current_year):
                 return year
             else:
                 print(f"Недействительный год. Пожалуйста, введите год в диапазоне от 1 до {current_year}.")
-                logging.warning(f"Invalid year entered: {year}")
+                logging.warning("Invalid year entered: %s", year)
         except ValueError:
             print("Неверный ввод. Пожалуйста, введите числовой год.")
             logging.warning("Non-numeric input entered for year.")
@@ -68,7 +174,7 @@ def get_valid_status() -> str:
             return "borrowed"
         else:
             print("Неверный выбор. Пожалуйста, введите 1 или 2.")
-            logging.warning(f"Invalid status choice entered: {status_choice}")
+            logging.warning("Invalid status choice entered: %s", status_choice)
 
 def get_search_choice() -> str:
     """
@@ -91,7 +197,7 @@ def get_search_choice() -> str:
             return "year"
         else:
             print("Неверный выбор. Пожалуйста, введите число от 1 до 3.")
-            logging.warning(f"Invalid search choice entered: {search_choice}")
+            logging.warning("Invalid search choice entered: %s", search_choice)
 
 def get_non_empty_string(prompt: str) -> str:
     """
@@ -118,19 +224,34 @@ def filter_books(books: list[Book], search_type: str, search_query: str) -> list
     Аргументы:
         books (list[Book]): Список книг для поиска.
         search_type (str): Поле для поиска ("title", "author" или "year").
-        search_query (str): Строка поиска.
+        search_query (str): Строка поиска. Название и автор сравниваются без учета
+            регистра по нормализованным ключам книги (normalize_text). Для года
+            поддерживаются точный год ("2001"), диапазон ("1990-2000") и открытые
+            границы (">=2015", "<2000").
 
     Возвращает:
         list[Book]: Список книг, соответствующих критериям поиска.
     """
-    filtered_books = [
-        book for book in books
-        if (search_type == "title" and search_query in book.title.lower()) or
-           (search_type == "author" and search_query in book.author.lower()) or
-           (search_type == "year" and search_query == str(book.year))
-    ]
+    if search_type == "year":
+        year_range = parse_year_query(search_query)
+        if year_range is None:
+            logging.info("Invalid year query: '%s'", search_query)
+            return []
+        start, end = year_range
+        filtered_books = [
+            book for book in books
+            if (start is None or book.year >= start) and (end is None or book.year <= end)
+        ]
+    elif search_type == "title":
+        query = normalize_text(search_query)
+        filtered_books = [book for book in books if query in book.title_key]
+    elif search_type == "author":
+        query = normalize_text(search_query)
+        filtered_books = [book for book in books if query in book.author_key]
+    else:
+        filtered_books = []
     if not filtered_books:
-        logging.info(f"No books matched the search. Type='{search_type}', Query='{search_query}'")
+        logging.info("No books matched the search. Type='%s', Query='%s'", search_type, search_query)
     return filtered_books
 
 def is_library_empty(books: list[Book]) -> bool:
@@ -0,0 +1,272 @@
+import re
+from bisect import bisect_left, bisect_right, insort
+from typing import Optional
+from library.models import Book, normalize_text
+
+_YEAR_RANGE_RE = re.compile(r"^(\d+)\s*-\s*(\d+)$")
+_YEAR_BOUND_RE = re.compile(r"^(>=|<=|>|<)\s*(\d+)$")
+
+
+def parse_year_query(query: str) -> Optional[tuple[Optional[int], Optional[int]]]:
+    """
+    Разбирает запрос по году: точный год ("2001"), диапазон ("1990-2000")
+    или открытую границу (">=2015", "<=1900", ">2000", "<2000").
+
+    Аргументы:
+        query (str): Строка запроса.
+
+    Возвращает:
+        Optional[tuple[Optional[int], Optional[int]]]: Включительные границы (start, end),
+        где None означает отсутствие границы, или None, если запрос некорректен.
+    """
+    query = query.strip()
+    if query.isdigit():
+        year = int(query)
+        return year, year
+    match = _YEAR_RANGE_RE.match(query)
+    if match:
+        start, end = int(match.group(1)), int(match.group(2))
+        return (start, end) if start <= end else (end, start)
+    match = _YEAR_BOUND_RE.match(query)
+    if match:
+        operator, year = match.group(1), int(match.group(2))
+        if operator == ">=":
+            return year, None
+        if operator == ">":
+            return year + 1, None
+        if operator == "<=":
+            return None, year
+        return None, year - 1
+    return None
+
+
+class BookIndex:
+    """
+    Базовый класс вторичного индекса над BookCatalog.
+
+    Каталог вызывает add/remove при каждом добавлении и удалении книги, update_status
+    после изменения статуса книги и clear при полной перестройке, поэтому индекс
+    обновляется инкрементально.
+    """
+
+    def add(self, book: Book) -> None:
+        raise NotImplementedError
+
+    def remove(self, book: Book) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def update_status(self, book: Book) -> None:
+        # Индексы, не зависящие от статуса, изменение статуса не затрагивает
+        pass
+
+
+class DuplicateKeyIndex(BookIndex):
+    """
+    Индекс нормализованных ключей (название, автор, год) для проверки дубликатов за O(1).
+    """
+
+    def __init__(self):
+        # Ключ -> количество книг с этим ключом (в загруженных данных дубликаты возможны)
+        self._counts: dict[tuple[str, str, int], int] = {}
+
+    @staticmethod
+    def make_key(title: str, author: str, year: int) -> tuple[str, str, int]:
+        """
+        Строит нормализованный ключ книги.
+
+        Аргументы:
+            title (str): Название книги.
+            author (str): Автор книги.
+            year (int): Год издания.
+
+        Возвращает:
+            tuple[str, str, int]: Ключ для сравнения книг.
+        """
+        return normalize_text(title), normalize_text(author), year
+
+    def contains(self, title: str, author: str, year: int) -> bool:
+        """
+        Проверяет, есть ли книга с таким же названием, автором и годом.
+        """
+        return self.make_key(title, author, year) in self._counts
+
+    def add(self, book: Book) -> None:
+        key = (book.title_key, book.author_key, book.year)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def remove(self, book: Book) -> None:
+        key = (book.title_key, book.author_key, book.year)
+        count = self._counts.get(key, 0)
+        if count <= 1:
+            self._counts.pop(key, None)
+        else:
+            self._counts[key] = count - 1
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
+class TrigramIndex(BookIndex):
+    """
+    Инвертированный индекс n-грамм (по умолчанию триграмм) по нормализованному полю книги.
+
+    Используется для сужения множества кандидатов при поиске подстроки: книга может
+    содержать запрос, только если содержит все его n-граммы. Окончательная проверка
+    подстроки выполняется вызывающим кодом.
+    """
+
+    def __init__(self, field: str, gram_size: int = 3):
+        """
+        Инициализирует индекс.
+
+        Аргументы:
+            field (str): Поле книги ("title" или "author").
+            gram_size (int): Длина n-граммы. По умолчанию 3.
+        """
+        self.field = field
+        # Нормализованное поле книги (title_key или author_key)
+        self.key_field = f"{field}_key"
+        self.gram_size = gram_size
+        self._postings: dict[str, set[int]] = {}
+
+    def grams(self, text: str) -> set[str]:
+        """
+        Разбивает нормализованную строку на множество n-грамм.
+
+        Аргументы:
+            text (str): Нормализованная строка.
+
+        Возвращает:
+            set[str]: Множество n-грамм (пустое, если строка короче n).
+        """
+        size = self.gram_size
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+    def add(self, book: Book) -> None:
+        postings = self._postings
+        book_id = book.id
+        for gram in self.grams(getattr(book, self.key_field)):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {book_id}
+            else:
+                posting.add(book_id)
+
+    def remove(self, book: Book) -> None:
+        for gram in self.grams(getattr(book, self.key_field)):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(book.id)
+            if not posting:
+                del self._postings[gram]
+
+    def clear(self) -> None:
+        self._postings.clear()
+
+    def estimate(self, query: str) -> Optional[int]:
+        """
+        Оценивает количество кандидатов для запроса без их построения: размер самого
+        короткого списка ID среди n-грамм запроса (верхняя граница).
+
+        Аргументы:
+            query (str): Нормализованный поисковый запрос.
+
+        Возвращает:
+            Optional[int]: Оценка или None, если запрос короче n-граммы.
+        """
+        grams = self.grams(query)
+        if not grams:
+            return None
+        return min(len(self._postings.get(gram, ())) for gram in grams)
+
+    def candidate_ids(self, query: str) -> Optional[set[int]]:
+        """
+        Возвращает ID книг, которые могут содержать запрос как подстроку.
+
+        Аргументы:
+            query (str): Нормализованный поисковый запрос.
+
+        Возвращает:
+            Optional[set[int]]: Множество ID-кандидатов или None, если запрос короче
+            n-граммы и индекс не может сузить поиск.
+        """
+        grams = self.grams(query)
+        if not grams:
+            return None
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        # Пересечение начинается с самого короткого списка
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+
+class YearIndex(BookIndex):
+    """
+    Упорядоченный индекс по году издания.
+
+    Хранит отсортированный список различных годов и для каждого года множество ID книг,
+    поэтому точные, диапазонные и открытые запросы выполняются за O(log n + k).
+    """
+
+    def __init__(self):
+        self._years: list[int] = []
+        self._ids_by_year: dict[int, set[int]] = {}
+
+    def add(self, book: Book) -> None:
+        ids = self._ids_by_year.get(book.year)
+        if ids is None:
+            ids = self._ids_by_year[book.year] = set()
+            insort(self._years, book.year)
+        ids.add(book.id)
+
+    def remove(self, book: Book) -> None:
+        ids = self._ids_by_year.get(book.year)
+        if ids is None:
+            return
+        ids.discard(book.id)
+        if not ids:
+            del self._ids_by_year[book.year]
+            del self._years[bisect_left(self._years, book.year)]
+
+    def clear(self) -> None:
+        self._years.clear()
+        self._ids_by_year.clear()
+
+    def count(self, start: Optional[int] = None, end: Optional[int] = None) -> int:
+        """
+        Возвращает количество книг, изданных в диапазоне лет (включительно).
+        """
+        low = 0 if start is None else bisect_left(self._years, start)
+        high = len(self._years) if end is None else bisect_right(self._years, end)
+        return sum(len(self._ids_by_year[year]) for year in self._years[low:high])
+
+    def range_ids(self, start: Optional[int] = None, end: Optional[int] = None) -> list[int]:
+        """
+        Возвращает ID книг, изданных в диапазоне лет (включительно).
+
+        Аргументы:
+            start (Optional[int]): Нижняя граница или None.
+            end (Optional[int]): Верхняя граница или None.
+
+        Возвращает:
+            list[int]: ID книг, упорядоченные по году, внутри года - по ID.
+        """
+        low = 0 if start is None else bisect_left(self._years, start)
+        high = len(self._years) if end is None else bisect_right(self._years, end)
+        result = []
+        for year in self._years[low:high]:
+            result.extend(sorted(self._ids_by_year[year]))
+        return result
@@ -0,0 +1,127 @@
+import json
+import os
+import logging
+from library.models import Book
+
+
+class BookJournal:
+    """
+    Журнал изменений (write-ahead log), который хранится рядом с books.json.
+
+    Каждое изменение библиотеки дописывается в конец журнала одной JSON-строкой,
+    поэтому стоимость записи не зависит от размера каталога. При загрузке журнал
+    применяется поверх последнего снимка, а после превышения порога размера
+    сворачивается в новый снимок.
+    """
+
+    SUFFIX = ".journal"
+
+    def __init__(self, books_file: str, fsync: bool = False):
+        """
+        Инициализирует журнал для указанного файла снимка.
+
+        Аргументы:
+            books_file (str): Путь к JSON-файлу снимка (books.json).
+            fsync (bool): Вызывать ли os.fsync после каждой записи. По умолчанию False.
+        """
+        self.path = books_file + self.SUFFIX
+        self.fsync = fsync
+        # Наибольший ID, встреченный при последнем применении журнала (включая удаленные книги)
+        self.max_seen_id = 0
+
+    # --- Запись ---
+    def append(self, record: dict) -> None:
+        """
+        Дописывает одну запись в конец журнала.
+
+        Аргументы:
+            record (dict): Запись вида {"op": ..., ...}.
+
+        Исключения:
+            IOError: Если возникла проблема при записи в файл.
+        """
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(line)
+            if self.fsync:
+                file.flush()
+                os.fsync(file.fileno())
+
+    def log_add(self, book: Book) -> None:
+        """Записывает в журнал добавление книги."""
+        self.append({"op": "add", "book": book.to_dict()})
+
+    def log_delete(self, book_id: int) -> None:
+        """Записывает в журнал удаление книги."""
+        self.append({"op": "delete", "id": book_id})
+
+    def log_status(self, book_id: int, status: str) -> None:
+        """Записывает в журнал изменение статуса книги."""
+        self.append({"op": "status", "id": book_id, "status": status})
+
+    # --- Чтение ---
+    def size(self) -> int:
+        """
+        Возвращает текущий размер журнала в байтах.
+
+        Возвращает:
+            int: Размер файла журнала или 0, если журнала нет.
+        """
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def replay(self, books: list[Book]) -> list[Book]:
+        """
+        Применяет записи журнала поверх списка книг из снимка.
+
+        Применение идемпотентно: если снимок уже содержит изменения из журнала
+        (например, после сбоя во время сжатия), повторное применение ничего не ломает.
+        Поврежденная последняя строка (оборванная запись) игнорируется.
+
+        Аргументы:
+            books (list[Book]): Книги, загруженные из снимка.
+
+        Возвращает:
+            list[Book]: Книги после применения журнала.
+        """
+        if not os.path.exists(self.path):
+            return books
+
+        books_by_id = {book.id: book for book in books}
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning("Skipping corrupted journal record at line %s in %s", line_number, self.path)
+                    continue
+                op = record.get("op")
+                if op == "add":
+                    book = Book.from_dict(record["book"])
+                    books_by_id[book.id] = book
+                    self.max_seen_id = max(self.max_seen_id, book.id)
+                    continue
+                if "id" in record:
+                    # ID удаленной книги тоже учитывается, чтобы он не был выдан повторно
+                    self.max_seen_id = max(self.max_seen_id, record["id"])
+                if op == "delete":
+                    books_by_id.pop(record["id"], None)
+                elif op == "status":
+                    book = books_by_id.get(record["id"])
+                    if book is not None:
+                        book.status = record["status"]
+                else:
+                    logging.warning("Unknown journal operation '%s' at line %s in %s", op, line_number, self.path)
+        return list(books_by_id.values())
+
+    def truncate(self) -> None:
+        """
+        Очищает журнал после того, как его содержимое попало в снимок.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,160 @@
+import json
+from collections.abc import Iterable, Iterator
+from typing import IO, Optional
+
+# Размер порции, читаемой из файла за один раз
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+# Ошибка разбора ближе этого количества символов к концу буфера может означать,
+# что элемент просто не дочитан (оборванное число, литерал или escape-последовательность)
+_INCOMPLETE_TAIL = 16
+
+# Кодировщик строк из модуля json (C-реализация, если доступна)
+_encode_string = json.encoder.encode_basestring_ascii
+
+
+def iter_json_array(file: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Потоково разбирает JSON-массив верхнего уровня, возвращая элементы по одному.
+
+    В памяти одновременно находится только текущая порция текста и один элемент,
+    а не весь файл и весь список словарей, как при json.load.
+
+    Аргументы:
+        file (IO[str]): Открытый текстовый файл с JSON-массивом.
+        chunk_size (int): Размер порции чтения в символах.
+
+    Возвращает:
+        Iterator[dict]: Элементы массива.
+
+    Исключения:
+        JSONDecodeError: Если файл не является корректным JSON-массивом.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    # Размер следующей порции: удваивается, пока один элемент не помещается в буфер,
+    # чтобы повторный разбор большого элемента не стал квадратичным
+    read_size = chunk_size
+
+    def fill() -> bool:
+        # Дочитывает следующую порцию, отбрасывая уже разобранную часть буфера
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = file.read(read_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        # Пропускает пробельные символы и возвращает следующий значимый символ
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+
+    if next_char() != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+    pos += 1
+    if next_char() == "]":
+        return
+
+    while True:
+        if not next_char():
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            # Элемент не поместился в буфер целиком - дочитываем и пробуем снова.
+            # Ошибка в середине буфера - синтаксическая: остаток файла не читается
+            if _is_incomplete(e, buffer) and fill():
+                read_size *= 2
+                continue
+            raise
+        if end >= len(buffer) and fill():
+            # Значение упирается в конец буфера (например, число) и может продолжаться
+            read_size *= 2
+            continue
+        pos = end
+        read_size = chunk_size
+        yield item
+
+        separator = next_char()
+        if separator == ",":
+            pos += 1
+        elif separator == "]":
+            return
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+
+
+def _is_incomplete(error: json.JSONDecodeError, buffer: str) -> bool:
+    """
+    Проверяет, может ли ошибка разбора объясняться тем, что элемент дочитан не полностью.
+    """
+    return error.pos >= len(buffer) - _INCOMPLETE_TAIL or error.msg.startswith("Unterminated string")
+
+
+def _encode_indented(item: dict, encode) -> Optional[str]:
+    """
+    Кодирует плоский словарь так же, как json.dumps(item, indent=4) внутри массива,
+    но через быстрый кодировщик скаляров. Для вложенных значений возвращает None.
+    """
+    parts = []
+    for key, value in item.items():
+        if type(key) is not str or isinstance(value, (dict, list, tuple)):
+            return None
+        if type(value) is str:
+            text = _encode_string(value)
+        elif type(value) is int:
+            text = int.__repr__(value)
+        else:
+            text = encode(value)
+        parts.append(f"        {_encode_string(key)}: {text}")
+    if not parts:
+        return "    {}"
+    return "    {\n" + ",\n".join(parts) + "\n    }"
+
+
+def write_json_array(file: IO[str], items: Iterable[dict], compact: bool = False) -> None:
+    """
+    Потоково записывает JSON-массив, не собирая все элементы в один список.
+
+    В обычном режиме формат совпадает с json.dump(..., indent=4). В компактном режиме
+    каждый элемент записывается одной строкой без отступов, что заметно уменьшает файл.
+
+    Аргументы:
+        file (IO[str]): Открытый для записи текстовый файл.
+        items (Iterable[dict]): Элементы массива.
+        compact (bool): Компактный формат без отступов. По умолчанию False.
+    """
+    if compact:
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+    else:
+        # Модуль json не использует C-ускорение при indent, поэтому плоские записи
+        # форматируются вручную, а кодировщик с отступами остается запасным вариантом
+        encode_scalar = json.JSONEncoder().encode
+        encode_nested = json.JSONEncoder(indent=4).encode
+
+        def encode(item: dict) -> str:
+            text = _encode_indented(item, encode_scalar)
+            if text is None:
+                text = "    " + encode_nested(item).replace("\n", "\n    ")
+            return text
+
+    first = True
+    for item in items:
+        file.write(("[\n" if first else ",\n") + encode(item))
+        first = False
+    file.write("[]" if first else "\n]")
@@ -1,72 +1,624 @@
-import json
-import os
 import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 from library.models import Book
+from library.catalog import BookCatalog
+from library.storage import DEFAULT_JOURNAL_THRESHOLD, StorageBackend, open_storage
+from library.sqlite_storage import SqliteCatalog
+from library.indexes import normalize_text, parse_year_query
+from library.query_cache import DEFAULT_QUERY_CACHE_SIZE, QueryCache
+from library.metrics import Metrics, instrumented
+from library.locks import FileLock, NullLock, ReadWriteLock
+from library.parallel_search import ShardedSearch
+from library.query_engine import QueryResult, parse_query, run_query
+from library.columnar import ColumnarView
+from library.table_view import DEFAULT_PAGE_SIZE, TablePager
+from library.exceptions import BookNotFoundError, DuplicateBookError, ValidationError
 import library.helper_functions as helper_functions
 
+# Поля, по которым поддерживается поиск
+SEARCH_TYPES = ("title", "author", "year")
+
 class Library:
-    def __init__(self, books_file: str = "books.json"):
+    def __init__(self, books_file: str = "books.json", journal: bool = False,
+                 journal_threshold: int = DEFAULT_JOURNAL_THRESHOLD, compact: bool = False,
+                 storage: Optional[StorageBackend] = None, thread_safe: bool = False,
+                 shared: bool = False, commit_every: int = 1, commit_interval_ms: int = 0,
+                 query_cache_size: int = DEFAULT_QUERY_CACHE_SIZE, metrics: bool = False,
+                 search_workers: int = 0, page_size: int = DEFAULT_PAGE_SIZE):
         """
         Инициализировать экземпляр библиотеки.
 
         Аргументы:
-            books_file (str): Путь к файлу, где хранятся данные о книгах.
+            books_file (str): Путь к файлу, где хранятся данные о книгах. Хранилище выбирается
+                по расширению: ".bookdb" - двоичный снимок, ".sqlite"/".sqlite3"/".db" - SQLite,
+                иначе - JSON.
+            journal (bool): Режим журнала: каждое изменение дописывается в
+                books_file + ".journal" вместо перезаписи всего файла. По умолчанию False.
+            journal_threshold (int): Размер журнала в байтах, после которого он
+                сворачивается в новый снимок.
+            compact (bool): Сохранять books.json в компактном формате (одна книга на строку,
+                без отступов). По умолчанию False.
+            storage (Optional[StorageBackend]): Явно заданное хранилище. Если указано,
+                параметры выше (кроме books_file) не используются.
+            thread_safe (bool): Защитить каталог блокировкой "читатели-писатель": поиски
+                выполняются параллельно, изменения - монопольно. По умолчанию False.
+            shared (bool): Режим общего файла для нескольких процессов: изменения
+                выполняются под монопольной блокировкой файла (fcntl) поверх свежей
+                версии каталога, перечитанной с диска, если ее изменил другой процесс.
+                По умолчанию False.
+            commit_every (int): Политика сохранения: 1 - сохранять каждое изменение сразу
+                (по умолчанию), N > 1 - сохранять после каждых N изменений.
+            commit_interval_ms (int): Если больше 0, фоновый поток сохраняет накопленные
+                изменения каждые commit_interval_ms миллисекунд, а изменения только
+                помечают каталог как измененный. Включает потокобезопасный режим.
+            query_cache_size (int): Размер LRU-кэша результатов поиска; 0 отключает кэш.
+            metrics (bool): Собирать замеры длительности операций (см. stats()). По умолчанию False.
+            search_workers (int): Количество процессов для параллельного поиска по большим
+                каталогам (см. ShardedSearch); 0 - только последовательный поиск (по умолчанию).
+            page_size (int): Количество книг на странице таблицы в меню (см. TablePager).
+
+        Исключения:
+            ValueError: Если параметры политики сохранения некорректны или отложенное
+                сохранение запрошено в общем режиме (shared).
         """
+        if commit_every < 1 or commit_interval_ms < 0:
+            raise ValueError("commit_every must be >= 1 and commit_interval_ms must be >= 0")
+        if search_workers < 0:
+            raise ValueError("search_workers must be >= 0")
+        if page_size < 1:
+            raise ValueError("page_size must be >= 1")
+        if shared and (commit_every > 1 or commit_interval_ms):
+            # Отложенные изменения перезаписали бы изменения других процессов
+            raise ValueError("shared mode requires immediate commits")
         self.books_file = books_file
-        self.books = self.load_books()
+        self.storage = storage if storage is not None else open_storage(
+            books_file, journal=journal, journal_threshold=journal_threshold, compact=compact
+        )
+        self.shared = shared
+        # Фоновому потоку сохранения нужна блокировка, даже если о ней не просили
+        self.thread_safe = thread_safe or bool(commit_interval_ms)
+        self._lock = ReadWriteLock() if self.thread_safe else NullLock()
+        self._file_lock = FileLock(books_file) if shared else NullLock()
+        # Глубина вложенности group_commit, наличие и количество несохраненных изменений
+        self._deferred = 0
+        self._dirty = False
+        self._pending = 0
+        self.commit_every = commit_every
+        self.commit_interval_ms = commit_interval_ms
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
+        self.query_cache = QueryCache(query_cache_size)
+        self.metrics = Metrics(enabled=metrics)
+        self.parallel_search = ShardedSearch(search_workers) if search_workers else None
+        self.page_size = page_size
+        # Столбцовое представление каталога для аналитики строится при первом обращении
+        self._columns_lock = threading.Lock()
+        with self._file_lock.shared():
+            self.books = self.load_books()
+            self._version = self.storage.version() if shared else None
+        if commit_interval_ms:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="library-flusher", daemon=True)
+            self._flusher.start()
+
+    @property
+    def books(self) -> BookCatalog:
+        """
+        Книги библиотеки, упорядоченные по ID, с индексом id -> Book.
+        """
+        return self._books
+
+    @books.setter
+    def books(self, books) -> None:
+        self._books = books if isinstance(books, (BookCatalog, SqliteCatalog)) else BookCatalog(books)
+        self._columns: Optional[ColumnarView] = None
+        # Кэш создается после первой загрузки каталога в __init__
+        if hasattr(self, "query_cache"):
+            self.query_cache.invalidate()
+
+    @property
+    def metrics(self) -> Metrics:
+        """
+        Замеры операций. Инструментированные методы оборачиваются только тогда,
+        когда метрики или профилирование включены.
+        """
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics: Metrics) -> None:
+        if getattr(self, "_metrics", None) is not None:
+            self._metrics.detach(self)
+        self._metrics = metrics
+        metrics.attach(self)
 
     # --- Операции с файлами ---
-    def load_books(self) -> list[Book]:
+    @instrumented("load_books")
+    def load_books(self) -> BookCatalog:
         """
-        Загружает книги из JSON-файла.
+        Загружает книги из хранилища.
 
         Возвращает:
-            list[Book]: Список объектов Book.
+            BookCatalog: Каталог книг.
+        """
+        return self.storage.load()
 
-        Исключения:
-            JSONDecodeError: Если JSON-файл поврежден.
-            IOError: Если произошла ошибка при чтении файла.
+    @instrumented("save_books")
+    def save_books(self) -> bool:
+        """
+        Сохраняет все книги в хранилище.
+
+        Возвращает:
+            bool: True, если книги сохранены; об ошибке хранилище сообщает само.
+        """
+        with self._lock.write(), self._file_lock.exclusive():
+            # Каталог мог быть изменен напрямую (например, пакетным импортом)
+            self.query_cache.invalidate()
+            saved = self.storage.save(self.books)
+            self._remember_version()
+            return saved
+
+    def _remember_version(self) -> None:
+        """
+        Запоминает версию данных на диске после собственной записи.
+        """
+        if self.shared:
+            self._version = self.storage.version()
+
+    def _refresh(self) -> None:
+        """
+        Перечитывает каталог, если другой процесс изменил данные на диске.
+        Несохраненные изменения этого процесса не отбрасываются: пока они есть,
+        каталог не перечитывается. Вызывается под блокировкой записи.
+        """
+        if not self.shared or self._dirty:
+            return
+        version = self.storage.version()
+        if version is not None and version != self._version:
+            logging.info("%s was changed by another process, reloading.", self.books_file)
+            self.books = self.load_books()
+            self._version = version
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """
+        Монопольный доступ для изменения: блокировка записи потоков и монопольная
+        блокировка файла; каталог предварительно обновляется с диска.
         """
-        if os.path.exists(self.books_file):
+        with self._lock.write(), self._file_lock.exclusive():
+            self._refresh()
+            yield
+
+    def _reading(self):
+        """
+        Разделяемый доступ для чтения (контекстный менеджер). Если другой процесс
+        изменил файл, каталог сначала перечитывается под блокировкой записи.
+        """
+        if self.shared and not self._dirty and self.storage.version() != self._version:
+            with self._lock.write(), self._file_lock.shared():
+                self._refresh()
+        return self._lock.read()
+
+    def _commit(self, op: str, **record) -> None:
+        """
+        Фиксирует одно изменение в хранилище согласно политике сохранения:
+        сразу, после каждых commit_every изменений или фоновым потоком.
+
+        Аргументы:
+            op (str): Тип изменения ("add", "delete" или "status").
+            **record: Данные изменения (book, id, status).
+        """
+        self.query_cache.invalidate()
+        if self._deferred:
+            self._dirty = True
+            return
+        if self.commit_every == 1 and not self.commit_interval_ms:
+            self.storage.commit(self.books, op, **record)
+            self._remember_version()
+            return
+        self._dirty = True
+        self._pending += 1
+        if self.commit_every > 1 and self._pending >= self.commit_every:
+            self.flush()
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Есть ли изменения, еще не сохраненные в хранилище.
+        """
+        return self._dirty
+
+    def _flush_periodically(self) -> None:
+        """
+        Тело фонового потока: сохраняет накопленные изменения раз в commit_interval_ms.
+        """
+        while not self._stop_flusher.wait(self.commit_interval_ms / 1000):
             try:
-                with open(self.books_file, "r") as file:
-                    books_data = json.load(file)
-                    return [Book.from_dict(book) for book in books_data]
-            except json.JSONDecodeError:
-                error_message = "Error: books.json is corrupted. Starting with an empty library."
-                print(error_message)
-                logging.error(error_message)
-                return []
+                self.flush()
             except Exception as e:
-                error_message = f"Unexpected error while loading books: {e}"
-                print(error_message)
-                logging.error(error_message)
-                return []
-        else:
-            warning_message = "Warning: books.json file not found. A new file will be created."
-            print(warning_message)
-            logging.warning(warning_message)
-            return []
+                logging.error("Background flush failed: %s", e)
+
+    def close(self) -> None:
+        """
+        Останавливает фоновый поток сохранения, сохраняет накопленные изменения
+        и закрывает хранилище. Вызывается при штатном завершении программы.
+        """
+        if self._flusher is not None:
+            self._stop_flusher.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        self.storage.close()
+        if self.parallel_search is not None:
+            self.parallel_search.close()
+
+    @contextmanager
+    def group_commit(self, flush: bool = True) -> Iterator["Library"]:
+        """
+        Откладывает сохранение изменений до выхода из блока: все изменения внутри
+        блока сохраняются одной записью в хранилище. Блоки могут быть вложенными.
+
+        Аргументы:
+            flush (bool): Сохранить изменения при выходе из внешнего блока. Если False,
+                изменения остаются несохраненными до явного вызова flush().
 
-    def save_books(self) -> None:
+        Пример:
+            with library.group_commit():
+                library.add("Dune", "Frank Herbert", 1965)
+                library.set_status(1, "borrowed")
+
+        В потокобезопасном и общем режимах блок целиком выполняется под блокировкой записи.
         """
-        Сохраняет книги в JSON-файл.
+        with self._writing():
+            self._deferred += 1
+            try:
+                yield self
+            finally:
+                self._deferred -= 1
+                if not self._deferred and flush:
+                    self.flush()
+
+    def flush(self) -> None:
+        """
+        Сохраняет отложенные изменения (group_commit или политика сохранения), если они есть.
+        Если сохранить не удалось, изменения остаются отложенными и сохраняются
+        при следующем flush (в том числе из close()).
+        """
+        with self._lock.write():
+            if self._dirty and self.save_books():
+                self._dirty = False
+                self._pending = 0
+
+    # --- Программный интерфейс ---
+    @instrumented("add")
+    def add(self, title: str, author: str, year: int, status: str = "available") -> Book:
+        """
+        Добавляет книгу без взаимодействия с пользователем.
+
+        Аргументы:
+            title (str): Название книги.
+            author (str): Автор книги.
+            year (int): Год издания.
+            status (str): Статус книги. По умолчанию "available".
+
+        Возвращает:
+            Book: Добавленная книга.
 
         Исключения:
-            IOError: Если возникла проблема при записи в файл.
-            Exception: Любая другая неожиданная ошибка при сохранении.
+            ValidationError: Если данные книги некорректны.
+            DuplicateBookError: Если такая книга уже существует.
         """
         try:
-            with open(self.books_file, "w") as file:
-                json.dump([book.to_dict() for book in self.books], file, indent=4)
-        except IOError as e:
-            error_message = f"Error: Unable to save books to {self.books_file}. {e}"
-            print(error_message)
-            logging.error(error_message)
-        except Exception as e:
-            error_message = f"Unexpected error while saving books: {e}"
-            print(error_message)
-            logging.error(error_message)
+            title = helper_functions.parse_non_empty_string(title, "title")
+            author = helper_functions.parse_non_empty_string(author, "author")
+            year = helper_functions.parse_year(year)
+            status = helper_functions.parse_status(status)
+        except ValueError as e:
+            raise ValidationError(str(e)) from None
+
+        with self._writing():
+            if self.books.find_duplicate(title, author, year):
+                raise DuplicateBookError(title, author, year)
+
+            new_book = Book(self.books.allocate_id(), title, author, year, status)
+            self.books.append(new_book)
+            self._commit("add", book=new_book)
+        logging.debug("Book added: ID=%d", new_book.id)
+        return new_book
+
+    @instrumented("get")
+    def get(self, book_id: int) -> Book:
+        """
+        Возвращает книгу по ID.
+
+        Аргументы:
+            book_id (int): ID книги.
+
+        Возвращает:
+            Book: Найденная книга.
+
+        Исключения:
+            BookNotFoundError: Если книги с таким ID нет.
+        """
+        with self._reading():
+            return self._find_book(book_id)
+
+    def _find_book(self, book_id: int) -> Book:
+        """
+        Возвращает книгу по ID без замера операции (вызывается под блокировкой).
+
+        Исключения:
+            BookNotFoundError: Если книги с таким ID нет.
+        """
+        book = self.books.get_by_id(book_id)
+        if book is None:
+            raise BookNotFoundError(book_id)
+        return book
+
+    @instrumented("delete")
+    def delete(self, book_id: int) -> Book:
+        """
+        Удаляет книгу по ID.
+
+        Аргументы:
+            book_id (int): ID книги.
+
+        Возвращает:
+            Book: Удаленная книга.
+
+        Исключения:
+            BookNotFoundError: Если книги с таким ID нет.
+        """
+        with self._writing():
+            try:
+                book = self.books.remove_by_id(book_id)
+            except KeyError:
+                raise BookNotFoundError(book_id) from None
+            self._commit("delete", id=book_id)
+        logging.debug("Book deleted: ID=%d", book_id)
+        return book
+
+    @instrumented("set_status")
+    def set_status(self, book_id: int, status: str) -> Book:
+        """
+        Изменяет статус книги. Если статус не меняется, изменение не сохраняется.
+
+        Аргументы:
+            book_id (int): ID книги.
+            status (str): Новый статус ("available" или "borrowed").
+
+        Возвращает:
+            Book: Книга после изменения.
+
+        Исключения:
+            ValidationError: Если статус недопустим или не указан.
+            BookNotFoundError: Если книги с таким ID нет.
+        """
+        try:
+            status = helper_functions.parse_status(status, default=None)
+        except ValueError as e:
+            raise ValidationError(str(e)) from None
+        with self._writing():
+            book = self._find_book(book_id)
+            if book.status != status:
+                book = self.books.update_status(book_id, status)
+                self._commit("status", id=book_id, status=status)
+                logging.debug("Book status changed: ID=%d, Status='%s'", book_id, status)
+        return book
+
+    @instrumented("query")
+    def query(self, search_type: str, search_query: str) -> list[Book]:
+        """
+        Ищет книги по названию, автору (подстрока без учета регистра, см. normalize_text) или году
+        (точный год, диапазон "1990-2000" или граница ">=2015").
+
+        ID найденных книг кэшируются (query_cache) по типу поиска и нормализованному
+        запросу; любое изменение каталога делает кэш устаревшим. Если включен
+        параллельный поиск (search_workers) и кандидатов много, проверка выполняется
+        в процессах-обработчиках.
+
+        Аргументы:
+            search_type (str): Поле для поиска ("title", "author" или "year").
+            search_query (str): Строка поиска.
+
+        Возвращает:
+            list[Book]: Найденные книги, упорядоченные по ID.
+
+        Исключения:
+            ValidationError: Если тип поиска неизвестен, запрос пуст или запрос по году некорректен.
+        """
+        if search_type not in SEARCH_TYPES:
+            raise ValidationError(f"unknown search type: {search_type!r}")
+        try:
+            search_query = normalize_text(helper_functions.parse_non_empty_string(search_query, "query"))
+        except ValueError as e:
+            raise ValidationError(str(e)) from None
+        if search_type == "year" and parse_year_query(search_query) is None:
+            raise ValidationError(f"invalid year query: {search_query!r}")
+
+        key = (search_type, search_query)
+        with self._reading():
+            ids = self.query_cache.get(key)
+            if ids is not None:
+                return [self.books.get_by_id(book_id) for book_id in ids]
+            # Индекс сужает множество кандидатов, filter_books выполняет окончательную проверку
+            candidates = self.books.find_candidates(search_type, search_query)
+            if self.parallel_search is not None and self.parallel_search.accepts(self.books, candidates):
+                matching_books = self.parallel_search.search(self.books, search_type, search_query)
+            else:
+                matching_books = helper_functions.filter_books(candidates, search_type, search_query)
+            self.query_cache.put(key, (book.id for book in matching_books))
+            return matching_books
+
+    @instrumented("find")
+    def find(self, expression: str, sort: Optional[str] = None, limit: Optional[int] = None,
+             offset: int = 0) -> QueryResult:
+        """
+        Ищет книги по составному условию на название, автора, год и статус.
+
+        Пример:
+            library.find("author:tolkien year:1990-2000 status:available", sort="-year", limit=10)
+
+        Планировщик выбирает самый избирательный индекс, остальные условия проверяются
+        на кандидатах; план и количество просмотренных книг доступны в result.plan
+        и result.explain(). Синтаксис выражения описан в query_engine.parse_query.
+
+        Аргументы:
+            expression (str): Выражение запроса.
+            sort (Optional[str]): Поле сортировки ("id", "title", "author", "year", "status";
+                "-" перед именем - по убыванию). По умолчанию - по ID.
+            limit (Optional[int]): Наибольшее количество книг в результате.
+            offset (int): Сколько найденных книг пропустить.
+
+        Возвращает:
+            QueryResult: Найденные книги (result.books) и план выполнения (result.plan).
+
+        Исключения:
+            ValidationError: Если выражение или параметры некорректны.
+        """
+        predicate = parse_query(expression)
+        with self._reading():
+            # Условия на статус отбираются по столбцовому представлению; для SQLite
+            # оно строилось бы заново при каждом запросе
+            columns = self.columns if isinstance(self.books, BookCatalog) else None
+            return run_query(self.books, predicate, sort=sort, limit=limit, offset=offset, columns=columns)
+
+    # --- Аналитика по году и статусу ---
+    def columns(self) -> ColumnarView:
+        """
+        Возвращает столбцовое представление каталога (ID, год, код статуса).
+
+        Для BookCatalog представление строится при первом обращении, подключается к
+        каталогу как вторичный индекс и дальше обновляется инкрементально. Каталог
+        SQLite не поддерживает вторичные индексы, поэтому для него представление
+        строится заново при каждом вызове.
+
+        Возвращает:
+            ColumnarView: Столбцовое представление.
+        """
+        books = self.books
+        if not isinstance(books, BookCatalog):
+            return ColumnarView(books.iter_by_id())
+        with self._columns_lock:
+            if self._columns is None:
+                view = ColumnarView()
+                books.add_index(view)
+                self._columns = view
+            return self._columns
+
+    @staticmethod
+    def _analytics_filter(year: Optional[str], status: Optional[str]) -> tuple:
+        """
+        Проверяет условия аналитического запроса.
+
+        Возвращает:
+            tuple: Границы года (start, end) и статус (или None).
+
+        Исключения:
+            ValidationError: Если запрос по году или статус некорректны.
+        """
+        start = end = None
+        if year is not None:
+            year_range = parse_year_query(str(year))
+            if year_range is None:
+                raise ValidationError(f"invalid year query: {year!r}")
+            start, end = year_range
+        if status is not None:
+            try:
+                status = helper_functions.parse_status(status)
+            except ValueError as e:
+                raise ValidationError(str(e)) from None
+        return start, end, status
+
+    @instrumented("count")
+    def count_books(self, year: Optional[str] = None, status: Optional[str] = None) -> int:
+        """
+        Считает книги по году и статусу без просмотра объектов Book.
+
+        Пример:
+            library.count_books(year="2000-2010", status="available")
+
+        Аргументы:
+            year (Optional[str]): Запрос по году, как в query ("2001", "1990-2000", ">=2015").
+            status (Optional[str]): Статус ("available" или "borrowed").
+
+        Возвращает:
+            int: Количество книг.
+
+        Исключения:
+            ValidationError: Если запрос по году или статус некорректны.
+        """
+        start, end, status = self._analytics_filter(year, status)
+        with self._reading():
+            return self.columns().count(start, end, status)
+
+    @instrumented("histogram")
+    def year_histogram(self, bucket: int = 10, year: Optional[str] = None,
+                       status: Optional[str] = None) -> dict[int, int]:
+        """
+        Считает книги по интервалам лет (по умолчанию - по десятилетиям).
+
+        Аргументы:
+            bucket (int): Длина интервала в годах (1 - по годам).
+            year (Optional[str]): Запрос по году, как в query.
+            status (Optional[str]): Статус ("available" или "borrowed").
+
+        Возвращает:
+            dict[int, int]: Первый год интервала -> количество книг.
+
+        Исключения:
+            ValidationError: Если параметры некорректны.
+        """
+        if isinstance(bucket, bool) or not isinstance(bucket, int) or bucket < 1:
+            raise ValidationError(f"invalid bucket: {bucket!r}")
+        start, end, status = self._analytics_filter(year, status)
+        with self._reading():
+            return self.columns().histogram(bucket, start, end, status)
+
+    @instrumented("status_counts")
+    def status_counts(self, year: Optional[str] = None) -> dict[str, int]:
+        """
+        Считает книги каждого статуса.
+
+        Аргументы:
+            year (Optional[str]): Запрос по году, как в query.
+
+        Возвращает:
+            dict[str, int]: Статус -> количество книг.
+
+        Исключения:
+            ValidationError: Если запрос по году некорректен.
+        """
+        start, end, _ = self._analytics_filter(year, None)
+        with self._reading():
+            return self.columns().count_by_status(start, end)
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику: замеры операций (количество и p50/p95/p99, если метрики
+        включены), объем чтения и записи хранилища, попадания в кэш запросов и индексы.
+
+        Возвращает:
+            dict: Статистика, пригодная для сериализации в JSON.
+        """
+        cache = self.query_cache.stats()
+        lookups = cache["hits"] + cache["misses"]
+        cache["hit_rate"] = cache["hits"] / lookups if lookups else 0.0
+        stats = {
+            "books": len(self.books),
+            "metrics_enabled": self.metrics.enabled,
+            "operations": self.metrics.to_dict(),
+            "storage": {"bytes_read": self.storage.bytes_read, "bytes_written": self.storage.bytes_written},
+            "query_cache": cache,
+        }
+        if isinstance(self.books, BookCatalog):
+            searches = self.books.index_lookups + self.books.full_scans
+            stats["indexes"] = {
+                "index_lookups": self.books.index_lookups,
+                "full_scans": self.books.full_scans,
+                "hit_rate": self.books.index_lookups / searches if searches else 0.0,
+            }
+        return stats
 
     # --- Основные операции ---
     def add_book(self) -> None:
@@ -81,23 +633,13 @@ class Library:
             author = helper_functions.get_non_empty_string("Введите автора книги: ")
             year = helper_functions.get_valid_year()
 
-            # Проверка на существование книги
-            for book in self.books:
-                if book.title.lower() == title.lower() and book.author.lower() == author.lower() and book.year == year:
-                    print(f"Ошибка: Книга с таким названием, автором и годом уже существует в библиотеке.")
-                    logging.warning(f"Duplicate book entry attempted: Title='{title}', Author='{author}', Year={year}")
-                    return
-
-            # Генерация уникального ID
-            book_id = 1 if not self.books else max(book.id for book in self.books) + 1
-
-            # Создание и добавление книги
-            new_book = Book(book_id, title, author, year)
-            self.books.append(new_book)
-            self.save_books()
+            self.add(title, author, year)
             print(f"Книга '{title}' успешно добавлена!")
+        except DuplicateBookError:
+            print(f"Ошибка: Книга с таким названием, автором и годом уже существует в библиотеке.")
+            logging.warning("Duplicate book entry attempted: Title='%s', Author='%s', Year=%s", title, author, year)
         except Exception as e:
-            logging.error(f"Unexpected error while adding a book: {e}")
+            logging.error("Unexpected error while adding a book: %s", e)
             print("Произошла неожиданная ошибка при добавлении книги.")
 
 
@@ -113,12 +655,13 @@ class Library:
                 return
 
             book_id = helper_functions.get_valid_id(self.books)
-            book_to_delete = next(book for book in self.books if book.id == book_id)
-            self.books.remove(book_to_delete)
-            self.save_books()
+            self.delete(book_id)
             print(f"Книга с ID {book_id} успешно удалена.")
+        except BookNotFoundError as e:
+            print(f"Книга с ID {e.book_id} не найдена.")
+            logging.warning("Delete attempted for missing Book ID=%s", e.book_id)
         except Exception as e:
-            logging.error(f"Unexpected error while deleting a book: {e}")
+            logging.error("Unexpected error while deleting a book: %s", e)
             print("Произошла неожиданная ошибка при удалении книги.")
 
     def search_books(self) -> None:
@@ -139,28 +682,55 @@ class Library:
             search_query = helper_functions.get_non_empty_string(f"Введите {search_type}: ").lower()
 
             # Отфильтруйте книги по критериям поиска
-            matching_books = helper_functions.filter_books(self.books, search_type, search_query)
+            matching_books = self.query(search_type, search_query)
 
             if matching_books:
                 print(f"\nНайдено {len(matching_books)} книг(и):")
-                
-                # Вывод заголовка таблицы для результатов поиска
-                print(f"{'ID':<5} {'Название':<30} {'Автор':<20} {'Год':<6} {'Статус':<10}")
-                print("-" * 75)
-                
-                # Вывод данных о каждой найденной книге
-                for book in matching_books:
-                    print(f"{book.id:<5} {book.title:<30} {book.author:<20} {book.year:<6} {book.status:<10}")
+                TablePager(matching_books, page_size=self.page_size).show()
             else:
                 print("\nСовпадений не найдено.")
-                logging.info(f"Search performed: Type='{search_type}', Query='{search_query}', Results=0")
+                logging.info("Search performed: Type='%s', Query='%s', Results=0", search_type, search_query)
+        except ValidationError as e:
+            print("\nНекорректный запрос. Для года используйте формат 2001, 1990-2000 или >=2015.")
+            logging.warning("Invalid search query: %s", e)
         except Exception as e:
-            logging.error(f"Unexpected error while searching for books: {e}")
+            logging.error("Unexpected error while searching for books: %s", e)
+            print("Произошла неожиданная ошибка при поиске книг.")
+
+    def advanced_search(self) -> None:
+        """
+        Ищет книги по составному условию (см. find) и выводит план выполнения.
+
+        Исключения:
+            Exception: Если произошла неожиданная ошибка во время операции поиска.
+        """
+        try:
+            if helper_functions.is_library_empty(self.books):
+                return
+
+            print("\nПример: author:tolkien year:1990-2000 status:available")
+            print('Поля: title, author, year, status; операторы AND, OR и скобки; значения с пробелами - в кавычках.')
+            expression = helper_functions.get_non_empty_string("Введите запрос: ")
+            sort = input("Сортировка (id, title, author, year, status; '-' - по убыванию) [id]: ").strip() or None
+
+            result = self.find(expression, sort=sort)
+            if result.books:
+                print(f"\nНайдено {len(result.books)} книг(и):")
+                TablePager(result.books, page_size=self.page_size, ordered_by_id=sort in (None, "id")).show()
+            else:
+                print("\nСовпадений не найдено.")
+            print(f"\n{result.explain()}")
+        except ValidationError as e:
+            print(f"\nНекорректный запрос: {e}")
+            logging.warning("Invalid search query: %s", e)
+        except Exception as e:
+            logging.error("Unexpected error while searching for books: %s", e)
             print("Произошла неожиданная ошибка при поиске книг.")
 
     def display_books(self) -> None:
         """
-        Отображает все книги в библиотеке в табличном формате.
+        Отображает все книги в библиотеке в табличном формате: в терминале - по страницам
+        с переходом к следующей, предыдущей странице или к книге по ID, иначе - целиком.
 
         Исключения:
             Exception: Если произошла неожиданная ошибка при отображении книг.
@@ -169,15 +739,11 @@ class Library:
             if helper_functions.is_library_empty(self.books):
                 return
 
-            # Вывод заголовка таблицы
-            print(f"{'ID':<5} {'Название':<30} {'Автор':<20} {'Год':<6} {'Статус':<10}")
-            print("-" * 75)
-
-            # Вывод данных о каждой найденной книге
-            for book in self.books:
-                print(f"{book.id:<5} {book.title:<30} {book.author:<20} {book.year:<6} {book.status:<10}")
+            # Каталог в памяти листается срезами, а SQLite читается потоком по мере листания
+            books = self.books if isinstance(self.books, BookCatalog) else self.books.iter_by_id()
+            TablePager(books, page_size=self.page_size).show()
         except Exception as e:
-            logging.error(f"Unexpected error while displaying books: {e}")
+            logging.error("Unexpected error while displaying books: %s", e)
             print("Произошла неожиданная ошибка при отображении книг.")
 
     def change_status(self) -> None:
@@ -192,17 +758,53 @@ class Library:
                 return
 
             book_id = helper_functions.get_valid_id(self.books)
-            book_to_update = next(book for book in self.books if book.id == book_id)
+            book_to_update = self.get(book_id)
             new_status = helper_functions.get_valid_status()
 
             if book_to_update.status == new_status:
                 print(f"Книга уже имеет статус '{new_status}'.")
-                logging.info(f"Status update skipped for Book ID={book_id}. Already '{new_status}'.")
+                logging.info("Status update skipped for Book ID=%s. Already '%s'.", book_id, new_status)
                 return
 
-            book_to_update.status = new_status
-            self.save_books()
+            self.set_status(book_id, new_status)
             print(f"Статус книги с ID {book_id} обновлен на '{new_status}'.")
+        except BookNotFoundError as e:
+            print(f"Книга с ID {e.book_id} не найдена.")
+            logging.warning("Status update attempted for missing Book ID=%s", e.book_id)
+        except Exception as e:
+            logging.error("Unexpected error while updating book status: %s", e)
+            print("Произошла неожиданная ошибка при обновлении статуса книги.")
+
+    def show_stats(self) -> None:
+        """
+        Выводит статистику работы библиотеки.
+
+        Исключения:
+            Exception: Если произошла неожиданная ошибка при получении статистики.
+        """
+        try:
+            stats = self.stats()
+            print(f"\nКниг в библиотеке: {stats['books']}")
+            by_status = ", ".join(f"{status} {count}" for status, count in self.status_counts().items())
+            if by_status:
+                print(f"По статусам: {by_status}")
+            print(f"Прочитано из хранилища: {stats['storage']['bytes_read']} байт, "
+                  f"записано: {stats['storage']['bytes_written']} байт")
+            cache = stats["query_cache"]
+            print(f"Кэш запросов: попаданий {cache['hits']}, промахов {cache['misses']}, "
+                  f"вытеснений {cache['evictions']} ({cache['hit_rate']:.0%})")
+            if "indexes" in stats:
+                indexes = stats["indexes"]
+                print(f"Индексы: поисков по индексу {indexes['index_lookups']}, "
+                      f"полных просмотров {indexes['full_scans']}")
+            if not stats["metrics_enabled"]:
+                print("Замеры операций выключены (запустите с параметром --metrics).")
+                return
+            print(f"\n{'Операция':<12} {'Вызовов':>8} {'p50, мс':>10} {'p95, мс':>10} {'p99, мс':>10}")
+            print("-" * 54)
+            for operation, timing in stats["operations"].items():
+                print(f"{operation:<12} {timing['count']:>8} {timing['p50_ms']:>10.3f} "
+                      f"{timing['p95_ms']:>10.3f} {timing['p99_ms']:>10.3f}")
         except Exception as e:
-            logging.error(f"Unexpected error while updating book status: {e}")
-            print("Произошла неожиданная ошибка при обновлении статуса книги.")
\ No newline at end of file
+            logging.error("Unexpected error while showing stats: %s", e)
+            print("Произошла неожиданная ошибка при получении статистики.")
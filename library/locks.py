@@ -0,0 +1,161 @@
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+
+try:
+    import fcntl
+except ImportError:  # Windows: межпроцессные блокировки недоступны
+    fcntl = None
+
+# Суффикс файла блокировки рядом с файлом данных
+LOCK_SUFFIX = ".lock"
+
+
+class ReadWriteLock:
+    """
+    Блокировка "читатели-писатель" для потоков.
+
+    Несколько потоков могут читать одновременно; писатель получает монопольный
+    доступ. Ожидающий писатель блокирует новых читателей, поэтому поток чтений
+    не может задерживать изменения бесконечно. Блокировка записи повторно входима,
+    а поток, владеющий ею, может также брать блокировку чтения. Повышение
+    блокировки чтения до блокировки записи не поддерживается.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def _held_reads(self) -> int:
+        return getattr(self._local, "reads", 0)
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Захватывает блокировку на чтение.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            # Повторный вход читателя или чтение внутри собственной записи не ждут,
+            # иначе ожидающий писатель привел бы к взаимной блокировке
+            if self._writer != me and not self._held_reads():
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+            self._readers += 1
+        self._local.reads = self._held_reads() + 1
+        try:
+            yield
+        finally:
+            self._local.reads -= 1
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Захватывает блокировку на запись.
+
+        Исключения:
+            RuntimeError: Если поток уже держит блокировку на чтение.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._write_depth += 1
+            else:
+                if self._held_reads():
+                    raise RuntimeError("cannot upgrade a read lock to a write lock")
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer = me
+                self._write_depth = 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+class NullLock:
+    """
+    Блокировка-заглушка с интерфейсом ReadWriteLock и FileLock для однопоточного режима.
+    """
+
+    def read(self):
+        return nullcontext()
+
+    def write(self):
+        return nullcontext()
+
+    def shared(self):
+        return nullcontext()
+
+    def exclusive(self):
+        return nullcontext()
+
+
+class FileLock:
+    """
+    Рекомендательная межпроцессная блокировка файла (fcntl.flock).
+
+    Блокировка берется на отдельном файле path + ".lock", а не на самом файле данных,
+    так как файл данных заменяется атомарным переименованием. Повторный захват в том
+    же процессе только увеличивает счетчик вложенности; вызывающий код должен
+    сериализовать потоки (например, блокировкой записи ReadWriteLock).
+    На платформах без fcntl блокировка ничего не делает.
+    """
+
+    def __init__(self, path: str):
+        """
+        Аргументы:
+            path (str): Путь к файлу данных, который защищает блокировка.
+        """
+        self.path = path + LOCK_SUFFIX
+        self._fd = None
+        self._depth = 0
+
+    @contextmanager
+    def _acquire(self, operation: int) -> Iterator[None]:
+        if self._depth == 0 and fcntl is not None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(self._fd, operation)
+            except BaseException:
+                os.close(self._fd)
+                self._fd = None
+                raise
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0 and self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+
+    def shared(self):
+        """
+        Захватывает разделяемую блокировку (для чтения файла).
+        """
+        return self._acquire(fcntl.LOCK_SH if fcntl is not None else 0)
+
+    def exclusive(self):
+        """
+        Захватывает монопольную блокировку (для изменения файла).
+        """
+        return self._acquire(fcntl.LOCK_EX if fcntl is not None else 0)
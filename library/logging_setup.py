@@ -0,0 +1,147 @@
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from typing import Optional
+
+# Формат записей журнала по умолчанию (как в прежней настройке basicConfig)
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Частые предупреждения, которые при повторении записываются выборочно
+SAMPLED_MESSAGES = (
+    "Invalid book ID entered: %s",
+    "Non-numeric input entered for book ID.",
+    "Invalid menu selection: '%s'",
+    "Invalid search query: %s",
+)
+
+# Из каждых DEFAULT_SAMPLE_EVERY повторений частого предупреждения записывается одно
+DEFAULT_SAMPLE_EVERY = 100
+
+# Стандартные атрибуты LogRecord, которые не считаются дополнительными полями (extra)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирует запись журнала как один JSON-объект в строке (JSON Lines).
+
+    Поля: time, level, logger, message, а также поля, переданные через extra,
+    и трассировка исключения (exception), если она есть.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает только часть повторяющихся записей с указанными шаблонами сообщений.
+
+    Первая запись каждого шаблона пропускается всегда, дальше - одна из every.
+    К пропущенной после подавления записи добавляется поле suppressed с количеством
+    подавленных записей, а к тексту - пометка о них. Остальные записи не затрагиваются.
+    """
+
+    def __init__(self, messages=SAMPLED_MESSAGES, every: int = DEFAULT_SAMPLE_EVERY):
+        """
+        Аргументы:
+            messages: Шаблоны сообщений (первый аргумент вызова logging), подлежащие выборке.
+            every (int): Записывать одну запись из every.
+        """
+        super().__init__()
+        self.messages = frozenset(messages)
+        self.every = every
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.msg not in self.messages or self.every <= 1:
+            return True
+        with self._lock:
+            count = self._counts.get(record.msg, 0)
+            self._counts[record.msg] = count + 1
+        if count % self.every:
+            return False
+        if count:
+            record.suppressed = self.every - 1
+            record.msg = f"{record.msg} (%d similar messages suppressed)"
+            record.args = (*(record.args or ()), self.every - 1)
+        return True
+
+
+class _InlineQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler, который не форматирует запись в потоке вызывающего кода:
+    сообщение собирается из шаблона и аргументов уже в потоке QueueListener.
+    Записи не покидают процесс, поэтому копировать и упрощать их не нужно.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class LoggingSetup:
+    """
+    Результат setup_logging: слушатель очереди, который нужно остановить при завершении.
+    """
+
+    def __init__(self, listener: logging.handlers.QueueListener, handler: logging.Handler):
+        self.listener = listener
+        self.handler = handler
+
+    def shutdown(self) -> None:
+        """
+        Дописывает все записи из очереди в файл и отключает асинхронное логирование.
+        """
+        self.listener.stop()
+        logging.root.removeHandler(self.handler)
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+def setup_logging(filename: str = "app.log", level: int = logging.INFO, json_format: bool = False,
+                  sample_every: int = DEFAULT_SAMPLE_EVERY, handler: Optional[logging.Handler] = None) -> LoggingSetup:
+    """
+    Настраивает асинхронное логирование: вызовы logging только кладут запись в очередь,
+    а запись в файл выполняет отдельный поток (QueueListener). Существующие обработчики
+    корневого логгера удаляются.
+
+    Аргументы:
+        filename (str): Файл журнала.
+        level (int): Минимальный уровень записей.
+        json_format (bool): Писать записи в формате JSON Lines вместо текста.
+        sample_every (int): Выборка частых предупреждений (см. SamplingFilter); 1 - без выборки.
+        handler (Optional[logging.Handler]): Обработчик вместо файлового (например, для тестов).
+
+    Возвращает:
+        LoggingSetup: Объект, у которого при завершении нужно вызвать shutdown().
+    """
+    for existing in logging.root.handlers[:]:
+        logging.root.removeHandler(existing)
+        existing.close()
+
+    target = handler if handler is not None else logging.FileHandler(filename, encoding="utf-8")
+    target.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _InlineQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(every=sample_every))
+    logging.root.addHandler(queue_handler)
+    logging.root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, target, respect_handler_level=True)
+    listener.start()
+    return LoggingSetup(listener, queue_handler)
@@ -0,0 +1,292 @@
+import cProfile
+import functools
+import logging
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Optional
+
+# Границы корзин гистограммы задержек: от 1 мкс до ~100 с с шагом 20%,
+# поэтому процентиль вычисляется с точностью до одной корзины (не хуже 20%)
+_BUCKET_GROWTH = 1.2
+_BUCKET_BOUNDS = []
+_bound = 1e-6
+while _bound < 100:
+    _BUCKET_BOUNDS.append(_bound)
+    _bound *= _BUCKET_GROWTH
+del _bound
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с логарифмическими корзинами.
+
+    Занимает фиксированный объем памяти независимо от количества замеров;
+    процентили вычисляются как верхняя граница корзины.
+    """
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(_BUCKET_BOUNDS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Возвращает приблизительный процентиль задержки в секундах.
+
+        Аргументы:
+            fraction (float): Доля от 0 до 1 (например, 0.99 для p99).
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                return min(_BUCKET_BOUNDS[index], self.max) if index < len(_BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Metrics:
+    """
+    Счетчики и гистограммы задержек операций библиотеки.
+
+    Замеры ведутся для методов, помеченных декоратором instrumented, у объектов,
+    подключенных через attach(). Пока метрики и профилирование выключены, методы
+    вызываются напрямую, без обертки; при включении (enable, profile_next) на
+    классах подключенных объектов устанавливаются обертки с замером, а когда
+    активных объектов класса не остается, исходные методы восстанавливаются. Кроме замеров поддерживается профилирование: следующий вызов
+    выбранной операции выполняется под cProfile, и профиль записывается в файл.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Аргументы:
+            enabled (bool): Включить сбор замеров сразу.
+        """
+        self.enabled = enabled
+        self.timings: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._profile_requests: dict[str, str] = {}
+        # Объекты, на которых устанавливаются обертки инструментированных методов
+        self._targets = weakref.WeakSet()
+        self.active = False
+        self._update_active()
+
+    def _update_active(self) -> None:
+        active = self.enabled or bool(self._profile_requests)
+        if active == self.active:
+            return
+        self.active = active
+        for target in list(self._targets):
+            if active:
+                _install(target, self)
+            else:
+                _uninstall(target)
+
+    def attach(self, target) -> None:
+        """
+        Подключает объект: его инструментированные методы замеряются, пока метрики активны.
+
+        Аргументы:
+            target: Объект, класс которого содержит методы с декоратором instrumented.
+        """
+        self._targets.add(target)
+        if self.active:
+            _install(target, self)
+
+    def detach(self, target) -> None:
+        """
+        Отключает объект: его методы больше не замеряются.
+        """
+        self._targets.discard(target)
+        _uninstall(target)
+
+    def enable(self) -> None:
+        self.enabled = True
+        self._update_active()
+
+    def disable(self) -> None:
+        self.enabled = False
+        self._update_active()
+
+    def reset(self) -> None:
+        """
+        Сбрасывает накопленные замеры.
+        """
+        self.timings.clear()
+
+    def observe(self, operation: str, seconds: float) -> None:
+        """
+        Добавляет замер длительности операции.
+        """
+        with self._lock:
+            histogram = self.timings.get(operation)
+            if histogram is None:
+                histogram = self.timings[operation] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def profile_next(self, operation: str, path: str) -> None:
+        """
+        Профилирует следующий вызов операции и записывает профиль (формат pstats) в файл.
+
+        Аргументы:
+            operation (str): Имя операции (например, "query" или "load_books").
+            path (str): Путь к файлу профиля.
+        """
+        self._profile_requests[operation] = path
+        self._update_active()
+
+    def call(self, operation: str, function, *args, **kwargs):
+        """
+        Вызывает функцию с замером времени и, если запрошено, под cProfile.
+        """
+        profile_path: Optional[str] = self._profile_requests.pop(operation, None)
+        if profile_path is not None:
+            self._update_active()
+        started = time.perf_counter()
+        try:
+            if profile_path is None:
+                return function(*args, **kwargs)
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(function, *args, **kwargs)
+            finally:
+                profiler.dump_stats(profile_path)
+                logging.info("Profile of '%s' written to %s", operation, profile_path)
+        finally:
+            if self.enabled:
+                self.observe(operation, time.perf_counter() - started)
+
+    def to_dict(self) -> dict:
+        return {operation: histogram.to_dict() for operation, histogram in sorted(self.timings.items())}
+
+
+def instrumented(operation: str):
+    """
+    Декоратор метода: помечает его как операцию для замеров (см. Metrics.attach).
+
+    Сам метод не оборачивается, поэтому при выключенных метриках вызов не
+    имеет накладных расходов.
+
+    Аргументы:
+        operation (str): Имя операции в статистике.
+    """
+    def decorator(method):
+        method.metrics_operation = operation
+        return method
+    return decorator
+
+
+@functools.cache
+def _operations(cls: type) -> dict[str, str]:
+    """
+    Возвращает инструментированные методы класса: имя метода -> имя операции.
+    """
+    operations = {}
+    for name in dir(cls):
+        operation = getattr(getattr(cls, name, None), "metrics_operation", None)
+        if operation is not None:
+            operations[name] = operation
+    return operations
+
+
+# id объекта с активными метриками -> (Metrics для его замеров, финализатор)
+_installed: dict[int, tuple[Metrics, weakref.finalize]] = {}
+# Класс с обертками -> количество его объектов с активными метриками
+_wrapped_counts: dict[type, int] = {}
+# Класс с обертками -> исходные атрибуты класса (None - метод унаследован)
+_originals: dict[type, dict[str, Optional[object]]] = {}
+# Реентерабельная: финализатор может сработать при сборке мусора внутри блокировки
+_install_lock = threading.RLock()
+
+
+def _install(target, metrics: Metrics) -> None:
+    """
+    Направляет замеры инструментированных методов объекта в metrics.
+
+    Обертки устанавливаются на класс объекта, а не на сам объект: запись атрибута
+    в объект переводит его словарь в медленный режим (CPython 3.11+), который
+    сохраняется и после удаления атрибута. Пока обертки на классе, объекты без
+    активных метрик вызывают из обертки исходный метод.
+    """
+    key = id(target)
+    with _install_lock:
+        if key in _installed:
+            _installed[key] = (metrics, _installed[key][1])
+            return
+        cls = type(target)
+        _installed[key] = (metrics, weakref.finalize(target, _release, key, cls))
+        if cls not in _wrapped_counts:
+            _wrapped_counts[cls] = 0
+            _originals[cls] = {name: cls.__dict__.get(name) for name in _operations(cls)}
+            for name, operation in _operations(cls).items():
+                method = getattr(cls, name)
+                setattr(cls, name, _timed(operation, getattr(method, "metrics_method", method)))
+        _wrapped_counts[cls] += 1
+
+
+def _timed(operation: str, method):
+    """
+    Возвращает обертку метода, вызывающую его через Metrics.call объекта.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        installed = _installed.get(id(self))
+        if installed is None:
+            return method(self, *args, **kwargs)
+        return installed[0].call(operation, method, self, *args, **kwargs)
+    wrapper.metrics_method = method
+    return wrapper
+
+
+def _uninstall(target) -> None:
+    """
+    Снимает замеры с объекта: методы объекта снова вызываются напрямую.
+    """
+    with _install_lock:
+        installed = _installed.get(id(target))
+        if installed is not None:
+            installed[1].detach()
+            _release(id(target), type(target))
+
+
+def _release(key: int, cls: type) -> None:
+    """
+    Забывает объект (при снятии замеров или удалении объекта); когда у класса не
+    остается объектов с активными метриками, восстанавливает его исходные методы.
+    """
+    with _install_lock:
+        if _installed.pop(key, None) is None:
+            return
+        _wrapped_counts[cls] -= 1
+        if _wrapped_counts[cls]:
+            return
+        del _wrapped_counts[cls]
+        for name, original in _originals.pop(cls).items():
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
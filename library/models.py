@@ -1,4 +1,77 @@
+import sys
+import unicodedata
+
+# Коды статусов: статус хранится в книге как небольшое целое число, а не как строка.
+# Неизвестные статусы регистрируются при первом использовании.
+STATUS_AVAILABLE = 0
+STATUS_BORROWED = 1
+_STATUS_NAMES: list[str] = ["available", "borrowed"]
+_STATUS_CODES: dict[str, int] = {name: code for code, name in enumerate(_STATUS_NAMES)}
+
+# Считать "ё" и "е" одной буквой при поиске и проверке дубликатов ("елка" находит "Ёлка")
+FOLD_YO = True
+
+# Версия правил нормализации: хранилища с сохраненными ключами (SQLite) пересчитывают
+# ключи, если версия изменилась
+KEY_VERSION = 2 if FOLD_YO else 1
+
+_YO_TABLE = str.maketrans({"ё": "е"})
+
+
+def normalize_text(text: str) -> str:
+    """
+    Приводит строку к виду, в котором она сравнивается при поиске и проверке дубликатов:
+    нормализация Unicode NFKC, свертка регистра (casefold) и, если включено FOLD_YO,
+    замена "ё" на "е". Для ASCII-строк это просто lower().
+
+    Аргументы:
+        text (str): Исходная строка.
+
+    Возвращает:
+        str: Нормализованная строка.
+    """
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return text.translate(_YO_TABLE) if FOLD_YO else text
+
+
+def status_code(status: str) -> int:
+    """
+    Возвращает числовой код статуса, регистрируя новый статус при необходимости.
+
+    Аргументы:
+        status (str): Название статуса.
+
+    Возвращает:
+        int: Код статуса.
+    """
+    code = _STATUS_CODES.get(status)
+    if code is None:
+        code = _STATUS_CODES[status] = len(_STATUS_NAMES)
+        _STATUS_NAMES.append(status)
+    return code
+
+
+def status_name(code: int) -> str:
+    """
+    Возвращает название статуса по его коду.
+
+    Аргументы:
+        code (int): Код статуса.
+
+    Возвращает:
+        str: Название статуса.
+    """
+    return _STATUS_NAMES[code]
+
+
 class Book:
+    # Компактное представление: без __dict__ у каждого экземпляра.
+    # title_key и author_key - нормализованные название и автор (normalize_text),
+    # вычисляются один раз при создании книги и используются при поиске и проверке дубликатов.
+    __slots__ = ("id", "title", "author", "year", "status_code", "title_key", "author_key")
+
     def __init__(self, book_id: int, title: str, author: str, year: int, status: str = "available"):
         """
         Инициализирует экземпляр класса Book.
@@ -6,15 +79,30 @@ class Book:
         Аргументы:
             book_id (int): Уникальный идентификатор книги.
             title (str): Название книги.
-            author (str): Автор книги.
+            author (str): Автор книги (строка интернируется, так как авторы часто повторяются).
             year (int): Год издания.
             status (str): Статус книги ("available" или "borrowed"). По умолчанию "available".
         """
         self.id = book_id
         self.title = title
-        self.author = author
+        title_key = normalize_text(title)
+        # Если название уже нормализовано, ключ не занимает отдельной памяти
+        self.title_key = title if title_key == title else title_key
+        self.author = sys.intern(author)
+        self.author_key = sys.intern(normalize_text(author))
         self.year = year
-        self.status = status
+        self.status_code = status_code(status)
+
+    @property
+    def status(self) -> str:
+        """
+        Статус книги в виде строки ("available" или "borrowed").
+        """
+        return _STATUS_NAMES[self.status_code]
+
+    @status.setter
+    def status(self, status: str) -> None:
+        self.status_code = status_code(status)
 
     def to_dict(self) -> dict:
         """
@@ -0,0 +1,188 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from library.models import Book
+from library.catalog import BookCatalog
+from library.indexes import BookIndex
+import library.helper_functions as helper_functions
+
+# Размер каталога (количество кандидатов), начиная с которого поиск выполняется параллельно.
+# На меньших каталогах передача запроса и результатов между процессами дороже самого поиска.
+PARALLEL_SEARCH_THRESHOLD = 500_000
+
+# Доля книг, добавленных после разбиения на шарды, после которой шарды перестраиваются
+_RESHARD_FRACTION = 0.1
+
+# Шард, загруженный в процесс-обработчик (у каждого процесса свой шард)
+_shard: list[Book] = []
+
+
+def _load_shard(rows: list[tuple]) -> int:
+    """
+    Загружает шард в процесс-обработчик. Выполняется в дочернем процессе.
+
+    Аргументы:
+        rows (list[tuple]): Книги шарда в виде кортежей (id, title, author, year).
+
+    Возвращает:
+        int: Количество книг в шарде.
+    """
+    global _shard
+    _shard = [Book(book_id, title, author, year) for book_id, title, author, year in rows]
+    return len(_shard)
+
+
+def _search_shard(search_type: str, search_query: str) -> list[int]:
+    """
+    Ищет книги в загруженном шарде. Выполняется в дочернем процессе.
+
+    Возвращает:
+        list[int]: ID найденных книг в порядке возрастания.
+    """
+    return [book.id for book in helper_functions.filter_books(_shard, search_type, search_query)]
+
+
+class _ShardTracker(BookIndex):
+    """
+    Отслеживает изменения каталога после разбиения на шарды.
+
+    Книги, добавленные с ID больше наибольшего ID в шардах, копятся в pending и
+    проверяются в основном процессе. Любое другое добавление или перестройка
+    каталога делают шарды устаревшими (stale). Удаления не отслеживаются: ID
+    удаленных книг отбрасываются при сборке результата.
+    """
+
+    def __init__(self):
+        self.max_id = 0
+        self.pending: list[Book] = []
+        self.stale = True
+
+    def add(self, book: Book) -> None:
+        if self.stale:
+            return
+        if book.id > self.max_id:
+            self.pending.append(book)
+        else:
+            self.stale = True
+
+    def remove(self, book: Book) -> None:
+        pass
+
+    def clear(self) -> None:
+        self.stale = True
+
+
+class ShardedSearch:
+    """
+    Параллельный поиск по каталогу, разбитому на шарды по диапазонам ID.
+
+    Каждый шард постоянно хранится в своем процессе-обработчике (отдельный
+    ProcessPoolExecutor с одним процессом): книги передаются процессу один раз при
+    разбиении, а для каждого запроса передаются только тип поиска, строка запроса и
+    найденные ID. Так как шарды упорядочены по диапазонам ID, объединение их
+    результатов по порядку дает список, упорядоченный по ID.
+
+    Процессы запускаются при первом параллельном поиске. Небольшие каталоги
+    (меньше min_size кандидатов) ищутся в основном процессе.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_size: int = PARALLEL_SEARCH_THRESHOLD):
+        """
+        Аргументы:
+            workers (Optional[int]): Количество шардов и процессов. По умолчанию - количество ядер.
+            min_size (int): Наименьшее количество кандидатов для параллельного поиска.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.min_size = min_size
+        self._executors: list[ProcessPoolExecutor] = []
+        self._catalog: Optional[BookCatalog] = None
+        self._tracker: Optional[_ShardTracker] = None
+        self._lock = threading.Lock()
+
+    def accepts(self, books, candidates) -> bool:
+        """
+        Решает, выполнять ли поиск параллельно: только для BookCatalog и только
+        если кандидатов не меньше min_size.
+
+        Аргументы:
+            books: Каталог книг.
+            candidates: Кандидаты, отобранные индексами каталога.
+        """
+        return isinstance(books, BookCatalog) and len(candidates) >= self.min_size
+
+    def search(self, books: BookCatalog, search_type: str, search_query: str) -> list[Book]:
+        """
+        Ищет книги параллельно во всех шардах (аналог filter_books по всему каталогу).
+
+        Аргументы:
+            books (BookCatalog): Каталог книг.
+            search_type (str): Поле для поиска ("title", "author" или "year").
+            search_query (str): Строка поиска (в нижнем регистре).
+
+        Возвращает:
+            list[Book]: Найденные книги, упорядоченные по ID.
+        """
+        with self._lock:
+            tracker = self._tracker
+            if (books is not self._catalog or tracker is None or tracker.stale
+                    or len(tracker.pending) > len(books) * _RESHARD_FRACTION):
+                tracker = self._shard(books)
+            futures = [executor.submit(_search_shard, search_type, search_query) for executor in self._executors]
+            pending = list(tracker.pending)
+        by_id = books.get_by_id
+        matching_books = []
+        for future in futures:
+            for book_id in future.result():
+                book = by_id(book_id)
+                # Книга могла быть удалена после разбиения на шарды
+                if book is not None:
+                    matching_books.append(book)
+        # Книги, добавленные после разбиения, имеют наибольшие ID и проверяются здесь
+        if pending:
+            matching_books.extend(book for book in helper_functions.filter_books(pending, search_type, search_query)
+                                  if by_id(book.id) is book)
+        return matching_books
+
+    def _shard(self, books: BookCatalog) -> _ShardTracker:
+        """
+        Разбивает каталог на шарды по диапазонам ID и загружает их в процессы-обработчики.
+        """
+        if not self._executors:
+            # spawn вместо fork: родительский процесс может держать блокировки в других потоках
+            context = multiprocessing.get_context("spawn")
+            self._executors = [ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in range(self.workers)]
+        if self._tracker is not None and self._catalog is books:
+            tracker = self._tracker
+        else:
+            tracker = _ShardTracker()
+            books.add_index(tracker)
+        items = books[:]
+        size = -(-len(items) // self.workers) if items else 0
+        loads = [
+            executor.submit(_load_shard, [(book.id, book.title, book.author, book.year)
+                                          for book in items[index * size:(index + 1) * size]])
+            for index, executor in enumerate(self._executors)
+        ]
+        for load in loads:
+            load.result()
+        tracker.max_id = books.max_id()
+        tracker.pending = []
+        tracker.stale = False
+        self._catalog = books
+        self._tracker = tracker
+        logging.info("Catalog split into %d shards for parallel search (%d books).", self.workers, len(items))
+        return tracker
+
+    def close(self) -> None:
+        """
+        Останавливает процессы-обработчики.
+        """
+        with self._lock:
+            for executor in self._executors:
+                executor.shutdown()
+            self._executors = []
+            self._catalog = None
+            self._tracker = None
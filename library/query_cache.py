@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Optional
+
+# Размер кэша запросов по умолчанию (количество разных запросов)
+DEFAULT_QUERY_CACHE_SIZE = 256
+
+
+class QueryCache:
+    """
+    Ограниченный LRU-кэш результатов поиска: ключ запроса -> кортеж ID найденных книг.
+
+    Инвалидация выполняется счетчиком поколений: любое изменение каталога увеличивает
+    поколение за O(1), а записи прошлых поколений считаются устаревшими и удаляются
+    при обращении к ним. Поэтому кэш никогда не возвращает устаревший ответ.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUERY_CACHE_SIZE):
+        """
+        Аргументы:
+            maxsize (int): Максимальное количество записей; 0 отключает кэш.
+        """
+        self.maxsize = maxsize
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        # Поиски из разных потоков выполняются параллельно под блокировкой чтения
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[tuple[int, ...]]:
+        """
+        Возвращает закэшированные ID или None, если записи нет или она устарела.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != self.generation:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, ids) -> None:
+        """
+        Запоминает результат запроса, вытесняя самую давно использованную запись.
+        """
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._entries[key] = (self.generation, tuple(ids))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """
+        Делает устаревшими все записи (вызывается при каждом изменении каталога).
+        """
+        with self._lock:
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики попаданий, промахов и вытеснений.
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "generation": self.generation,
+        }
@@ -0,0 +1,410 @@
+import re
+from collections.abc import Callable, Iterable
+from typing import Optional, Union
+from library.models import Book, normalize_text
+from library.indexes import parse_year_query
+from library.exceptions import ValidationError
+import library.helper_functions as helper_functions
+
+# Поля, по которым можно строить условия
+FIELDS = ("title", "author", "year", "status")
+
+# Поля, по которым можно сортировать результат
+SORT_FIELDS = ("id", "title", "author", "year", "status")
+
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|(\w+):(?:"([^"]*)"|([^\s()"]+))|([^\s()]+))')
+
+_SORT_KEYS = {
+    "id": lambda book: book.id,
+    "title": lambda book: (book.title_key, book.id),
+    "author": lambda book: (book.author_key, book.id),
+    "year": lambda book: (book.year, book.id),
+    "status": lambda book: (book.status, book.id),
+}
+
+
+class Condition:
+    """
+    Условие на одно поле книги: подстрока в названии или авторе (без учета регистра,
+    см. normalize_text), год (точный, диапазон или граница) или статус.
+    """
+
+    __slots__ = ("field", "value", "_key", "_range")
+
+    def __init__(self, field: str, value: str):
+        """
+        Аргументы:
+            field (str): Поле ("title", "author", "year" или "status").
+            value (str): Значение условия.
+
+        Исключения:
+            ValidationError: Если поле неизвестно или значение некорректно.
+        """
+        if field not in FIELDS:
+            raise ValidationError(f"unknown field: {field!r}")
+        if not isinstance(value, str) or not value.strip():
+            raise ValidationError(f"empty value for {field}")
+        self.field = field
+        self.value = value.strip()
+        self._key = None
+        self._range = None
+        if field == "year":
+            self._range = parse_year_query(self.value)
+            if self._range is None:
+                raise ValidationError(f"invalid year query: {self.value!r}")
+        elif field == "status":
+            try:
+                self._key = helper_functions.parse_status(self.value)
+            except ValueError as e:
+                raise ValidationError(str(e)) from None
+        else:
+            self._key = normalize_text(self.value)
+
+    def matches(self, book: Book) -> bool:
+        if self.field == "title":
+            return self._key in book.title_key
+        if self.field == "author":
+            return self._key in book.author_key
+        if self.field == "year":
+            start, end = self._range
+            return (start is None or book.year >= start) and (end is None or book.year <= end)
+        return book.status == self._key
+
+    def __str__(self) -> str:
+        if self.field == "year":
+            return f"year {self.value}"
+        if self.field == "status":
+            return f"status = {self._key}"
+        return f'{self.field} contains "{self._key}"'
+
+
+class And:
+    """
+    Все условия должны выполняться.
+    """
+
+    __slots__ = ("children",)
+
+    def __init__(self, children: Iterable):
+        self.children = list(children)
+
+    def matches(self, book: Book) -> bool:
+        return all(child.matches(book) for child in self.children)
+
+    def __str__(self) -> str:
+        return " AND ".join(f"({child})" if isinstance(child, Or) else str(child) for child in self.children)
+
+
+class Or:
+    """
+    Должно выполняться хотя бы одно условие.
+    """
+
+    __slots__ = ("children",)
+
+    def __init__(self, children: Iterable):
+        self.children = list(children)
+
+    def matches(self, book: Book) -> bool:
+        return any(child.matches(book) for child in self.children)
+
+    def __str__(self) -> str:
+        return " OR ".join(f"({child})" if isinstance(child, And) else str(child) for child in self.children)
+
+
+Predicate = Union[Condition, And, Or]
+
+
+def _tokenize(expression: str) -> list[tuple]:
+    """
+    Разбивает выражение на лексемы: ("(",), (")",), ("cond", поле, значение), ("word", слово).
+    """
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if match is None:
+            raise ValidationError(f"cannot parse query at position {position}")
+        position = match.end()
+        opening, closing, field, quoted, bare, word = match.groups()
+        if opening:
+            tokens.append(("(",))
+        elif closing:
+            tokens.append((")",))
+        elif field:
+            tokens.append(("cond", field.lower(), quoted if quoted is not None else bare))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+
+def parse_query(expression: str) -> Predicate:
+    """
+    Разбирает выражение языка запросов.
+
+    Условие записывается как поле:значение (значение с пробелами - в кавычках),
+    условия объединяются операторами AND и OR (AND связывает сильнее, между
+    соседними условиями подразумевается AND) и группируются скобками:
+
+        author:tolkien year:1990-2000 status:available
+        (title:"war and peace" OR title:война) AND year:>=1900
+
+    Аргументы:
+        expression (str): Выражение.
+
+    Возвращает:
+        Predicate: Дерево условий (Condition, And, Or).
+
+    Исключения:
+        ValidationError: Если выражение некорректно.
+    """
+    if not isinstance(expression, str) or not expression.strip():
+        raise ValidationError("empty query")
+    tokens = _tokenize(expression)
+    position = 0
+
+    def peek_word() -> Optional[str]:
+        if position < len(tokens) and tokens[position][0] == "word":
+            return tokens[position][1].upper()
+        return None
+
+    def parse_or() -> Predicate:
+        nonlocal position
+        children = [parse_and()]
+        while peek_word() == "OR":
+            position += 1
+            children.append(parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and() -> Predicate:
+        nonlocal position
+        children = [parse_factor()]
+        while position < len(tokens) and tokens[position][0] != ")" and peek_word() != "OR":
+            if peek_word() == "AND":
+                position += 1
+            children.append(parse_factor())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_factor() -> Predicate:
+        nonlocal position
+        if position >= len(tokens):
+            raise ValidationError("unexpected end of query")
+        token = tokens[position]
+        position += 1
+        if token[0] == "(":
+            node = parse_or()
+            if position >= len(tokens) or tokens[position][0] != ")":
+                raise ValidationError("missing closing parenthesis")
+            position += 1
+            return node
+        if token[0] == "cond":
+            return Condition(token[1], token[2])
+        raise ValidationError(f"unexpected token: {token[-1]!r}")
+
+    node = parse_or()
+    if position < len(tokens):
+        raise ValidationError(f"unexpected token: {tokens[position][-1]!r}")
+    return node
+
+
+class AccessPath:
+    """
+    Способ получить кандидатов для фильтрации: индекс или просмотр всего каталога.
+
+    Атрибуты:
+        description (str): Описание для explain.
+        estimate (int): Оценка количества кандидатов.
+        fetch (Callable): Возвращает кандидатов, упорядоченных по ID.
+        indexed (bool): Использует ли путь индекс.
+    """
+
+    __slots__ = ("description", "estimate", "fetch", "indexed")
+
+    def __init__(self, description: str, estimate: int, fetch: Callable[[], Iterable[Book]], indexed: bool = True):
+        self.description = description
+        self.estimate = estimate
+        self.fetch = fetch
+        self.indexed = indexed
+
+
+def _full_scan(books) -> AccessPath:
+    return AccessPath("full scan", len(books), lambda: books, indexed=False)
+
+
+def _merge_by_id(paths: list[AccessPath]) -> list[Book]:
+    merged = {}
+    for path in paths:
+        for book in path.fetch():
+            merged[book.id] = book
+    return [merged[book_id] for book_id in sorted(merged)]
+
+
+def _columns_path(books, columns: Callable, status: Condition, year: Optional[Condition]) -> AccessPath:
+    """
+    Путь доступа по столбцам статуса и года (ColumnarView.select_ids). Количество
+    кандидатов берется из таблицы счетчиков представления и точно.
+    """
+    view = columns()
+    start, end = year._range if year is not None else (None, None)
+    description = f"status/year columns ({status}" + (f", {year})" if year is not None else ")")
+    return AccessPath(description, view.count(start, end, status._key),
+                      lambda: [books.get_by_id(book_id) for book_id in view.select_ids(start, end, status._key)])
+
+
+def plan_access(books, predicate: Predicate, columns: Optional[Callable] = None) -> AccessPath:
+    """
+    Выбирает путь доступа для условия.
+
+    Для условия на название, автора или год используется индекс каталога (если он
+    может сузить поиск), для условия на статус - столбцовое представление (если
+    передано), для AND - самый избирательный из путей дочерних условий (условия на
+    статус и год при этом отбираются по столбцам вместе), для OR - объединение
+    путей, если путь есть у каждого дочернего условия. Иначе каталог
+    просматривается целиком. Избирательность оценивается без построения списков
+    кандидатов (BookCatalog.estimate, таблица счетчиков ColumnarView).
+
+    Аргументы:
+        books: Каталог (BookCatalog или SqliteCatalog).
+        predicate (Predicate): Условие.
+        columns (Optional[Callable]): Возвращает ColumnarView каталога (вызывается,
+            только если в условии есть статус); None - без столбцового представления.
+
+    Возвращает:
+        AccessPath: Выбранный путь доступа.
+    """
+    if isinstance(predicate, Condition):
+        if predicate.field == "status" and columns is not None:
+            return _columns_path(books, columns, predicate, None)
+        estimate = getattr(books, "estimate", None)
+        if predicate.field == "status" or estimate is None:
+            return _full_scan(books)
+        rows = estimate(predicate.field, predicate.value)
+        if rows is None:
+            return _full_scan(books)
+        field, value = predicate.field, predicate.value
+        return AccessPath(f"{field} index ({value})", rows, lambda: books.find_candidates(field, value))
+    paths = [plan_access(books, child, columns) for child in predicate.children]
+    if isinstance(predicate, And):
+        indexed = [path for path in paths if path.indexed]
+        if columns is not None:
+            # Условия на статус и год отбираются по столбцам за один проход
+            conditions = [child for child in predicate.children if isinstance(child, Condition)]
+            status = next((child for child in conditions if child.field == "status"), None)
+            year = next((child for child in conditions if child.field == "year"), None)
+            if status is not None and year is not None:
+                indexed.insert(0, _columns_path(books, columns, status, year))
+        return min(indexed, key=lambda path: path.estimate) if indexed else _full_scan(books)
+    if all(path.indexed for path in paths):
+        total = sum(path.estimate for path in paths)
+        if total < len(books):
+            return AccessPath("union of " + ", ".join(path.description for path in paths), total,
+                              lambda: _merge_by_id(paths))
+    return _full_scan(books)
+
+
+class QueryResult:
+    """
+    Результат запроса: найденные книги и план выполнения.
+    """
+
+    def __init__(self, books: list[Book], plan: dict):
+        self.books = books
+        self.plan = plan
+
+    def explain(self) -> str:
+        """
+        Возвращает план выполнения в виде текста.
+        """
+        plan = self.plan
+        lines = [
+            f"Query:    {plan['filter']}",
+            f"Access:   {plan['access']} (estimated rows: {plan['estimated_rows']})",
+            f"Examined: {plan['rows_examined']} rows, matched {plan['rows_matched']}"
+            + (" (stopped early)" if plan["stopped_early"] else ""),
+            f"Sort:     {plan['sort']}",
+            f"Returned: {plan['rows_returned']} (offset {plan['offset']}, limit {plan['limit']})",
+        ]
+        return "\n".join(lines)
+
+
+def parse_sort(sort: Optional[str]) -> tuple[str, bool]:
+    """
+    Разбирает порядок сортировки: имя поля, "-" перед именем - по убыванию.
+
+    Возвращает:
+        tuple[str, bool]: Поле и признак сортировки по убыванию.
+
+    Исключения:
+        ValidationError: Если sort - не строка или поле сортировки неизвестно.
+    """
+    if sort is None:
+        return "id", False
+    if not isinstance(sort, str):
+        raise ValidationError(f"invalid sort: {sort!r}")
+    if not sort:
+        return "id", False
+    descending = sort.startswith("-")
+    field = sort.lstrip("-")
+    if field not in SORT_FIELDS:
+        raise ValidationError(f"unknown sort field: {field!r}")
+    return field, descending
+
+
+def run_query(books, predicate: Predicate, sort: Optional[str] = None, limit: Optional[int] = None,
+              offset: Optional[int] = 0, columns: Optional[Callable] = None) -> QueryResult:
+    """
+    Выполняет запрос: получает кандидатов выбранным путем доступа, проверяет на них
+    все условия, сортирует и применяет offset и limit. Если результат упорядочен
+    по ID (по умолчанию) и задан limit, просмотр останавливается, как только
+    найдено offset + limit книг.
+
+    Аргументы:
+        books: Каталог (BookCatalog или SqliteCatalog).
+        predicate (Predicate): Условие (см. parse_query).
+        sort (Optional[str]): Поле сортировки ("year", "-year" - по убыванию); по умолчанию ID.
+        limit (Optional[int]): Наибольшее количество книг в результате.
+        offset (Optional[int]): Сколько найденных книг пропустить (None - 0).
+        columns (Optional[Callable]): Возвращает ColumnarView каталога (см. plan_access).
+
+    Возвращает:
+        QueryResult: Книги и план выполнения.
+
+    Исключения:
+        ValidationError: Если параметры сортировки или страницы некорректны.
+    """
+    sort_field, descending = parse_sort(sort)
+    if offset is None:
+        offset = 0
+    for name, value in (("limit", limit), ("offset", offset)):
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            raise ValidationError(f"invalid {name}: {value!r}")
+
+    path = plan_access(books, predicate, columns)
+    stop_after = offset + limit if limit is not None and sort_field == "id" and not descending else None
+    matched = []
+    examined = 0
+    stopped_early = False
+    for book in path.fetch():
+        examined += 1
+        if predicate.matches(book):
+            matched.append(book)
+            if stop_after is not None and len(matched) >= stop_after:
+                stopped_early = True
+                break
+    if sort_field != "id" or descending:
+        matched.sort(key=_SORT_KEYS[sort_field], reverse=descending)
+    page = matched[offset:] if limit is None else matched[offset:offset + limit]
+    plan = {
+        "filter": str(predicate),
+        "access": path.description,
+        "estimated_rows": path.estimate,
+        "rows_examined": examined,
+        "rows_matched": len(matched),
+        "stopped_early": stopped_early,
+        "sort": f"{sort_field} {'desc' if descending else 'asc'}",
+        "offset": offset,
+        "limit": limit,
+        "rows_returned": len(page),
+    }
+    return QueryResult(page, plan)
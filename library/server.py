@@ -0,0 +1,427 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+from library.batch import execute_command
+from library.exceptions import BookNotFoundError, DuplicateBookError, LibraryError, ValidationError
+from library.sqlite_storage import SqliteCatalog
+
+# Максимальный размер тела запроса в байтах
+MAX_BODY_SIZE = 1024 * 1024
+
+# Максимальное количество изменений, сохраняемых одной записью в хранилище
+DEFAULT_MAX_BATCH = 256
+
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+_ERROR_STATUSES = (
+    (BookNotFoundError, 404),
+    (DuplicateBookError, 409),
+    (ValidationError, 400),
+)
+
+
+class HttpError(Exception):
+    """
+    Ошибка разбора HTTP-запроса, на которую сервер отвечает указанным кодом.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def error_status(error: LibraryError) -> int:
+    """
+    Возвращает HTTP-код ответа для ошибки библиотеки.
+    """
+    for error_type, status in _ERROR_STATUSES:
+        if isinstance(error, error_type):
+            return status
+    return 400
+
+
+def route(method: str, target: str, body: bytes) -> tuple[dict, bool]:
+    """
+    Преобразует HTTP-запрос в команду пакетного режима (см. library.batch).
+
+    Маршруты:
+        GET    /books/{id}                      - книга по ID
+        GET    /books?type=title&query=...      - поиск (type: title, author или year)
+        GET    /books?where=...&sort=&limit=&offset= - составной запрос (см. Library.find)
+        POST   /books         {"title", "author", "year", "status"} - добавление
+        DELETE /books/{id}                      - удаление
+        PUT    /books/{id}/status {"status"}    - изменение статуса
+        GET    /stats                           - статистика библиотеки
+
+    Аргументы:
+        method (str): HTTP-метод.
+        target (str): Путь запроса со строкой параметров.
+        body (bytes): Тело запроса.
+
+    Возвращает:
+        tuple[dict, bool]: Команда и признак того, что она изменяет каталог.
+
+    Исключения:
+        HttpError: Если маршрут не найден или метод не поддерживается.
+        ValidationError: Если ID или тело запроса некорректны.
+    """
+    url = urlsplit(target)
+    parts = [part for part in url.path.split("/") if part]
+    if parts == ["stats"]:
+        if method != "GET":
+            raise HttpError(405, f"method {method} not allowed for {url.path}")
+        return {"op": "stats"}, False
+    if not parts or parts[0] != "books" or len(parts) > 3:
+        raise HttpError(404, f"no route for {url.path}")
+
+    if len(parts) == 1:
+        if method == "GET":
+            params = dict(parse_qsl(url.query))
+            if "where" in params:
+                command = {"op": "find", "where": params["where"], "sort": params.get("sort")}
+                for name in ("limit", "offset"):
+                    if name in params:
+                        try:
+                            command[name] = int(params[name])
+                        except ValueError:
+                            raise ValidationError(f"invalid {name}: {params[name]!r}") from None
+                return command, False
+            return {"op": "search", "type": params.get("type"), "query": params.get("query")}, False
+        if method == "POST":
+            return dict(_json_body(body), op="add"), True
+        raise HttpError(405, f"method {method} not allowed for {url.path}")
+
+    try:
+        book_id = int(parts[1])
+    except ValueError:
+        raise ValidationError(f"invalid id: {parts[1]!r}") from None
+
+    if len(parts) == 3:
+        if parts[2] != "status":
+            raise HttpError(404, f"no route for {url.path}")
+        if method not in ("PUT", "POST"):
+            raise HttpError(405, f"method {method} not allowed for {url.path}")
+        return {"op": "status", "id": book_id, "status": _json_body(body).get("status")}, True
+    if method == "GET":
+        return {"op": "get", "id": book_id}, False
+    if method == "DELETE":
+        return {"op": "delete", "id": book_id}, True
+    raise HttpError(405, f"method {method} not allowed for {url.path}")
+
+
+def _json_body(body: bytes) -> dict:
+    """
+    Разбирает тело запроса как JSON-объект.
+
+    Исключения:
+        ValidationError: Если тело не является JSON-объектом.
+    """
+    try:
+        data = json.loads(body or b"{}")
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValidationError(f"invalid JSON body: {e}") from None
+    if not isinstance(data, dict):
+        raise ValidationError("request body must be a JSON object")
+    return data
+
+
+class LibraryServer:
+    """
+    HTTP/JSON-сервер библиотеки на asyncio (только стандартная библиотека).
+
+    Чтения (поиск и получение по ID) выполняются в пуле потоков под блокировкой
+    чтения библиотеки, поэтому медленный запрос одного клиента не задерживает
+    других клиентов. Изменения ставятся в очередь и выполняются единственной
+    задачей-писателем: она забирает из очереди все накопившиеся изменения,
+    применяет их в одном group_commit (тоже в пуле потоков, под блокировкой записи)
+    и сохраняет хранилище один раз на пакет. Пул потоков используется, если
+    библиотека создана с thread_safe=True и каталог не SQLite (соединение SQLite
+    нельзя использовать из другого потока); иначе команды выполняются в цикле событий. Клиент получает ответ на изменение
+    только после сохранения пакета; если сохранить пакет не удалось, на все его
+    изменения отвечают кодом 500.
+    """
+
+    def __init__(self, library, host: str = "127.0.0.1", port: int = 8080,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        Инициализирует сервер.
+
+        Аргументы:
+            library (Library): Библиотека.
+            host (str): Адрес для прослушивания.
+            port (int): Порт; 0 - выбрать свободный порт.
+            max_batch (int): Максимальный размер пакета изменений.
+        """
+        self.library = library
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Запускает прием соединений и задачу-писателя. После запуска в self.port
+        находится фактический порт сервера.
+        """
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info("Library server listening on %s:%s", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        """
+        Запускает сервер и обслуживает запросы до отмены.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """
+        Останавливает прием соединений и дожидается сохранения поставленных в очередь изменений.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._writer_task is not None:
+            await self._queue.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+
+    async def __aenter__(self) -> "LibraryServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    # --- Выполнение команд ---
+    async def execute(self, command: dict, write: bool):
+        """
+        Выполняет команду: чтение - в пуле потоков, изменение - через очередь писателя.
+
+        Возвращает:
+            Результат команды.
+
+        Исключения:
+            LibraryError: Если операция не удалась.
+        """
+        if not write:
+            if self._threaded():
+                return await asyncio.get_running_loop().run_in_executor(None, execute_command, self.library, command)
+            return execute_command(self.library, command)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((command, future))
+        return await future
+
+    def _threaded(self) -> bool:
+        """
+        Проверяет, можно ли выполнять команды библиотеки в пуле потоков.
+        """
+        return self.library.thread_safe and not isinstance(self.library.books, SqliteCatalog)
+
+    def _apply(self, batch: list) -> list[tuple[bool, object]]:
+        """
+        Применяет пакет изменений без сохранения и возвращает (успех, результат или ошибка) для каждого.
+        """
+        results = []
+        with self.library.group_commit(flush=False):
+            for command, _ in batch:
+                try:
+                    results.append((True, execute_command(self.library, command)))
+                except LibraryError as e:
+                    results.append((False, e))
+                except Exception as e:
+                    # Непредвиденная ошибка одной команды не должна останавливать
+                    # писателя: клиент получит ответ 500, остальные команды выполняются
+                    logging.error("Unexpected error while applying %s: %s", command, e)
+                    results.append((False, e))
+        return results
+
+    async def _writer(self) -> None:
+        """
+        Задача-писатель: применяет изменения по одному и сохраняет их пакетами.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            if self._threaded():
+                results = await loop.run_in_executor(None, self._apply, batch)
+            else:
+                results = self._apply(batch)
+
+            try:
+                if isinstance(self.library.books, SqliteCatalog):
+                    # Соединение SQLite нельзя использовать из другого потока
+                    self.library.flush()
+                else:
+                    # Сохранение в отдельном потоке не блокирует чтения; каталог
+                    # не меняется, пока писатель ждет окончания сохранения
+                    await loop.run_in_executor(None, self.library.flush)
+                if self.library.dirty:
+                    # Хранилище сообщает об ошибке сохранения, не возбуждая исключение;
+                    # изменения остаются отложенными и будут сохранены следующим пакетом
+                    raise IOError("changes could not be saved to storage")
+            except Exception as e:
+                logging.error("Unable to persist a batch of %s changes: %s", len(batch), e)
+                results = [(False, e)] * len(batch)
+
+            for (_, future), (ok, value) in zip(batch, results):
+                if not future.done():
+                    if ok:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+                self._queue.task_done()
+            logging.debug("Persisted a batch of %s changes", len(batch))
+
+    # --- HTTP ---
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Обслуживает одно соединение (HTTP/1.1 с keep-alive).
+        """
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    self._write_response(writer, e.status, {"ok": False, "error": "HttpError", "message": str(e)},
+                                         keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                status, payload = await self._respond(method, target, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[tuple]:
+        """
+        Читает один HTTP-запрос.
+
+        Возвращает:
+            Optional[tuple]: Метод, путь, заголовки, тело и признак keep-alive,
+            или None, если клиент закрыл соединение.
+
+        Исключения:
+            HttpError: Если запрос некорректен или тело слишком велико.
+        """
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "malformed request line") from None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HttpError(400, "invalid Content-Length") from None
+        if length > MAX_BODY_SIZE:
+            raise HttpError(413, f"request body exceeds {MAX_BODY_SIZE} bytes")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, headers, body, keep_alive
+
+    async def _respond(self, method: str, target: str, body: bytes) -> tuple[int, dict]:
+        """
+        Выполняет запрос и формирует код ответа и тело в формате пакетного режима.
+        """
+        try:
+            command, write = route(method, target, body)
+            result = await self.execute(command, write)
+        except HttpError as e:
+            return e.status, {"ok": False, "error": "HttpError", "message": str(e)}
+        except LibraryError as e:
+            return error_status(e), {"ok": False, "error": type(e).__name__, "message": str(e)}
+        except Exception as e:
+            logging.error("Unexpected error while serving %s %s: %s", method, target, e)
+            return 500, {"ok": False, "error": type(e).__name__, "message": str(e)}
+        return (201 if method == "POST" and command["op"] == "add" else 200), {"ok": True, "result": result}
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Точка входа командной строки:
+
+        python -m library.server --books-file books.json --port 8080
+    """
+    from library.library_management import Library
+
+    parser = argparse.ArgumentParser(prog="python -m library.server", description="HTTP/JSON-сервер библиотеки.")
+    parser.add_argument("--books-file", default="books.json", help="Файл данных библиотеки")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес для прослушивания")
+    parser.add_argument("--port", type=int, default=8080, help="Порт")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Максимальное количество изменений в одном сохранении")
+    parser.add_argument("--metrics", action="store_true", help="Собирать замеры длительности операций (GET /stats)")
+    args = parser.parse_args(argv)
+
+    library = Library(books_file=args.books_file, metrics=args.metrics, thread_safe=True)
+    server = LibraryServer(library, host=args.host, port=args.port, max_batch=args.max_batch)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nСервер остановлен.")
+    finally:
+        library.storage.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
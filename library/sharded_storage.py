@@ -0,0 +1,389 @@
+import argparse
+import json
+import logging
+import os
+import sys
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Optional
+from library.models import Book
+from library.catalog import BookCatalog
+from library.indexes import BookIndex
+from library.json_stream import iter_json_array, write_json_array
+from library.storage import SHARDED_EXTENSION, StorageBackend, open_storage
+
+# Имя файла манифеста внутри каталога с шардами
+MANIFEST_FILE = "manifest.json"
+
+# Количество ID в одном шарде: шард k содержит книги с ID от k * shard_size + 1 до (k + 1) * shard_size
+DEFAULT_SHARD_SIZE = 100_000
+
+# Наибольшее количество потоков для чтения и записи шардов
+MAX_IO_THREADS = 8
+
+_book_id = attrgetter("id")
+
+
+class _DirtyShards(BookIndex):
+    """
+    Собирает номера шардов, в которых книги добавлены, удалены или изменили статус
+    после последнего сохранения. Перестройка каталога (clear) делает устаревшими все
+    шарды.
+    """
+
+    def __init__(self, shard_of):
+        self.shard_of = shard_of
+        self.shards: set[int] = set()
+        self.rebuilt = False
+
+    def add(self, book: Book) -> None:
+        self.shards.add(self.shard_of(book.id))
+
+    def remove(self, book: Book) -> None:
+        self.shards.add(self.shard_of(book.id))
+
+    def update_status(self, book: Book) -> None:
+        self.shards.add(self.shard_of(book.id))
+
+    def clear(self) -> None:
+        self.rebuilt = True
+
+    def reset(self) -> None:
+        self.shards = set()
+        self.rebuilt = False
+
+
+class ShardedStorage(StorageBackend):
+    """
+    Хранилище в каталоге с шардами: книги разбиты по диапазонам ID на JSON-файлы
+    (shard-00000.json, ...), а манифест (manifest.json) хранит размер шарда,
+    счетчик ID и список шардов.
+
+    Шарды читаются параллельно пулом потоков. При сохранении записываются только
+    шарды, которые изменились с момента загрузки или последнего сохранения: к
+    загруженному (или целиком сохраненному) каталогу подключается индекс
+    _DirtyShards, который запоминает шарды добавленных, удаленных и измененных книг,
+    поэтому save() и commit() не просматривают неизмененные шарды. Каталог, который
+    хранилище не отслеживает или который был перестроен, сохраняется целиком.
+    Каждый файл записывается атомарно (временный файл и os.replace), манифест -
+    последним.
+    """
+
+    def __init__(self, directory: str, shard_size: int = DEFAULT_SHARD_SIZE, compact: bool = False,
+                 io_threads: int = MAX_IO_THREADS):
+        """
+        Инициализирует хранилище.
+
+        Аргументы:
+            directory (str): Каталог с шардами (создается при первом сохранении).
+            shard_size (int): Количество ID в шарде для нового хранилища; у существующего
+                хранилища используется размер из манифеста.
+            compact (bool): Сохранять шарды в компактном формате (одна книга на строку).
+            io_threads (int): Наибольшее количество потоков для чтения и записи шардов.
+
+        Исключения:
+            ValueError: Если shard_size меньше 1.
+        """
+        if shard_size < 1:
+            raise ValueError("shard_size must be >= 1")
+        self.directory = directory
+        self.shard_size = shard_size
+        self.compact = compact
+        self.io_threads = io_threads
+        self.manifest_file = os.path.join(directory, MANIFEST_FILE)
+        # Номера шардов, записанных на диск
+        self._shards: set[int] = set()
+        # Отслеживаемый каталог и его измененные шарды
+        self._catalog: Optional[BookCatalog] = None
+        self._dirty = _DirtyShards(self.shard_of)
+        # Шарды, которые не удалось прочитать: их файлы не перезаписываются и не удаляются
+        self._unreadable: set[int] = set()
+
+    def shard_path(self, shard: int) -> str:
+        return os.path.join(self.directory, f"shard-{shard:05d}.json")
+
+    def shard_of(self, book_id: int) -> int:
+        """
+        Возвращает номер шарда, в котором хранится книга с указанным ID.
+        """
+        return (book_id - 1) // self.shard_size
+
+    def _map(self, function, items: list) -> list:
+        """
+        Применяет функцию к элементам в пуле потоков (для одного элемента - без пула).
+        """
+        if len(items) <= 1 or self.io_threads <= 1:
+            return [function(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.io_threads, len(items))) as executor:
+            return list(executor.map(function, items))
+
+    # --- Загрузка ---
+    def read_manifest(self) -> Optional[dict]:
+        """
+        Читает манифест.
+
+        Возвращает:
+            Optional[dict]: Манифест или None, если хранилище еще не создано.
+        """
+        if not os.path.exists(self.manifest_file):
+            return None
+        with open(self.manifest_file, "r") as file:
+            manifest = json.load(file)
+        self.bytes_read += os.path.getsize(self.manifest_file)
+        return manifest
+
+    def _read_shard(self, shard: int) -> Optional[list[Book]]:
+        """
+        Читает книги одного шарда. Ошибка чтения сообщается пользователю, и шард пропускается.
+        """
+        path = self.shard_path(shard)
+        try:
+            with open(path, "r") as file:
+                return [Book.from_dict(book) for book in iter_json_array(file)]
+        except Exception as e:
+            error_message = f"Error: shard {path} is unreadable ({e}). Its books are skipped."
+            print(error_message)
+            logging.error(error_message)
+            return None
+
+    def load(self) -> BookCatalog:
+        """
+        Загружает все шарды, перечисленные в манифесте (параллельно).
+
+        Возвращает:
+            BookCatalog: Каталог книг.
+        """
+        self._shards = set()
+        self._unreadable = set()
+        self._catalog = None
+        try:
+            manifest = self.read_manifest()
+        except (OSError, ValueError) as e:
+            error_message = f"Error: {self.manifest_file} is corrupted ({e}). Starting with an empty library."
+            print(error_message)
+            logging.error(error_message)
+            return BookCatalog()
+        if manifest is None:
+            warning_message = f"Warning: {self.manifest_file} not found. A new sharded library will be created."
+            print(warning_message)
+            logging.warning(warning_message)
+            return BookCatalog()
+
+        self.shard_size = manifest["shard_size"]
+        shards = manifest["shards"]
+        books = []
+        for shard, shard_books in zip(shards, self._map(self._read_shard, shards)):
+            if shard_books is None:
+                self._unreadable.add(shard)
+                continue
+            self._shards.add(shard)
+            self.bytes_read += os.path.getsize(self.shard_path(shard))
+            books.extend(shard_books)
+        catalog = BookCatalog(books)
+        catalog.next_id = manifest.get("next_id", 1)
+        self._track(catalog)
+        return catalog
+
+    def _track(self, catalog: BookCatalog) -> None:
+        """
+        Начинает отслеживать изменения каталога, содержимое которого совпадает с шардами на диске.
+        """
+        if catalog is not self._catalog:
+            self._dirty = _DirtyShards(self.shard_of)
+            catalog.add_index(self._dirty)
+            self._catalog = catalog
+        self._dirty.reset()
+
+    def version(self) -> Optional[tuple]:
+        """
+        Возвращает отметку версии манифеста: он перезаписывается при каждом сохранении.
+        """
+        try:
+            stat = os.stat(self.manifest_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    # --- Сохранение ---
+    def _shard_books(self, books, shard: int) -> list[Book]:
+        """
+        Возвращает книги каталога (упорядоченного по ID), попадающие в диапазон шарда.
+        """
+        start = bisect_left(books, shard * self.shard_size + 1, key=_book_id)
+        end = bisect_left(books, (shard + 1) * self.shard_size + 1, key=_book_id)
+        return books[start:end]
+
+    def _write_file(self, path: str, write) -> int:
+        """
+        Атомарно записывает файл и возвращает его размер.
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                write(file)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return os.path.getsize(path)
+
+    def _write_shard(self, item: tuple[int, list[Book]]) -> int:
+        shard, shard_books = item
+        return self._write_file(self.shard_path(shard),
+                                lambda file: write_json_array(file, (book.to_dict() for book in shard_books),
+                                                              compact=self.compact))
+
+    def _write_shards(self, books, shards: set[int]) -> None:
+        """
+        Записывает указанные шарды и затем манифест; записанные шарды отслеживаемого
+        каталога перестают считаться измененными. Шарды, которые не удалось прочитать,
+        не перезаписываются никогда: если в их диапазон ID попали новые книги,
+        остальные шарды сохраняются, а затем возбуждается IOError.
+
+        Исключения:
+            IOError: Если новые книги попали в нечитаемый шард и не были сохранены.
+        """
+        changed = []
+        blocked = []
+        for shard in sorted(shards):
+            shard_books = self._shard_books(books, shard)
+            if shard in self._unreadable:
+                # Файл шарда - единственная копия его прежних книг
+                if shard_books:
+                    blocked.append(shard)
+                continue
+            changed.append((shard, shard_books))
+        os.makedirs(self.directory, exist_ok=True)
+        self.bytes_written += sum(self._map(self._write_shard, [item for item in changed if item[1]]))
+        for shard, shard_books in changed:
+            if shard_books:
+                self._shards.add(shard)
+            else:
+                self._shards.discard(shard)
+        if books is self._catalog:
+            self._dirty.shards.difference_update(shard for shard, _ in changed)
+        manifest = {
+            "shard_size": self.shard_size,
+            "next_id": books.next_id,
+            "shards": sorted(self._shards | self._unreadable),
+        }
+        self.bytes_written += self._write_file(self.manifest_file, lambda file: json.dump(manifest, file))
+        # Файлы опустевших шардов удаляются после того, как манифест перестал на них ссылаться
+        for shard, shard_books in changed:
+            if not shard_books and os.path.exists(self.shard_path(shard)):
+                os.remove(self.shard_path(shard))
+        logging.debug("Sharded save: %d of %d shards written.", len(changed), len(manifest["shards"]))
+        if blocked:
+            paths = ", ".join(self.shard_path(shard) for shard in blocked)
+            raise IOError(f"unreadable shards {paths} were not overwritten; "
+                          f"books with IDs in their ranges are not saved")
+
+    def save(self, books: BookCatalog) -> bool:
+        """
+        Сохраняет каталог: перезаписываются только измененные шарды.
+
+        Возвращает:
+            bool: True, если все измененные шарды сохранены.
+
+        Исключения:
+            IOError: Если возникла проблема при записи в файл.
+            Exception: Любая другая неожиданная ошибка при сохранении.
+        """
+        if books is self._catalog and not self._dirty.rebuilt:
+            return self._save(books, set(self._dirty.shards))
+        shards = set(range(self.shard_of(books[0].id), self.shard_of(books[-1].id) + 1)) if len(books) else set()
+        if not self._save(books, shards | self._shards):
+            return False
+        if isinstance(books, BookCatalog):
+            self._track(books)
+        return True
+
+    def commit(self, books: BookCatalog, op: str, **record) -> None:
+        """
+        Фиксирует одно изменение: перезаписываются только измененные шарды (обычно
+        один - шард измененной книги) и манифест.
+        """
+        if books is self._catalog and not self._dirty.rebuilt:
+            self._save(books, set(self._dirty.shards))
+        else:
+            book_id = record["book"].id if op == "add" else record["id"]
+            self._save(books, {self.shard_of(book_id)})
+
+    def _save(self, books: BookCatalog, shards: set[int]) -> bool:
+        try:
+            self._write_shards(books, shards)
+        except IOError as e:
+            error_message = f"Error: Unable to save books to {self.directory}. {e}"
+            print(error_message)
+            logging.error(error_message)
+            return False
+        except Exception as e:
+            error_message = f"Unexpected error while saving books: {e}"
+            print(error_message)
+            logging.error(error_message)
+            return False
+        return True
+
+
+def migrate_to_shards(source: str, directory: str, shard_size: int = DEFAULT_SHARD_SIZE,
+                      compact: bool = False) -> int:
+    """
+    Переносит каталог из файла (books.json, .bookdb или SQLite) в каталог с шардами.
+    Исходный файл не изменяется.
+
+    Аргументы:
+        source (str): Исходный файл данных.
+        directory (str): Каталог с шардами.
+        shard_size (int): Количество ID в шарде.
+        compact (bool): Сохранять шарды в компактном формате.
+
+    Возвращает:
+        int: Количество перенесенных книг.
+
+    Исключения:
+        FileExistsError: Если в каталоге уже есть хранилище с шардами.
+    """
+    target = ShardedStorage(directory, shard_size=shard_size, compact=compact)
+    if os.path.exists(target.manifest_file):
+        raise FileExistsError(f"{target.manifest_file} already exists")
+    storage = open_storage(source)
+    try:
+        books = storage.load()
+        catalog = books if isinstance(books, BookCatalog) else BookCatalog(books)
+        catalog.next_id = books.next_id
+    finally:
+        storage.close()
+    target.save(catalog)
+    logging.info("Migrated %s books from %s to %s", len(catalog), source, directory)
+    return len(catalog)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Точка входа командной строки:
+
+        python -m library.sharded_storage books.json books.shards --shard-size 100000
+    """
+    parser = argparse.ArgumentParser(prog="python -m library.sharded_storage",
+                                     description="Разбиение файла данных библиотеки на шарды.")
+    parser.add_argument("source", help="Исходный файл данных (books.json, .bookdb или SQLite)")
+    parser.add_argument("directory", help=f"Каталог с шардами (например, books{SHARDED_EXTENSION})")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="Количество ID в шарде")
+    parser.add_argument("--compact", action="store_true", help="Компактный формат шардов")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        parser.error(f"{args.source} not found")
+    try:
+        count = migrate_to_shards(args.source, args.directory, shard_size=args.shard_size, compact=args.compact)
+    except FileExistsError as e:
+        print(f"Ошибка: {e}")
+        return 1
+    print(f"Перенесено книг: {count} -> {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
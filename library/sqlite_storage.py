@@ -0,0 +1,332 @@
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator, MutableSequence
+from typing import Optional
+from library.models import KEY_VERSION, Book
+from library.indexes import normalize_text, parse_year_query
+from library.storage import StorageBackend
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    author_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_key ON books (title_key, author_key, year);
+CREATE INDEX IF NOT EXISTS books_year ON books (year);
+CREATE INDEX IF NOT EXISTS books_status ON books (status);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = "id, title, author, year, status"
+
+# Количество строк, которое курсор забирает из базы за один раз при итерации
+_FETCH_SIZE = 1000
+
+
+def _row_to_book(row: tuple) -> Book:
+    return Book(book_id=row[0], title=row[1], author=row[2], year=row[3], status=row[4])
+
+
+class SqliteCatalog(MutableSequence):
+    """
+    Каталог книг, хранящийся в базе SQLite.
+
+    Предоставляет тот же интерфейс, что и BookCatalog, но не держит книги в памяти:
+    поиск по ID, проверка дубликатов и поиск по полям выполняются SQL-запросами
+    с использованием индексов. Изменения выполняются в текущей транзакции и
+    фиксируются хранилищем (SqliteStorage.commit).
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Инициализирует каталог поверх открытого соединения.
+
+        Аргументы:
+            connection (sqlite3.Connection): Соединение с базой.
+        """
+        self.connection = connection
+
+    # --- Индекс по ID ---
+    def get_by_id(self, book_id: int) -> Optional[Book]:
+        row = self.connection.execute(f"SELECT {_COLUMNS} FROM books WHERE id = ?", (book_id,)).fetchone()
+        return _row_to_book(row) if row else None
+
+    def has_id(self, book_id: int) -> bool:
+        return self.connection.execute("SELECT 1 FROM books WHERE id = ?", (book_id,)).fetchone() is not None
+
+    def remove_by_id(self, book_id: int) -> Book:
+        book = self.get_by_id(book_id)
+        if book is None:
+            raise KeyError(book_id)
+        self.connection.execute("DELETE FROM books WHERE id = ?", (book_id,))
+        return book
+
+    def update_status(self, book_id: int, status: str) -> Book:
+        """
+        Изменяет статус книги одной строкой UPDATE в текущей транзакции.
+
+        Аргументы:
+            book_id (int): ID книги.
+            status (str): Новый статус.
+
+        Возвращает:
+            Book: Измененная книга.
+
+        Исключения:
+            KeyError: Если книги с таким ID нет.
+        """
+        cursor = self.connection.execute("UPDATE books SET status = ? WHERE id = ?", (status, book_id))
+        if cursor.rowcount == 0:
+            raise KeyError(book_id)
+        return self.get_by_id(book_id)
+
+    def iter_by_id(self) -> Iterator[Book]:
+        cursor = self.connection.execute(f"SELECT {_COLUMNS} FROM books ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(_FETCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_book(row)
+
+    def max_id(self) -> int:
+        return self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM books").fetchone()[0]
+
+    # --- Выдача ID ---
+    @property
+    def next_id(self) -> int:
+        row = self.connection.execute("SELECT value FROM meta WHERE name = 'next_id'").fetchone()
+        return max(row[0] if row else 1, self.max_id() + 1)
+
+    @next_id.setter
+    def next_id(self, value: int) -> None:
+        value = max(self.next_id, value)
+        self.connection.execute(
+            "INSERT INTO meta (name, value) VALUES ('next_id', ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+            (value,),
+        )
+
+    def allocate_id(self) -> int:
+        book_id = self.next_id
+        self.next_id = book_id + 1
+        return book_id
+
+    # --- Поиск ---
+    def find_duplicate(self, title: str, author: str, year: int) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM books WHERE title_key = ? AND author_key = ? AND year = ? LIMIT 1",
+            (normalize_text(title), normalize_text(author), year),
+        ).fetchone()
+        return row is not None
+
+    def find_candidates(self, search_type: str, search_query: str) -> list[Book]:
+        """
+        Выполняет поиск на стороне базы: подстрока по нормализованному названию
+        или автору, точный год или диапазон лет по индексу books_year.
+        """
+        if search_type == "year":
+            year_range = parse_year_query(search_query)
+            return [] if year_range is None else self.find_by_year(*year_range)
+        if search_type not in ("title", "author"):
+            return list(self)
+        rows = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM books WHERE instr({search_type}_key, ?) > 0 ORDER BY id",
+            (normalize_text(search_query),),
+        ).fetchall()
+        return [_row_to_book(row) for row in rows]
+
+    def estimate(self, search_type: str, search_query: str) -> Optional[int]:
+        """
+        Оценивает количество кандидатов: для года - COUNT по индексу books_year,
+        для названия и автора индекса нет (None).
+        """
+        if search_type != "year":
+            return None
+        year_range = parse_year_query(search_query)
+        if year_range is None:
+            return 0
+        start, end = year_range
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM books WHERE year >= ? AND year <= ?",
+            (start if start is not None else -2 ** 63, end if end is not None else 2 ** 63 - 1),
+        ).fetchone()[0]
+
+    def find_by_year(self, start: Optional[int] = None, end: Optional[int] = None) -> list[Book]:
+        rows = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM books WHERE year >= ? AND year <= ? ORDER BY id",
+            (start if start is not None else -2 ** 63, end if end is not None else 2 ** 63 - 1),
+        ).fetchall()
+        return [_row_to_book(row) for row in rows]
+
+    # --- Интерфейс MutableSequence ---
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def __bool__(self) -> bool:
+        return self.connection.execute("SELECT 1 FROM books LIMIT 1").fetchone() is not None
+
+    def __iter__(self) -> Iterator[Book]:
+        return self.iter_by_id()
+
+    def __contains__(self, book) -> bool:
+        return isinstance(book, Book) and self.has_id(book.id)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        row = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM books ORDER BY id LIMIT 1 OFFSET ?", (index,)
+        ).fetchone() if index >= 0 else None
+        if row is None:
+            raise IndexError("catalog index out of range")
+        return _row_to_book(row)
+
+    def __setitem__(self, index, value) -> None:
+        raise TypeError("SqliteCatalog does not support item assignment")
+
+    def __delitem__(self, index) -> None:
+        books = self[index] if isinstance(index, slice) else [self[index]]
+        for book in books:
+            self.remove_by_id(book.id)
+
+    def insert(self, index: int, book: Book) -> None:
+        """
+        Добавляет книгу. Позиция определяется ID книги.
+
+        Исключения:
+            ValueError: Если книга с таким ID уже есть в каталоге.
+        """
+        self.extend([book])
+
+    def extend(self, books: Iterable[Book]) -> None:
+        rows = [
+            (book.id, book.title, book.author, book.year, book.status, book.title_key, book.author_key)
+            for book in books
+        ]
+        try:
+            self.connection.executemany(
+                "INSERT INTO books (id, title, author, year, status, title_key, author_key) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Duplicate book id: {e}") from e
+        if rows:
+            self.next_id = max(row[0] for row in rows) + 1
+
+    def remove(self, book: Book) -> None:
+        if book not in self:
+            raise ValueError("SqliteCatalog.remove(x): x not in catalog")
+        self.remove_by_id(book.id)
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM books")
+
+
+class SqliteStorage(StorageBackend):
+    """
+    Хранилище в базе SQLite (стандартный модуль sqlite3).
+
+    Книги не загружаются в память: Library работает с SqliteCatalog, который
+    выполняет запросы к базе. Каждое изменение фиксируется отдельной транзакцией.
+    """
+
+    def __init__(self, database: str):
+        """
+        Инициализирует хранилище.
+
+        Аргументы:
+            database (str): Путь к файлу базы данных.
+        """
+        self.database = database
+        self.connection: Optional[sqlite3.Connection] = None
+
+    def load(self) -> SqliteCatalog:
+        """
+        Открывает базу (создавая схему и индексы при необходимости).
+
+        Возвращает:
+            SqliteCatalog: Каталог поверх базы.
+        """
+        if self.connection is None:
+            # Library сериализует доступ к соединению своими блокировками
+            self.connection = sqlite3.connect(self.database, check_same_thread=False)
+            self.connection.executescript(_SCHEMA)
+            self._update_keys()
+        return SqliteCatalog(self.connection)
+
+    def _update_keys(self) -> None:
+        """
+        Пересчитывает нормализованные ключи (title_key, author_key), если они были
+        вычислены по другим правилам нормализации (KEY_VERSION).
+        """
+        row = self.connection.execute("SELECT value FROM meta WHERE name = 'key_version'").fetchone()
+        if row is not None and row[0] == KEY_VERSION:
+            return
+        self.connection.create_function("normalize_text", 1, normalize_text, deterministic=True)
+        cursor = self.connection.execute(
+            "UPDATE books SET title_key = normalize_text(title), author_key = normalize_text(author)"
+        )
+        if cursor.rowcount:
+            logging.info("Recomputed search keys of %s books in %s.", cursor.rowcount, self.database)
+        self.connection.execute(
+            "INSERT INTO meta (name, value) VALUES ('key_version', ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+            (KEY_VERSION,),
+        )
+        self.connection.commit()
+
+    def save(self, books) -> bool:
+        """
+        Фиксирует текущую транзакцию. Если передан каталог в памяти (BookCatalog),
+        содержимое таблицы заменяется его книгами.
+
+        Возвращает:
+            bool: True, если транзакция зафиксирована.
+        """
+        catalog = self.load()
+        try:
+            if not isinstance(books, SqliteCatalog):
+                catalog.clear()
+                catalog.extend(books)
+                catalog.next_id = books.next_id
+            self.connection.commit()
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            error_message = f"Error: Unable to save books to {self.database}. {e}"
+            print(error_message)
+            logging.error(error_message)
+            return False
+        return True
+
+    def commit(self, books, op: str, **record) -> None:
+        """
+        Фиксирует одно изменение. Само изменение уже выполнено каталогом
+        в текущей транзакции, поэтому остается только зафиксировать транзакцию.
+        """
+        if not isinstance(books, SqliteCatalog):
+            self.save(books)
+            return
+        try:
+            self.connection.commit()
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            error_message = f"Error: Unable to commit change to {self.database}. {e}"
+            print(error_message)
+            logging.error(error_message)
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
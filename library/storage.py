@@ -0,0 +1,351 @@
+import json
+import os
+import logging
+from abc import ABC, abstractmethod
+from library.models import Book
+from library.catalog import BookCatalog
+from library.journal import BookJournal
+from library.json_stream import iter_json_array, write_json_array
+from library.binary_snapshot import BINARY_EXTENSION, BinarySnapshot, write_snapshot
+
+# Размер журнала (в байтах), после которого он сворачивается в новый снимок
+DEFAULT_JOURNAL_THRESHOLD = 4 * 1024 * 1024
+
+# Суффикс файла метаданных со счетчиком ID рядом с books.json
+META_SUFFIX = ".meta"
+
+# Расширения файлов, для которых выбирается SQLite
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+
+# Расширение каталога, для которого выбирается хранилище с шардами
+SHARDED_EXTENSION = ".shards"
+
+
+class StorageBackend(ABC):
+    """
+    Интерфейс хранилища книг, с которым работает Library.
+
+    load() возвращает каталог (BookCatalog или совместимый объект), save() сохраняет
+    каталог целиком, а commit() фиксирует одно изменение (добавление, удаление или
+    изменение статуса), уже примененное к каталогу. Наследник обязан реализовать
+    load() и save(); для commit(), version() и close() есть реализации по умолчанию.
+
+    bytes_read и bytes_written - сколько байт хранилище прочитало и записало
+    с момента создания (для статистики).
+    """
+
+    bytes_read = 0
+    bytes_written = 0
+
+    @abstractmethod
+    def load(self):
+        """
+        Загружает каталог книг.
+
+        Возвращает:
+            BookCatalog: Каталог книг.
+        """
+
+    @abstractmethod
+    def save(self, books) -> bool:
+        """
+        Сохраняет каталог целиком. Ошибки записи сообщаются пользователю и в журнал.
+
+        Аргументы:
+            books (BookCatalog): Каталог книг.
+
+        Возвращает:
+            bool: True, если каталог сохранен; False, если сохранить не удалось.
+        """
+
+    def commit(self, books, op: str, **record) -> None:
+        """
+        Фиксирует одно изменение. По умолчанию сохраняет весь каталог.
+
+        Аргументы:
+            books (BookCatalog): Каталог книг (изменение уже применено).
+            op (str): Тип изменения ("add", "delete" или "status").
+            **record: Данные изменения (book, id, status).
+        """
+        self.save(books)
+
+    def version(self):
+        """
+        Возвращает отметку версии данных на диске, чтобы Library могла заметить
+        изменения, сделанные другим процессом. None означает, что каталог всегда
+        актуален (например, запросы выполняются прямо в базе).
+        """
+        return None
+
+    def close(self) -> None:
+        """
+        Освобождает ресурсы хранилища.
+        """
+
+
+class JsonStorage(StorageBackend):
+    """
+    Хранилище в JSON-файле (books.json) с необязательным журналом изменений.
+    """
+
+    def __init__(self, books_file: str, journal: bool = False,
+                 journal_threshold: int = DEFAULT_JOURNAL_THRESHOLD, compact: bool = False):
+        """
+        Инициализирует хранилище.
+
+        Аргументы:
+            books_file (str): Путь к файлу снимка.
+            journal (bool): Режим журнала: каждое изменение дописывается в
+                books_file + ".journal" вместо перезаписи всего файла. По умолчанию False.
+            journal_threshold (int): Размер журнала в байтах, после которого он
+                сворачивается в новый снимок.
+            compact (bool): Сохранять books.json в компактном формате (одна книга на строку,
+                без отступов). По умолчанию False.
+        """
+        self.books_file = books_file
+        self.compact = compact
+        self.journal = BookJournal(books_file) if journal else None
+        self.journal_threshold = journal_threshold
+        self.meta_file = books_file + META_SUFFIX
+
+    # --- Загрузка ---
+    def load(self) -> BookCatalog:
+        """
+        Загружает книги из снимка. В режиме журнала поверх снимка
+        применяются записи из журнала изменений.
+
+        Возвращает:
+            BookCatalog: Каталог книг.
+        """
+        books = self._load_snapshot()
+        if self.journal is not None:
+            self.bytes_read += self.journal.size()
+            books = self.journal.replay(books)
+        catalog = BookCatalog(books)
+        catalog.next_id = self._load_next_id()
+        if self.journal is not None:
+            catalog.next_id = self.journal.max_seen_id + 1
+        return catalog
+
+    def read_snapshot(self) -> list[Book]:
+        """
+        Читает книги из файла снимка.
+
+        JSON-файл разбирается потоково: записи по одной превращаются в Book, поэтому
+        в памяти не держатся одновременно весь текст файла и список словарей.
+
+        Возвращает:
+            list[Book]: Список объектов Book.
+
+        Исключения:
+            JSONDecodeError: Если JSON-файл поврежден.
+            IOError: Если произошла ошибка при чтении файла.
+        """
+        with open(self.books_file, "r") as file:
+            return [Book.from_dict(book) for book in iter_json_array(file)]
+
+    def _load_snapshot(self) -> list[Book]:
+        """
+        Загружает последний полный снимок книг, сообщая об ошибках пользователю.
+
+        Возвращает:
+            list[Book]: Список объектов Book.
+        """
+        if os.path.exists(self.books_file):
+            try:
+                books = self.read_snapshot()
+                self.bytes_read += os.path.getsize(self.books_file)
+                return books
+            except json.JSONDecodeError:
+                error_message = "Error: books.json is corrupted. Starting with an empty library."
+                print(error_message)
+                logging.error(error_message)
+                return []
+            except ValueError as e:
+                error_message = f"Error: {self.books_file} is corrupted ({e}). Starting with an empty library."
+                print(error_message)
+                logging.error(error_message)
+                return []
+            except Exception as e:
+                error_message = f"Unexpected error while loading books: {e}"
+                print(error_message)
+                logging.error(error_message)
+                return []
+        else:
+            if self.journal is not None and self.journal.size():
+                return []
+            warning_message = "Warning: books.json file not found. A new file will be created."
+            print(warning_message)
+            logging.warning(warning_message)
+            return []
+
+    def _load_next_id(self) -> int:
+        """
+        Загружает сохраненный счетчик ID, чтобы ID удаленных книг не выдавались повторно.
+
+        Возвращает:
+            int: Сохраненный следующий ID или 1, если метаданных нет.
+        """
+        if not os.path.exists(self.meta_file):
+            return 1
+        try:
+            with open(self.meta_file, "r") as file:
+                return int(json.load(file)["next_id"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning("Ignoring unreadable metadata file %s: %s", self.meta_file, e)
+            return 1
+
+    def version(self) -> tuple:
+        """
+        Возвращает отметку версии снимка, журнала и метаданных (inode, размер и время
+        изменения файлов). Снимок заменяется переименованием, поэтому его перезапись
+        другим процессом всегда меняет отметку.
+        """
+        paths = [self.books_file, self.meta_file]
+        if self.journal is not None:
+            paths.append(self.journal.path)
+        stamps = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(stamps)
+
+    # --- Сохранение ---
+    def write_snapshot(self, books: BookCatalog) -> None:
+        """
+        Записывает книги в файл снимка. Записи пишутся потоково, без построения
+        полного списка словарей в памяти.
+
+        Файл сначала записывается во временный файл рядом и затем атомарно заменяет
+        снимок (os.replace), поэтому читатели и сбой во время записи никогда не
+        видят наполовину записанный books.json.
+
+        Аргументы:
+            books (BookCatalog): Каталог книг.
+        """
+        temp_path = f"{self.books_file}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                write_json_array(file, (book.to_dict() for book in books), compact=self.compact)
+            os.replace(temp_path, self.books_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _save_next_id(self, books: BookCatalog) -> None:
+        """
+        Сохраняет счетчик ID. Файл метаданных нужен только тогда, когда счетчик
+        нельзя восстановить по наибольшему ID в снимке (после удаления последних книг).
+        """
+        if books.next_id > books.max_id() + 1:
+            temp_path = f"{self.meta_file}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as file:
+                json.dump({"next_id": books.next_id}, file)
+            os.replace(temp_path, self.meta_file)
+        elif os.path.exists(self.meta_file):
+            os.remove(self.meta_file)
+
+    def save(self, books: BookCatalog) -> bool:
+        """
+        Сохраняет снимок и счетчик ID; журнал после этого очищается.
+
+        Возвращает:
+            bool: True, если каталог сохранен.
+
+        Исключения:
+            IOError: Если возникла проблема при записи в файл.
+            Exception: Любая другая неожиданная ошибка при сохранении.
+        """
+        try:
+            self.write_snapshot(books)
+            self.bytes_written += os.path.getsize(self.books_file)
+            self._save_next_id(books)
+            # Снимок содержит все изменения, поэтому журнал больше не нужен
+            if self.journal is not None:
+                self.journal.truncate()
+        except IOError as e:
+            error_message = f"Error: Unable to save books to {self.books_file}. {e}"
+            print(error_message)
+            logging.error(error_message)
+            return False
+        except Exception as e:
+            error_message = f"Unexpected error while saving books: {e}"
+            print(error_message)
+            logging.error(error_message)
+            return False
+        return True
+
+    def commit(self, books: BookCatalog, op: str, **record) -> None:
+        """
+        Фиксирует одно изменение: в режиме журнала дописывает запись в журнал
+        (и сворачивает его в снимок при превышении порога), иначе сохраняет весь файл.
+        """
+        if self.journal is None:
+            self.save(books)
+            return
+
+        journal_size = self.journal.size()
+        try:
+            if op == "add":
+                self.journal.log_add(record["book"])
+            elif op == "delete":
+                self.journal.log_delete(record["id"])
+            elif op == "status":
+                self.journal.log_status(record["id"], record["status"])
+        except IOError as e:
+            error_message = f"Error: Unable to append to journal {self.journal.path}. {e}"
+            print(error_message)
+            logging.error(error_message)
+            return
+
+        new_size = self.journal.size()
+        self.bytes_written += new_size - journal_size
+        if new_size >= self.journal_threshold:
+            logging.info("Journal %s exceeded %s bytes, compacting.", self.journal.path, self.journal_threshold)
+            self.save(books)
+
+
+class BinaryStorage(JsonStorage):
+    """
+    Хранилище в двоичном снимке .bookdb (см. binary_snapshot) с необязательным журналом.
+
+    Загрузка не ленивая: все книги снимка декодируются в объекты Book, потому что
+    BookCatalog и его индексы строятся по всем книгам. Выигрыш по сравнению с
+    books.json - в скорости декодирования, а не в отложенном чтении.
+    """
+
+    def read_snapshot(self) -> list[Book]:
+        with BinarySnapshot(self.books_file) as snapshot:
+            return list(snapshot)
+
+    def write_snapshot(self, books: BookCatalog) -> None:
+        write_snapshot(self.books_file, books)
+
+
+def open_storage(books_file: str, **options) -> StorageBackend:
+    """
+    Выбирает хранилище по расширению файла: ".bookdb" - двоичный снимок,
+    ".sqlite"/".sqlite3"/".db" - SQLite, ".shards" или существующий каталог -
+    каталог с шардами, иначе - JSON.
+
+    Аргументы:
+        books_file (str): Путь к файлу данных.
+        **options: Параметры файлового хранилища (journal, journal_threshold, compact).
+
+    Возвращает:
+        StorageBackend: Хранилище.
+    """
+    if books_file.endswith(SHARDED_EXTENSION) or os.path.isdir(books_file):
+        from library.sharded_storage import ShardedStorage
+        return ShardedStorage(books_file, compact=options.get("compact", False))
+    if books_file.endswith(SQLITE_EXTENSIONS):
+        from library.sqlite_storage import SqliteStorage
+        return SqliteStorage(books_file)
+    if books_file.endswith(BINARY_EXTENSION):
+        return BinaryStorage(books_file, **options)
+    return JsonStorage(books_file, **options)
@@ -0,0 +1,240 @@
+import sys
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Optional, TextIO
+from library.models import Book
+
+# Ширина колонок таблицы книг
+ID_WIDTH, TITLE_WIDTH, AUTHOR_WIDTH, YEAR_WIDTH, STATUS_WIDTH = 5, 30, 20, 6, 10
+
+HEADER = (f"{'ID':<{ID_WIDTH}} {'Название':<{TITLE_WIDTH}} {'Автор':<{AUTHOR_WIDTH}} "
+          f"{'Год':<{YEAR_WIDTH}} {'Статус':<{STATUS_WIDTH}}")
+SEPARATOR = "-" * (ID_WIDTH + TITLE_WIDTH + AUTHOR_WIDTH + YEAR_WIDTH + STATUS_WIDTH + 4)
+
+# Шаблон строки книги: %-форматирование заметно быстрее f-строки на больших таблицах
+_ROW_FORMAT = f"%-{ID_WIDTH}d %-{TITLE_WIDTH}s %-{AUTHOR_WIDTH}s %-{YEAR_WIDTH}d %-{STATUS_WIDTH}s"
+
+# Количество книг на странице по умолчанию
+DEFAULT_PAGE_SIZE = 50
+
+# Признак обрезанного текста (один символ, чтобы не сбивать ширину колонки)
+ELLIPSIS = "…"
+
+_book_id = attrgetter("id")
+
+
+def truncate(text: str, width: int) -> str:
+    """
+    Обрезает строку до ширины колонки, заменяя последний символ на ELLIPSIS.
+
+    Аргументы:
+        text (str): Исходная строка.
+        width (int): Ширина колонки.
+
+    Возвращает:
+        str: Строка не длиннее width.
+    """
+    return text if len(text) <= width else text[:width - 1] + ELLIPSIS
+
+
+def format_row(book: Book) -> str:
+    """
+    Форматирует строку таблицы для книги; длинные название и автор обрезаются.
+    """
+    return _ROW_FORMAT % (book.id, truncate(book.title, TITLE_WIDTH), truncate(book.author, AUTHOR_WIDTH),
+                          book.year, book.status)
+
+
+def render_table(books: Iterable[Book], header: bool = True) -> str:
+    """
+    Собирает таблицу книг в одну строку (заголовок, разделитель и строки книг).
+
+    Аргументы:
+        books (Iterable[Book]): Книги.
+        header (bool): Добавить заголовок и разделитель.
+
+    Возвращает:
+        str: Текст таблицы, каждая строка которого заканчивается переводом строки.
+    """
+    lines = [HEADER, SEPARATOR] if header else []
+    lines.extend(map(format_row, books))
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class TablePager:
+    """
+    Постраничный вывод таблицы книг.
+
+    Страница собирается в одну строку и выводится одним вызовом write, а не
+    print для каждой книги. Источник может быть последовательностью (BookCatalog,
+    список результатов поиска) - тогда страница берется срезом без копирования
+    остальных книг - или итератором: тогда книги читаются по мере листания, и в
+    памяти остаются только уже показанные страницы.
+
+    В интерактивном режиме после каждой страницы можно перейти к следующей или
+    предыдущей странице или к странице с книгой по ID. В неинтерактивном режиме
+    (вывод в файл или канал) все книги выводятся подряд кусками по page_size строк.
+    """
+
+    def __init__(self, books: Iterable[Book], page_size: int = DEFAULT_PAGE_SIZE, ordered_by_id: bool = True,
+                 output: Optional[TextIO] = None):
+        """
+        Аргументы:
+            books (Iterable[Book]): Книги для вывода.
+            page_size (int): Количество книг на странице.
+            ordered_by_id (bool): Книги упорядочены по ID (переход к ID - двоичным поиском).
+            output (Optional[TextIO]): Поток вывода. По умолчанию - текущий sys.stdout.
+
+        Исключения:
+            ValueError: Если page_size меньше 1.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be >= 1")
+        self.page_size = page_size
+        self.ordered_by_id = ordered_by_id
+        self.output = output
+        if isinstance(books, Sequence):
+            self._books = books
+            self._stream: Optional[Iterator[Book]] = None
+        else:
+            # Уже прочитанные из итератора книги
+            self._books = []
+            self._stream = iter(books)
+        self.page = 0
+
+    def _write(self, text: str) -> None:
+        (self.output or sys.stdout).write(text)
+
+    def _fill(self, count: int) -> None:
+        """
+        Дочитывает книги из итератора, пока их не станет count или итератор не закончится.
+        """
+        if self._stream is None or len(self._books) >= count:
+            return
+        self._books.extend(islice(self._stream, count - len(self._books)))
+        if len(self._books) < count:
+            self._stream = None
+
+    def total(self) -> Optional[int]:
+        """
+        Возвращает количество книг или None, если итератор еще не дочитан.
+        """
+        return len(self._books) if self._stream is None else None
+
+    def has_next(self) -> bool:
+        """
+        Проверяет, есть ли страница после текущей.
+        """
+        end = (self.page + 1) * self.page_size
+        self._fill(end + 1)
+        return len(self._books) > end
+
+    def page_books(self) -> list[Book]:
+        """
+        Возвращает книги текущей страницы.
+        """
+        start = self.page * self.page_size
+        self._fill(start + self.page_size)
+        return list(self._books[start:start + self.page_size])
+
+    def find_page(self, book_id: int) -> Optional[int]:
+        """
+        Находит страницу с книгой по ID.
+
+        Аргументы:
+            book_id (int): ID книги.
+
+        Возвращает:
+            Optional[int]: Номер страницы (с нуля) или None, если книги нет.
+        """
+        if self.ordered_by_id:
+            # Итератор дочитывается только до первой книги с ID не меньше искомого
+            while self._stream is not None and (not self._books or self._books[-1].id < book_id):
+                self._fill(len(self._books) + self.page_size)
+            position = bisect_left(self._books, book_id, key=_book_id)
+            if position < len(self._books) and self._books[position].id == book_id:
+                return position // self.page_size
+            return None
+        self._fill(sys.maxsize)
+        for position, book in enumerate(self._books):
+            if book.id == book_id:
+                return position // self.page_size
+        return None
+
+    def render_page(self) -> str:
+        """
+        Собирает текущую страницу: таблицу и строку с номером страницы.
+        """
+        books = self.page_books()
+        start = self.page * self.page_size
+        has_next = self.has_next()
+        total = self.total()
+        if total is not None:
+            pages = max(1, -(-total // self.page_size))
+            footer = f"Страница {self.page + 1} из {pages} (книги {start + 1}-{start + len(books)} из {total})"
+        else:
+            more = ", есть еще" if has_next else ""
+            footer = f"Страница {self.page + 1} (книги {start + 1}-{start + len(books)}{more})"
+        return render_table(books) + footer + "\n"
+
+    def show(self, interactive: Optional[bool] = None) -> None:
+        """
+        Выводит таблицу.
+
+        Аргументы:
+            interactive (Optional[bool]): Листать страницы по командам пользователя.
+                По умолчанию - если ввод и вывод подключены к терминалу.
+        """
+        if interactive is None:
+            interactive = sys.stdin.isatty() and (self.output or sys.stdout).isatty()
+        if not interactive:
+            self._show_all()
+            return
+        self._write(self.render_page())
+        if self.page == 0 and not self.has_next():
+            return
+        while True:
+            command = input("[Enter] - следующая, p - предыдущая, ID - перейти к книге, q - выход: ").strip().lower()
+            page = self.page
+            if command == "q":
+                return
+            if command in ("", "n"):
+                if self.has_next():
+                    page += 1
+                else:
+                    print("Это последняя страница.")
+            elif command == "p":
+                if page > 0:
+                    page -= 1
+                else:
+                    print("Это первая страница.")
+            elif command.isdigit():
+                page = self.find_page(int(command))
+                if page is None:
+                    print(f"Книга с ID {command} не найдена.")
+                    continue
+            else:
+                print("Неизвестная команда.")
+            if page != self.page or command.isdigit():
+                self.page = page
+                self._write(self.render_page())
+
+    def _show_all(self) -> None:
+        """
+        Выводит все книги с текущей страницы подряд, по одному вызову write на page_size строк.
+        """
+        start = self.page * self.page_size
+        if self._stream is None:
+            chunks = (self._books[offset:offset + self.page_size]
+                      for offset in range(start, len(self._books), self.page_size))
+        else:
+            # Непрочитанная часть итератора выводится без сохранения в памяти
+            remaining = chain(self._books[start:], self._stream)
+            self._stream = None
+            chunks = iter(lambda: list(islice(remaining, self.page_size)), [])
+        header = True
+        for chunk in chunks:
+            self._write(render_table(chunk, header=header))
+            header = False
@@ -1,49 +1,169 @@
+import argparse
+import contextlib
 import logging
+import sys
 from library.library_management import Library
+from library.batch import run_batch
+from library.logging_setup import setup_logging
+from library.table_view import DEFAULT_PAGE_SIZE
 
 # --- Основная точка входа программы ---
 
+def non_negative_int(value: str) -> int:
+    """
+    Тип аргумента командной строки: целое число не меньше 0.
+
+    Исключения:
+        argparse.ArgumentTypeError: Если значение не является целым числом >= 0.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}") from None
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0: {number}")
+    return number
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Разбирает аргументы командной строки.
+
+    Аргументы:
+        argv: Список аргументов. По умолчанию sys.argv[1:].
+
+    Возвращает:
+        argparse.Namespace: Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(description="Система управления библиотекой")
+    parser.add_argument("--books-file", default="books.json", help="Файл данных библиотеки")
+    parser.add_argument("--batch", metavar="COMMANDS",
+                        help="Выполнить команды из файла JSON Lines ('-' - из stdin) без интерактивного меню")
+    parser.add_argument("--commit-every", type=non_negative_int, default=0, metavar="N",
+                        help="Сохранять изменения каждые N изменений (в пакетном режиме по умолчанию - "
+                             "один раз в конце, в меню - сразу)")
+    parser.add_argument("--commit-interval-ms", type=int, default=0, metavar="T",
+                        help="Сохранять накопленные изменения в фоне каждые T миллисекунд")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Собирать замеры длительности операций (пункт меню 7, команда stats)")
+    parser.add_argument("--search-workers", type=int, default=0, metavar="N",
+                        help="Искать в больших каталогах параллельно в N процессах (0 - без параллельного поиска)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, metavar="N",
+                        help="Количество книг на странице таблицы")
+    parser.add_argument("--log-format", choices=("text", "json"), default="text",
+                        help="Формат app.log: текст или JSON Lines")
+    parser.add_argument("--profile", metavar="OPERATION=FILE",
+                        help="Профилировать первый вызов операции (например, query=query.prof) через cProfile")
+    args = parser.parse_args(argv)
+    if args.profile and "=" not in args.profile:
+        parser.error("--profile expects OPERATION=FILE")
+    if args.page_size < 1:
+        parser.error("--page-size must be >= 1")
+    return args
+
+
+def create_library(args: argparse.Namespace, **options) -> Library:
+    """
+    Создает библиотеку с параметрами командной строки и включает запрошенное профилирование.
+    """
+    library = Library(books_file=args.books_file, commit_interval_ms=args.commit_interval_ms,
+                      metrics=args.metrics, search_workers=args.search_workers,
+                      page_size=args.page_size, **options)
+    if args.profile:
+        operation, _, path = args.profile.partition("=")
+        library.metrics.profile_next(operation, path)
+    return library
+
+
+def run_batch_mode(library: Library, commands: str, commit_every: int) -> int:
+    """
+    Выполняет пакетный режим: команды читаются из файла или stdin, результаты
+    пишутся в stdout по одной JSON-строке на команду. Сообщения для пользователя
+    (например, ошибки сохранения) перенаправляются в stderr, чтобы не смешиваться с результатами.
+
+    Возвращает:
+        int: Код завершения (0 - все команды успешны, 1 - были ошибки).
+        Сохранение изменений проверяет вызывающий код после library.close().
+    """
+    output = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        if commands == "-":
+            summary = run_batch(library, sys.stdin, output, commit_every=commit_every)
+        else:
+            with open(commands, "r", encoding="utf-8") as file:
+                summary = run_batch(library, file, output, commit_every=commit_every)
+    return 0 if summary["failed"] == 0 else 1
+
+
 if __name__ == "__main__":
-    # Очистка существующих обработчиков логов
-    for handler in logging.root.handlers[:]:
-        logging.root.removeHandler(handler)
+    args = parse_args()
 
-    # Настройка конфигурации логирования
-    logging.basicConfig(
+    # Асинхронное логирование: запись в app.log выполняет отдельный поток
+    log_setup = setup_logging(
         filename='app.log',
         level=logging.INFO,  # Логирование для уровней INFO и выше (WARNING, ERROR и т.д.)
-        format='%(asctime)s - %(levelname)s - %(message)s'
+        json_format=args.log_format == "json",
     )
 
+    if args.batch:
+        try:
+            # В пакетном режиме stdout зарезервирован для результатов команд
+            with contextlib.redirect_stdout(sys.stderr):
+                library = create_library(args)
+            try:
+                exit_code = run_batch_mode(library, args.batch, args.commit_every)
+            finally:
+                with contextlib.redirect_stdout(sys.stderr):
+                    library.close()
+            if library.dirty:
+                # Последнее сохранение не удалось: результаты команд не записаны в хранилище
+                print(f"Ошибка: изменения пакета не сохранены в {args.books_file}.", file=sys.stderr)
+                logging.error("Batch changes were not saved to %s", args.books_file)
+                exit_code = 1
+        finally:
+            log_setup.shutdown()
+        sys.exit(exit_code)
+
     # Создание экземпляра класса Library для управления операциями библиотеки
-    library = Library()
-
-    # Основной цикл программы для взаимодействия с пользователем
-    while True:
-        print("\nСистема управления библиотекой")
-        print("1. Добавить книгу")
-        print("2. Удалить книгу")
-        print("3. Поиск книг")
-        print("4. Отобразить все книги")
-        print("5. Изменить статус книги")
-        print("6. Выйти")
-
-        choice = input("Введите ваш выбор (1-6): ").strip()
-
-        if choice == "1":
-            library.add_book()
-        elif choice == "2":
-            library.delete_book()
-        elif choice == "3":
-            library.search_books()
-        elif choice == "4":
-            library.display_books()
-        elif choice == "5":
-            library.change_status()
-        elif choice == "6":
-            print("Выход из системы управления библиотекой. До свидания!")
-            logging.shutdown()
-            break
-        else:
-            print("Неверный выбор. Пожалуйста, введите число от 1 до 6.")
-            logging.warning(f"Invalid menu selection: '{choice}'")
\ No newline at end of file
+    library = create_library(args, commit_every=max(1, args.commit_every))
+
+    try:
+        # Основной цикл программы для взаимодействия с пользователем
+        while True:
+            print("\nСистема управления библиотекой")
+            print("1. Добавить книгу")
+            print("2. Удалить книгу")
+            print("3. Поиск книг")
+            print("4. Отобразить все книги")
+            print("5. Изменить статус книги")
+            print("6. Выйти")
+            print("7. Статистика")
+            print("8. Расширенный поиск")
+
+            choice = input("Введите ваш выбор (1-8): ").strip()
+
+            if choice == "1":
+                library.add_book()
+            elif choice == "2":
+                library.delete_book()
+            elif choice == "3":
+                library.search_books()
+            elif choice == "4":
+                library.display_books()
+            elif choice == "5":
+                library.change_status()
+            elif choice == "7":
+                library.show_stats()
+            elif choice == "8":
+                library.advanced_search()
+            elif choice == "6":
+                break
+            else:
+                print("Неверный выбор. Пожалуйста, введите число от 1 до 8.")
+                logging.warning("Invalid menu selection: '%s'", choice)
+    finally:
+        # Сохранение изменений, отложенных политикой сохранения, в том числе при
+        # завершении из-за исключения или Ctrl+C
+        library.close()
+        log_setup.shutdown()
+    print("Выход из системы управления библиотекой. До свидания!")
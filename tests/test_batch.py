@@ -0,0 +1,112 @@
+import io
+import json
+import os
+import unittest
+from unittest.mock import patch
+from library.batch import run_batch
+from library.library_management import Library
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up an empty library backed by a temporary file.
+        """
+        self.temp_books_file = "test_batch_books.json"
+        self.library = Library(books_file=self.temp_books_file)
+
+    def tearDown(self):
+        """
+        Clean up the temporary books file.
+        """
+        for path in (self.temp_books_file, self.temp_books_file + ".meta"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def run_commands(self, commands, **kwargs):
+        lines = [json.dumps(command) if isinstance(command, dict) else command for command in commands]
+        output = io.StringIO()
+        summary = run_batch(self.library, lines, output, **kwargs)
+        return summary, [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_commands_and_results(self):
+        """
+        Test that each command produces one JSON result line.
+        """
+        summary, results = self.run_commands([
+            {"op": "add", "title": "Dune", "author": "Frank Herbert", "year": 1965},
+            {"op": "add", "title": "Dune", "author": "Frank Herbert", "year": 1965},
+            {"op": "status", "id": 1, "status": "borrowed"},
+            {"op": "search", "type": "author", "query": "herbert"},
+            {"op": "get", "id": 2},
+            {"op": "delete", "id": 1},
+            "not json",
+            {"op": "rename", "id": 1},
+            {"op": "status", "id": 2},
+        ])
+        self.assertEqual(summary, {"ok": 4, "failed": 5})
+        self.assertEqual(results[0]["result"]["id"], 1)
+        self.assertEqual(results[1]["error"], "DuplicateBookError")
+        self.assertEqual(results[2]["result"]["status"], "borrowed")
+        self.assertEqual([book["id"] for book in results[3]["result"]], [1])
+        self.assertEqual(results[4]["error"], "BookNotFoundError")
+        self.assertTrue(results[5]["ok"])
+        self.assertEqual(results[6]["error"], "JSONDecodeError")
+        self.assertEqual(results[7]["error"], "ValidationError")
+        self.assertEqual(results[8]["error"], "ValidationError")
+        self.assertEqual([result["line"] for result in results], list(range(1, 10)))
+
+    def test_group_commit(self):
+        """
+        Test that storage is written once per group instead of once per command.
+        """
+        commands = [{"op": "add", "title": f"Book {i}", "author": "Author", "year": 2000} for i in range(10)]
+        with patch.object(self.library.storage, "save", wraps=self.library.storage.save) as save:
+            self.run_commands(commands)
+            self.assertEqual(save.call_count, 1)
+        with patch.object(self.library.storage, "save", wraps=self.library.storage.save) as save:
+            self.run_commands([{"op": "status", "id": i, "status": "borrowed"} for i in range(1, 11)],
+                              commit_every=4)
+            self.assertEqual(save.call_count, 3)
+
+        reloaded = Library(books_file=self.temp_books_file)
+        self.assertEqual(len(reloaded.books), 10)
+        self.assertEqual([book.status for book in reloaded.books], ["borrowed"] * 10)
+
+    def test_find_command(self):
+        """
+        Test that the find command returns the page of books and the query plan.
+        """
+        _, results = self.run_commands([
+            {"op": "add", "title": "Dune", "author": "Frank Herbert", "year": 1965},
+            {"op": "add", "title": "Emma", "author": "Jane Austen", "year": 1815},
+            {"op": "add", "title": "Children of Dune", "author": "Frank Herbert", "year": 1976},
+            {"op": "find", "where": "author:herbert year:>=1970 OR title:emma", "sort": "-year", "limit": 1},
+            {"op": "find", "where": "author:"},
+        ])
+        result = results[3]["result"]
+        self.assertEqual([book["id"] for book in result["books"]], [3])
+        self.assertEqual(result["plan"]["rows_matched"], 2)
+        self.assertEqual(result["plan"]["sort"], "year desc")
+        self.assertEqual(results[4]["error"], "ValidationError")
+
+    def test_unexpected_error_does_not_stop_batch(self):
+        """
+        Test that an unexpected exception is reported for its line and later lines still run.
+        """
+        with patch.object(self.library, "get", side_effect=RuntimeError("boom")):
+            summary, results = self.run_commands([
+                {"op": "add", "title": "Dune", "author": "Frank Herbert", "year": 1965},
+                {"op": "get", "id": 1},
+                {"op": "find", "where": "title:dune", "sort": 5},
+                {"op": "find", "where": "title:dune", "limit": 1, "offset": None},
+            ])
+        self.assertEqual(summary, {"ok": 2, "failed": 2})
+        self.assertEqual((results[1]["ok"], results[1]["error"], results[1]["message"]),
+                         (False, "RuntimeError", "boom"))
+        self.assertEqual(results[2]["error"], "ValidationError")
+        self.assertEqual([book["id"] for book in results[3]["result"]["books"]], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
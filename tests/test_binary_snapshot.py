@@ -0,0 +1,81 @@
+import os
+import unittest
+from library.binary_snapshot import BinarySnapshot, write_snapshot, json_to_binary, binary_to_json
+from library.library_management import Library
+from library.storage import BinaryStorage
+from library.models import Book
+
+
+class TestBinarySnapshot(unittest.TestCase):
+    def setUp(self):
+        """Set up sample books and temporary file names."""
+        self.snapshot_file = "test_books.bookdb"
+        self.json_file = "test_snapshot_books.json"
+        self.books = [
+            Book(1, "Book One", "Author", 2001),
+            Book(4, "Новая Книга", "Арка", 2019, "borrowed"),
+            Book(7, "", "Author", 1999),
+        ]
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for path in (self.snapshot_file, self.json_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_round_trip(self):
+        """Test that books survive writing and lazy decoding."""
+        write_snapshot(self.snapshot_file, self.books)
+        with BinarySnapshot(self.snapshot_file) as snapshot:
+            self.assertEqual(len(snapshot), 3)
+            self.assertEqual([book.to_dict() for book in snapshot], [book.to_dict() for book in self.books])
+            self.assertEqual(snapshot[-1].id, 7)
+            self.assertEqual(snapshot.status_of(1), "borrowed")
+
+    def test_get_by_id(self):
+        """Test binary search over the ID column."""
+        write_snapshot(self.snapshot_file, self.books)
+        with BinarySnapshot(self.snapshot_file) as snapshot:
+            self.assertEqual(snapshot.get_by_id(4).title, "Новая Книга")
+            self.assertIsNone(snapshot.get_by_id(5))
+
+    def test_empty_and_unordered(self):
+        """Test an empty snapshot and rejection of unordered input."""
+        write_snapshot(self.snapshot_file, [])
+        with BinarySnapshot(self.snapshot_file) as snapshot:
+            self.assertEqual(list(snapshot), [])
+        with self.assertRaises(ValueError):
+            write_snapshot(self.snapshot_file, list(reversed(self.books)))
+
+    def test_invalid_file(self):
+        """Test that a non-snapshot file is rejected."""
+        with open(self.snapshot_file, "wb") as file:
+            file.write(b"not a snapshot at all, definitely not")
+        with self.assertRaises(ValueError):
+            BinarySnapshot(self.snapshot_file)
+
+    def test_json_converters(self):
+        """Test conversion between books.json and the binary format."""
+        library = Library(books_file=self.json_file)
+        library.books.extend(self.books)
+        library.save_books()
+
+        self.assertEqual(json_to_binary(self.json_file, self.snapshot_file), 3)
+        os.remove(self.json_file)
+        self.assertEqual(binary_to_json(self.snapshot_file, self.json_file), 3)
+        reloaded = Library(books_file=self.json_file)
+        self.assertEqual([book.to_dict() for book in reloaded.books], [book.to_dict() for book in self.books])
+
+    def test_library_selects_format_by_extension(self):
+        """Test that Library reads and writes the binary format for .bookdb files."""
+        library = Library(books_file=self.snapshot_file)
+        library.books.extend(self.books)
+        library.save_books()
+
+        reloaded = Library(books_file=self.snapshot_file)
+        self.assertIsInstance(reloaded.storage, BinaryStorage)
+        self.assertEqual(reloaded.books.get_by_id(4).status, "borrowed")
+
+
+if __name__ == "__main__":
+    unittest.main()
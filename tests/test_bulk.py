@@ -0,0 +1,94 @@
+import csv
+import json
+import os
+import unittest
+from library.bulk import detect_format, export_books, import_books
+from library.library_management import Library
+from library.models import Book
+
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a library with one existing book and temporary file names.
+        """
+        self.books_file = "test_bulk_books.json"
+        self.source = "test_bulk_source.csv"
+        self.jsonl_source = "test_bulk_source.jsonl"
+        self.rejects = "test_bulk_rejects.jsonl"
+        self.library = Library(books_file=self.books_file)
+        self.library.books.append(Book(1, "Existing", "Author", 2000))
+
+    def tearDown(self):
+        """
+        Clean up temporary files.
+        """
+        for path in (self.books_file, self.source, self.jsonl_source, self.rejects):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_import_csv_with_rejects(self):
+        """
+        Test that valid rows are imported once and bad rows are rejected with reasons.
+        """
+        with open(self.source, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["title", "author", "year", "status"])
+            writer.writerow(["Новая Книга", "Арка", "2019", ""])
+            writer.writerow(["existing", "AUTHOR", "2000", ""])
+            writer.writerow(["", "Author", "2001", ""])
+            writer.writerow(["Book", "Author", "abc", ""])
+            writer.writerow(["Book", "Author", "3000", ""])
+            writer.writerow(["Lent", "Author", "1999", "borrowed"])
+            writer.writerow(["Lent", "Author", "1999", "borrowed"])
+
+        report = import_books(self.library, self.source, reject_path=self.rejects)
+        self.assertEqual(report.to_dict(), {"imported": 2, "duplicates": 2, "rejected": 3})
+
+        reloaded = Library(books_file=self.books_file)
+        self.assertEqual([book.id for book in reloaded.books], [1, 2, 3])
+        self.assertEqual(reloaded.books.get_by_id(3).status, "borrowed")
+
+        with open(self.rejects, "r", encoding="utf-8") as file:
+            reasons = [json.loads(line)["reason"] for line in file]
+        self.assertEqual(reasons, ["duplicate", "empty title", "non-numeric year: 'abc'",
+                                   "year out of range: 3000", "duplicate"])
+
+    def test_import_jsonl(self):
+        """
+        Test importing JSON lines, including a malformed line.
+        """
+        with open(self.jsonl_source, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"title": "Dune", "author": "Frank Herbert", "year": 1965}) + "\n")
+            file.write("{not json\n")
+        report = import_books(self.library, self.jsonl_source)
+        self.assertEqual((report.imported, report.rejected), (1, 1))
+        self.assertTrue(self.library.books.find_duplicate("dune", "frank herbert", 1965))
+
+    def test_export_round_trip(self):
+        """
+        Test that exported CSV and JSONL files can be imported into an empty library.
+        """
+        self.library.books.append(Book(2, "Новая Книга", "Арка", 2019, "borrowed"))
+        for path in (self.source, self.jsonl_source):
+            self.assertEqual(export_books(self.library, path), 2)
+            target = Library(books_file=self.books_file)
+            target.books = []
+            report = import_books(target, path)
+            self.assertEqual(report.imported, 2)
+            self.assertEqual([book.to_dict() for book in target.books],
+                             [book.to_dict() for book in self.library.books])
+
+    def test_detect_format(self):
+        """
+        Test format detection by extension and explicit override.
+        """
+        self.assertEqual(detect_format("books.CSV"), "csv")
+        self.assertEqual(detect_format("books.ndjson"), "jsonl")
+        self.assertEqual(detect_format("books.txt", "jsonl"), "jsonl")
+        with self.assertRaises(ValueError):
+            detect_format("books.xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from library.catalog import BookCatalog
+from library.models import Book
+
+
+class TestBookCatalog(unittest.TestCase):
+    def setUp(self):
+        """Set up a catalog loaded in non-sorted order."""
+        self.catalog = BookCatalog([
+            Book(3, "Book Three", "Author", 2003),
+            Book(1, "Book One", "Author", 2001),
+            Book(2, "Book Two", "Author", 2002),
+        ])
+
+    def test_sorted_by_id_on_load(self):
+        """Test that the catalog is ordered by ID after loading."""
+        self.assertEqual([book.id for book in self.catalog.iter_by_id()], [1, 2, 3])
+        self.assertEqual(self.catalog[0].id, 1)
+        self.assertEqual(self.catalog.max_id(), 3)
+
+    def test_get_by_id(self):
+        """Test ID lookups through the index."""
+        self.assertEqual(self.catalog.get_by_id(2).title, "Book Two")
+        self.assertIsNone(self.catalog.get_by_id(999))
+        self.assertTrue(self.catalog.has_id(3))
+        self.assertFalse(self.catalog.has_id(4))
+
+    def test_remove_by_id(self):
+        """Test removing a book by ID keeps the list and index in sync."""
+        removed = self.catalog.remove_by_id(2)
+        self.assertEqual(removed.title, "Book Two")
+        self.assertEqual([book.id for book in self.catalog], [1, 3])
+        self.assertFalse(self.catalog.has_id(2))
+        with self.assertRaises(KeyError):
+            self.catalog.remove_by_id(2)
+
+    def test_append_keeps_id_order(self):
+        """Test that appending a lower ID still keeps the catalog ordered."""
+        self.catalog.remove_by_id(2)
+        self.catalog.append(Book(4, "Book Four", "Author", 2004))
+        self.catalog.append(Book(2, "Book Two", "Author", 2002))
+        self.assertEqual([book.id for book in self.catalog], [1, 2, 3, 4])
+
+    def test_duplicate_id_rejected(self):
+        """Test that adding a book with an existing ID raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.catalog.append(Book(1, "Other", "Author", 2000))
+        with self.assertRaises(ValueError):
+            BookCatalog([Book(1, "A", "A", 2000), Book(1, "B", "B", 2000)])
+
+    def test_allocate_id_is_monotonic(self):
+        """Test that IDs of deleted books are not handed out again."""
+        self.catalog.remove_by_id(3)
+        self.assertEqual(self.catalog.allocate_id(), 4)
+        self.assertEqual(self.catalog.allocate_id(), 5)
+
+    def test_find_duplicate(self):
+        """Test duplicate detection through the normalized key index."""
+        self.assertTrue(self.catalog.find_duplicate("book one", "AUTHOR", 2001))
+        self.catalog.remove_by_id(1)
+        self.assertFalse(self.catalog.find_duplicate("book one", "AUTHOR", 2001))
+
+    def test_find_candidates(self):
+        """Test that the trigram index narrows substring searches."""
+        self.catalog.append(Book(4, "Another Story", "Writer", 2004))
+        candidates = self.catalog.find_candidates("title", "story")
+        self.assertEqual([book.id for book in candidates], [4])
+        self.assertEqual(len(self.catalog.find_candidates("title", "bo")), 4)
+        self.assertEqual([book.id for book in self.catalog.find_candidates("year", "2001")], [1])
+
+    def test_find_by_year(self):
+        """Test exact, range and open-ended year lookups."""
+        self.assertEqual([book.id for book in self.catalog.find_by_year(2002, 2002)], [2])
+        self.assertEqual([book.id for book in self.catalog.find_by_year(2002, 2003)], [2, 3])
+        self.assertEqual([book.id for book in self.catalog.find_by_year(start=2002)], [2, 3])
+        self.assertEqual([book.id for book in self.catalog.find_by_year(end=2001)], [1])
+        self.catalog.remove_by_id(2)
+        self.assertEqual(self.catalog.find_by_year(2002, 2002), [])
+
+    def test_list_operations(self):
+        """Test list-compatible operations keep the index in sync."""
+        book = self.catalog[1]
+        self.catalog.remove(book)
+        self.assertNotIn(book, self.catalog)
+        del self.catalog[0]
+        self.assertFalse(self.catalog.has_id(1))
+        self.assertEqual(len(self.catalog), 1)
+        self.catalog.clear()
+        self.assertEqual(len(self.catalog), 0)
+        self.assertEqual(self.catalog.max_id(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import unittest
+from unittest.mock import patch
+import library.columnar as columnar
+from library.catalog import BookCatalog
+from library.columnar import ColumnarView
+from library.exceptions import ValidationError
+from library.library_management import Library
+from library.models import Book
+
+
+def make_books() -> list[Book]:
+    return [
+        Book(1, "The Hobbit", "J.R.R. Tolkien", 1937),
+        Book(2, "The Silmarillion", "J.R.R. Tolkien", 1977, "borrowed"),
+        Book(3, "Unfinished Tales", "J.R.R. Tolkien", 1980),
+        Book(4, "Dune", "Frank Herbert", 1965),
+        Book(5, "Война и мир", "Лев Толстой", 1869),
+        Book(6, "Children of Dune", "Frank Herbert", 1976, "borrowed"),
+    ]
+
+
+class ColumnarViewTests:
+    """
+    Shared checks for the NumPy and pure-Python backends.
+    """
+
+    use_numpy = False
+
+    def setUp(self):
+        """
+        Attach a columnar view to a small catalog.
+        """
+        self.books = BookCatalog(make_books())
+        self.view = ColumnarView(use_numpy=self.use_numpy)
+        self.books.add_index(self.view)
+
+    def test_filters_and_aggregates(self):
+        """
+        Test counts, ID selection, histograms and group-by status.
+        """
+        view = self.view
+        self.assertEqual(view.count(), 6)
+        self.assertEqual(view.count(status="borrowed"), 2)
+        self.assertEqual(view.count(1960, 1980, "available"), 2)
+        self.assertEqual(view.count(start=2000), 0)
+        self.assertEqual(view.select_ids(1960, 1980, "available"), [3, 4])
+        self.assertEqual(view.histogram(), {1860: 1, 1930: 1, 1960: 1, 1970: 2, 1980: 1})
+        self.assertEqual(view.histogram(bucket=1, start=1970, status="borrowed"), {1976: 1, 1977: 1})
+        self.assertEqual(view.histogram(start=2000), {})
+        self.assertEqual(view.count_by_status(), {"available": 4, "borrowed": 2})
+        self.assertEqual(view.count_by_status(end=1950), {"available": 2})
+        with self.assertRaises(ValueError):
+            view.histogram(bucket=0)
+
+    def test_incremental_sync(self):
+        """
+        Test that catalog changes are reflected without rebuilding the view.
+        """
+        books, view = self.books, self.view
+        books.append(Book(books.allocate_id(), "Emma", "Jane Austen", 1815))
+        books.remove_by_id(4)
+        books.update_status(1, "borrowed")
+        self.assertEqual(len(view), 6)
+        self.assertEqual(view.select_ids(status="borrowed"), [1, 2, 6])
+        self.assertEqual(view.select_ids(end=1900), [5, 7])
+
+        # Re-adding a deleted ID and inserting below the largest ID keep the columns ordered
+        books.append(Book(4, "Dune", "Frank Herbert", 1965))
+        self.assertEqual(view.select_ids(start=1960, end=1970), [4])
+        books.remove_by_id(3)
+        books.append(Book(3, "Emma", "Jane Austen", 1816))
+        self.assertEqual(list(view.ids), [1, 2, 3, 4, 5, 6, 7])
+
+        # A full rebuild of the catalog refills the view
+        books[0] = Book(1, "The Hobbit", "J.R.R. Tolkien", 1937)
+        self.assertEqual(view.count(status="borrowed"), 2)
+
+    def test_compaction(self):
+        """
+        Test that deleted rows are dropped from the columns once there are many of them.
+        """
+        books = BookCatalog(Book(i, f"Title {i}", "Author", 1900 + i % 100) for i in range(1, 5001))
+        view = ColumnarView(use_numpy=self.use_numpy)
+        books.add_index(view)
+        for book_id in range(1, 1300):
+            books.remove_by_id(book_id)
+        self.assertLess(len(view.ids), 5000)
+        self.assertEqual(len(view), 5000 - 1299)
+        self.assertEqual(view.select_ids(start=1900, end=1900)[:2], [1300, 1400])
+        self.assertEqual(sum(view.histogram().values()), 5000 - 1299)
+
+
+class TestColumnarViewPython(ColumnarViewTests, unittest.TestCase):
+    use_numpy = False
+
+
+@unittest.skipIf(columnar.numpy is None, "NumPy is not installed")
+class TestColumnarViewNumpy(ColumnarViewTests, unittest.TestCase):
+    use_numpy = True
+
+
+class TestLibraryAnalytics(unittest.TestCase):
+    def setUp(self):
+        """
+        Create a library with a few books in a temporary file.
+        """
+        self.temp_books_file = "test_columnar_books.json"
+        self.library = Library(books_file=self.temp_books_file)
+        for book in make_books():
+            self.library.add(book.title, book.author, book.year, book.status)
+
+    def tearDown(self):
+        if os.path.exists(self.temp_books_file):
+            os.remove(self.temp_books_file)
+
+    def test_library_analytics(self):
+        """
+        Test counts, histograms and status counts through the Library API.
+        """
+        library = self.library
+        self.assertEqual(library.count_books(year="1960-1980", status="available"), 2)
+        self.assertEqual(library.status_counts(year=">=1970"), {"available": 1, "borrowed": 2})
+        self.assertEqual(library.year_histogram(year="<1950"), {1860: 1, 1930: 1})
+
+        # The view is built once and follows later changes
+        view = library.columns()
+        library.set_status(3, "borrowed")
+        library.delete(2)
+        self.assertIs(library.columns(), view)
+        self.assertEqual(library.status_counts(), {"available": 3, "borrowed": 2})
+
+        with self.assertRaises(ValidationError):
+            library.count_books(year="recently")
+        with self.assertRaises(ValidationError):
+            library.count_books(status="lost")
+        with self.assertRaises(ValidationError):
+            library.year_histogram(bucket=0)
+
+    @patch("builtins.print")
+    def test_show_stats_prints_status_counts(self, mock_print):
+        """
+        Test that the statistics menu shows the number of books per status.
+        """
+        self.library.show_stats()
+        mock_print.assert_any_call("По статусам: available 4, borrowed 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,9 @@ import unittest
 from datetime import datetime
 from unittest import mock
 from library.models import Book
+from library.catalog import BookCatalog
 from library.helper_functions import (
+    book_exists,
     get_valid_id,
     get_valid_year,
     get_valid_status,
@@ -10,6 +12,9 @@ from library.helper_functions import (
     get_non_empty_string,
     filter_books,
     is_library_empty,
+    parse_year,
+    parse_non_empty_string,
+    parse_status,
 )
 
 class TestHelperFunctions(unittest.TestCase):
@@ -25,6 +30,17 @@ class TestHelperFunctions(unittest.TestCase):
         self.assertTrue(is_library_empty([]), "Should return True for an empty library.")
         self.assertFalse(is_library_empty(self.books), "Should return False for a non-empty library.")
 
+    def test_book_exists(self):
+        """Test book_exists on a list and on catalogs that provide has_id."""
+        self.assertTrue(book_exists(self.books, 2))
+        self.assertFalse(book_exists(self.books, 3))
+        self.assertTrue(book_exists(BookCatalog(self.books), 1))
+        # Any catalog with has_id is asked directly instead of being iterated
+        catalog = mock.Mock(spec=["has_id"])
+        catalog.has_id.return_value = True
+        self.assertTrue(book_exists(catalog, 42))
+        catalog.has_id.assert_called_once_with(42)
+
     def test_filter_books(self):
         """Test filtering books by title, author, and year."""
         # Filter by title
@@ -42,10 +58,28 @@ class TestHelperFunctions(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].year, 2001)
 
+        # Filter by year range and open-ended bound
+        result = filter_books(self.books, "year", "2000-2001")
+        self.assertEqual([book.id for book in result], [1])
+        result = filter_books(self.books, "year", ">=2002")
+        self.assertEqual([book.id for book in result], [2])
+
         # No results
         result = filter_books(self.books, "title", "non-existent")
         self.assertEqual(len(result), 0)
 
+    def test_filter_books_unicode(self):
+        """Test case-insensitive Cyrillic search with casefolding and ё/е folding."""
+        books = [
+            Book(1, "Новая Книга", "Арка", 2019),
+            Book(2, "Ёлка", "Фёдор Сологуб", 1906),
+            Book(3, "Die Straße", "Alfred Döblin", 1929),
+        ]
+        self.assertEqual([book.id for book in filter_books(books, "title", "НОВАЯ книга")], [1])
+        self.assertEqual([book.id for book in filter_books(books, "title", "елка")], [2])
+        self.assertEqual([book.id for book in filter_books(books, "author", "ФЕДОР")], [2])
+        self.assertEqual([book.id for book in filter_books(books, "title", "STRASSE")], [3])
+
     def test_get_non_empty_string(self):
         """Test get_non_empty_string with mock input."""
         with mock.patch("builtins.input", return_value="Test String"):
@@ -71,6 +105,24 @@ class TestHelperFunctions(unittest.TestCase):
         with mock.patch("builtins.input", side_effect=["-1", "3000", "2020"]):
             self.assertEqual(get_valid_year(), 2020)
 
+    def test_non_interactive_validators(self):
+        """Test validators used by bulk import."""
+        self.assertEqual(parse_year(" 2001 "), 2001)
+        self.assertEqual(parse_year(1999), 1999)
+        for value in ("abc", "0", "3000", None, True):
+            with self.assertRaises(ValueError):
+                parse_year(value, 2024)
+        self.assertEqual(parse_non_empty_string("  Title ", "title"), "Title")
+        with self.assertRaises(ValueError):
+            parse_non_empty_string("   ", "title")
+        self.assertEqual(parse_status(""), "available")
+        for value in (None, "", "  "):
+            with self.assertRaises(ValueError):
+                parse_status(value, default=None)
+        self.assertEqual(parse_status("Borrowed"), "borrowed")
+        with self.assertRaises(ValueError):
+            parse_status("lost")
+
     def test_get_search_choice(self):
         """Test get_search_choice with mock input."""
         with mock.patch("builtins.input", return_value="1"):
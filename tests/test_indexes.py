@@ -0,0 +1,88 @@
+import unittest
+from library.indexes import DuplicateKeyIndex, TrigramIndex, YearIndex, parse_year_query
+from library.models import Book
+
+
+class TestDuplicateKeyIndex(unittest.TestCase):
+    def setUp(self):
+        """Set up an index with a single book."""
+        self.index = DuplicateKeyIndex()
+        self.book = Book(1, "Book One", "Author One", 2001)
+        self.index.add(self.book)
+
+    def test_contains_is_case_insensitive(self):
+        """Test that duplicate detection ignores case of title and author."""
+        self.assertTrue(self.index.contains("BOOK ONE", "author one", 2001))
+        self.assertFalse(self.index.contains("Book One", "Author One", 2002))
+
+    def test_contains_folds_unicode(self):
+        """Test that Cyrillic duplicates are detected regardless of case and ё/е."""
+        self.index.add(Book(2, "Ёлка", "Фёдор Сологуб", 1906))
+        self.assertTrue(self.index.contains("ЕЛКА", "федор сологуб", 1906))
+
+    def test_remove_keeps_remaining_duplicates(self):
+        """Test that removing one of two equal books keeps the key."""
+        twin = Book(2, "book one", "AUTHOR ONE", 2001)
+        self.index.add(twin)
+        self.index.remove(self.book)
+        self.assertTrue(self.index.contains("Book One", "Author One", 2001))
+        self.index.remove(twin)
+        self.assertFalse(self.index.contains("Book One", "Author One", 2001))
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        """Set up a title index over Latin and Cyrillic titles."""
+        self.index = TrigramIndex("title")
+        self.books = [
+            Book(1, "The Hobbit", "Tolkien", 1937),
+            Book(2, "Harry Potter", "Rowling", 1997),
+            Book(3, "Новая Книга", "Арка", 2019),
+        ]
+        for book in self.books:
+            self.index.add(book)
+
+    def test_candidates_for_substring(self):
+        """Test that candidates contain every book with the substring."""
+        self.assertEqual(self.index.candidate_ids("hobb"), {1})
+        self.assertEqual(self.index.candidate_ids("книг"), {3})
+        self.assertEqual(self.index.candidate_ids("zzz"), set())
+
+    def test_short_query_falls_back(self):
+        """Test that queries shorter than a trigram cannot be narrowed."""
+        self.assertIsNone(self.index.candidate_ids("ho"))
+
+    def test_remove_updates_postings(self):
+        """Test that removing a book removes it from the postings."""
+        self.index.remove(self.books[0])
+        self.assertEqual(self.index.candidate_ids("hobb"), set())
+        self.assertEqual(self.index.candidate_ids("potter"), {2})
+
+
+class TestYearIndex(unittest.TestCase):
+    def test_parse_year_query(self):
+        """Test parsing of exact, range and open-ended year queries."""
+        self.assertEqual(parse_year_query("2001"), (2001, 2001))
+        self.assertEqual(parse_year_query("1990-2000"), (1990, 2000))
+        self.assertEqual(parse_year_query("2000 - 1990"), (1990, 2000))
+        self.assertEqual(parse_year_query(">=2015"), (2015, None))
+        self.assertEqual(parse_year_query(">2015"), (2016, None))
+        self.assertEqual(parse_year_query("<=1900"), (None, 1900))
+        self.assertEqual(parse_year_query("<1900"), (None, 1899))
+        self.assertIsNone(parse_year_query("nineteen"))
+
+    def test_range_ids(self):
+        """Test range lookups and incremental removal."""
+        index = YearIndex()
+        books = [Book(1, "A", "A", 2001), Book(2, "B", "B", 1999), Book(3, "C", "C", 2001)]
+        for book in books:
+            index.add(book)
+        self.assertEqual(index.range_ids(2001, 2001), [1, 3])
+        self.assertEqual(index.range_ids(None, 2000), [2])
+        self.assertEqual(index.range_ids(1990, None), [2, 1, 3])
+        index.remove(books[1])
+        self.assertEqual(index.range_ids(None, 2000), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
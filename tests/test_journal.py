@@ -0,0 +1,110 @@
+import unittest
+import os
+from unittest.mock import patch
+from library.library_management import Library
+from library.journal import BookJournal
+from library.models import Book
+
+
+class TestBookJournal(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a journaled library backed by temporary files.
+        """
+        self.temp_books_file = "test_journal_books.json"
+        self.journal_file = self.temp_books_file + BookJournal.SUFFIX
+        self.library = Library(books_file=self.temp_books_file, journal=True)
+
+    def tearDown(self):
+        """
+        Clean up the temporary snapshot and journal files.
+        """
+        for path in (self.temp_books_file, self.journal_file, self.temp_books_file + ".meta"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @patch("builtins.input", side_effect=["Journal Book", "Author", "2020"])
+    def test_add_appends_to_journal(self, mock_input):
+        """
+        Test that adding a book appends a record instead of writing the snapshot.
+        """
+        self.library.add_book()
+        self.assertFalse(os.path.exists(self.temp_books_file))
+        with open(self.journal_file, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn("Journal Book", lines[0])
+
+    def test_replay_over_snapshot(self):
+        """
+        Test that load_books replays the journal over the last snapshot.
+        """
+        self.library.books.extend([
+            Book(1, "Book One", "Author", 2001),
+            Book(2, "Book Two", "Author", 2002),
+        ])
+        self.library.save_books()
+
+        journal = BookJournal(self.temp_books_file)
+        journal.log_status(1, "borrowed")
+        journal.log_delete(2)
+        journal.log_add(Book(3, "Book Three", "Author", 2003))
+
+        reloaded = Library(books_file=self.temp_books_file, journal=True)
+        self.assertEqual([book.id for book in reloaded.books], [1, 3])
+        self.assertEqual(reloaded.books[0].status, "borrowed")
+
+    def test_deleted_highest_id_is_not_reused(self):
+        """
+        Test that deleting the highest ID in journal mode survives a restart without reusing the ID.
+        """
+        for i in range(1, 4):
+            self.library.add(f"Book {i}", "Author", 2000)
+        self.library.save_books()
+        library = Library(books_file=self.temp_books_file, journal=True)
+        library.delete(3)
+        library.close()
+        library = Library(books_file=self.temp_books_file, journal=True)
+        self.assertEqual(library.add("Book 4", "Author", 2000).id, 4)
+
+    def test_replay_is_idempotent(self):
+        """
+        Test that replaying records already contained in the snapshot is harmless.
+        """
+        journal = BookJournal(self.temp_books_file)
+        book = Book(1, "Book One", "Author", 2001)
+        journal.log_add(book)
+        journal.log_add(book)
+        journal.log_delete(5)
+
+        reloaded = Library(books_file=self.temp_books_file, journal=True)
+        self.assertEqual(len(reloaded.books), 1)
+
+    def test_torn_last_record_is_skipped(self):
+        """
+        Test that a partially written final record does not break loading.
+        """
+        journal = BookJournal(self.temp_books_file)
+        journal.log_add(Book(1, "Book One", "Author", 2001))
+        with open(self.journal_file, "a", encoding="utf-8") as file:
+            file.write('{"op": "add", "book": {"id": 2')
+
+        reloaded = Library(books_file=self.temp_books_file, journal=True)
+        self.assertEqual([book.id for book in reloaded.books], [1])
+
+    @patch("builtins.input", side_effect=["1", "2"])
+    def test_compaction_after_threshold(self, mock_input):
+        """
+        Test that the journal is folded into a new snapshot once it passes the threshold.
+        """
+        library = Library(books_file=self.temp_books_file, journal=True, journal_threshold=1)
+        library.books.append(Book(1, "Book One", "Author", 2001))
+        library.change_status()
+
+        self.assertFalse(os.path.exists(self.journal_file))
+        reloaded = Library(books_file=self.temp_books_file, journal=True)
+        self.assertEqual(reloaded.books[0].status, "borrowed")
+
+
+if __name__ == "__main__":
+    unittest.main()
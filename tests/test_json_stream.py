@@ -0,0 +1,64 @@
+import io
+import json
+import unittest
+from library.json_stream import iter_json_array, write_json_array
+
+
+class TestJsonStream(unittest.TestCase):
+    def setUp(self):
+        """Set up sample records, including Cyrillic text and nested escapes."""
+        self.records = [
+            {"id": 1, "title": "Book One", "author": "Author", "year": 2001, "status": "available"},
+            {"id": 12345, "title": "Новая Книга", "author": "Арка", "year": 2019, "status": "borrowed"},
+            {"id": 3, "title": "Quote \" and ] bracket", "author": "A, B", "year": 1999, "status": "available"},
+        ]
+
+    def test_iter_matches_json_load(self):
+        """Test that streaming parsing matches json.load with tiny chunks."""
+        text = json.dumps(self.records, indent=4)
+        for chunk_size in (1, 7, 64, 65536):
+            parsed = list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+            self.assertEqual(parsed, self.records)
+
+    def test_iter_empty_and_invalid(self):
+        """Test parsing of an empty array and rejection of malformed input."""
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "))), [])
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO('{"id": 1}')))
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO('[{"id": 1} {"id": 2}]')))
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO('[{"id": 1},')))
+
+    def test_iter_values_split_across_chunks(self):
+        """Test numbers, literals and escapes cut at every possible chunk boundary."""
+        records = [{"id": i, "rate": -1.5e-3, "flag": True, "none": None, "text": "\u0416\\"} for i in range(5)]
+        text = json.dumps(records)
+        for chunk_size in range(1, 40):
+            self.assertEqual(list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)), records)
+
+    def test_syntax_error_does_not_read_whole_file(self):
+        """Test that an early syntax error is raised without reading the rest of the file."""
+        text = '[{"id": 1,, ' + json.dumps(self.records * 1000)[1:]
+        file = io.StringIO(text)
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(file, chunk_size=1024))
+        self.assertLessEqual(file.tell(), 1024)
+
+    def test_write_matches_json_dump(self):
+        """Test that the default writer produces the same text as json.dump(indent=4)."""
+        for records in (self.records, []):
+            output = io.StringIO()
+            write_json_array(output, iter(records))
+            self.assertEqual(output.getvalue(), json.dumps(records, indent=4))
+
+    def test_write_compact(self):
+        """Test that the compact writer is smaller and round-trips."""
+        output = io.StringIO()
+        write_json_array(output, iter(self.records), compact=True)
+        self.assertLess(len(output.getvalue()), len(json.dumps(self.records, indent=4)))
+        self.assertEqual(json.loads(output.getvalue()), self.records)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,11 @@
 import unittest
 import os
+import threading
+from io import StringIO
 from unittest.mock import patch, MagicMock
 from library.library_management import Library
 from library.models import Book
+from library.exceptions import BookNotFoundError, DuplicateBookError, ValidationError
 
 
 class TestLibrary(unittest.TestCase):
@@ -17,8 +20,9 @@ class TestLibrary(unittest.TestCase):
         """
         Clean up the temporary books file after each test.
         """
-        if os.path.exists(self.temp_books_file):
-            os.remove(self.temp_books_file)
+        for path in (self.temp_books_file, self.temp_books_file + ".meta"):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_load_books_empty(self):
         """
@@ -62,6 +66,21 @@ class TestLibrary(unittest.TestCase):
         self.library.add_book()
         self.assertEqual(len(self.library.books), 1)  # Ensure no duplicate was added
 
+    @patch("builtins.input", side_effect=["2", "New Book", "Author", "2023"])
+    def test_ids_not_reused_after_delete(self, mock_input):
+        """
+        Test that the ID counter survives deleting the last book and reloading.
+        """
+        self.library.books.extend([
+            Book(book_id=1, title="Book One", author="Author", year=2021),
+            Book(book_id=2, title="Book Two", author="Author", year=2022),
+        ])
+        self.library.delete_book()
+
+        reloaded = Library(books_file=self.temp_books_file)
+        reloaded.add_book()
+        self.assertEqual([book.id for book in reloaded.books], [1, 3])
+
     @patch("builtins.input", side_effect=["999"])
     def test_delete_non_existent_book(self, mock_input):
         """
@@ -82,10 +101,10 @@ class TestLibrary(unittest.TestCase):
         self.library.change_status()
         self.assertEqual(self.library.books[0].status, "available")
 
-    @patch("builtins.print")
-    def test_display_books(self, mock_print):
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_display_books(self, mock_stdout):
         """
-        Test displaying books in the library.
+        Test displaying books in the library with a single buffered write.
         """
         self.library.books = [
             Book(book_id=1, title="Книга 1", author="Автор 1", year=2021, status="доступна"),
@@ -93,15 +112,18 @@ class TestLibrary(unittest.TestCase):
         ]
         self.library.display_books()
 
-        # Verify table header and rows are printed correctly
-        mock_print.assert_any_call(f"{'ID':<5} {'Название':<30} {'Автор':<20} {'Год':<6} {'Статус':<10}")
-        mock_print.assert_any_call("-" * 75)
-        mock_print.assert_any_call(f"{1:<5} {'Книга 1':<30} {'Автор 1':<20} {2021:<6} {'доступна':<10}")
-        mock_print.assert_any_call(f"{2:<5} {'Книга 2':<30} {'Автор 2':<20} {2022:<6} {'занята':<10}")
+        # Verify table header and rows are written correctly
+        self.assertEqual(mock_stdout.getvalue().splitlines(), [
+            f"{'ID':<5} {'Название':<30} {'Автор':<20} {'Год':<6} {'Статус':<10}",
+            "-" * 75,
+            f"{1:<5} {'Книга 1':<30} {'Автор 1':<20} {2021:<6} {'доступна':<10}",
+            f"{2:<5} {'Книга 2':<30} {'Автор 2':<20} {2022:<6} {'занята':<10}",
+        ])
 
     @patch("builtins.input", side_effect=["2", "Автор 1"])
+    @patch("sys.stdout", new_callable=StringIO)
     @patch("builtins.print")
-    def test_search_books(self, mock_print, mock_input):
+    def test_search_books(self, mock_print, mock_stdout, mock_input):
         """
         Test searching for books by author.
         """
@@ -113,10 +135,178 @@ class TestLibrary(unittest.TestCase):
 
         # Verify the printed output
         mock_print.assert_any_call("\nНайдено 1 книг(и):")
-        mock_print.assert_any_call(f"{'ID':<5} {'Название':<30} {'Автор':<20} {'Год':<6} {'Статус':<10}")
-        mock_print.assert_any_call("-" * 75)
-        mock_print.assert_any_call(f"{1:<5} {'Книга 1':<30} {'Автор 1':<20} {2021:<6} {'доступна':<10}")
+        self.assertEqual(mock_stdout.getvalue().splitlines(), [
+            f"{'ID':<5} {'Название':<30} {'Автор':<20} {'Год':<6} {'Статус':<10}",
+            "-" * 75,
+            f"{1:<5} {'Книга 1':<30} {'Автор 1':<20} {2021:<6} {'доступна':<10}",
+        ])
+
+
+    def test_api_add_get_delete(self):
+        """
+        Test the non-interactive add, get and delete API.
+        """
+        book = self.library.add("Dune", "Frank Herbert", 1965)
+        self.assertEqual(book.id, 1)
+        self.assertIs(self.library.get(1), book)
+        with self.assertRaises(DuplicateBookError):
+            self.library.add("dune", "FRANK HERBERT", "1965")
+        self.assertEqual(self.library.delete(1).title, "Dune")
+        with self.assertRaises(BookNotFoundError):
+            self.library.get(1)
+        with self.assertRaises(BookNotFoundError):
+            self.library.delete(1)
+
+    def test_api_validation(self):
+        """
+        Test that invalid input raises ValidationError instead of prompting.
+        """
+        with self.assertRaises(ValidationError):
+            self.library.add("", "Author", 2000)
+        with self.assertRaises(ValidationError):
+            self.library.add("Title", "Author", 3000)
+        self.library.add("Title", "Author", 2000)
+        with self.assertRaises(ValidationError):
+            self.library.set_status(1, "lost")
+        with self.assertRaises(ValidationError):
+            self.library.query("isbn", "123")
+        with self.assertRaises(ValidationError):
+            self.library.query("year", "last year")
+
+    def test_api_set_status_and_query(self):
+        """
+        Test status changes and queries through the non-interactive API.
+        """
+        self.library.add("The Hobbit", "J.R.R. Tolkien", 1937)
+        self.library.add("Новая Книга", "Арка", 2019)
+        self.assertEqual(self.library.set_status(1, "borrowed").status, "borrowed")
+        for missing in (None, ""):
+            with self.assertRaises(ValidationError):
+                self.library.set_status(1, missing)
+        self.assertEqual(self.library.get(1).status, "borrowed")
+        self.assertEqual([book.id for book in self.library.query("author", "TOLKIEN")], [1])
+        self.assertEqual([book.id for book in self.library.query("title", "Книга")], [2])
+        self.assertEqual([book.id for book in self.library.query("year", ">=1900")], [1, 2])
+
+        reloaded = Library(books_file=self.temp_books_file)
+        self.assertEqual(reloaded.get(1).status, "borrowed")
+
+    def test_query_cyrillic(self):
+        """
+        Test indexed Cyrillic search and duplicate checks ignore case and ё/е.
+        """
+        self.library.add("Новая Книга", "Арка", 2019)
+        self.library.add("Ёлка", "Фёдор Сологуб", 1906)
+        self.assertEqual([book.id for book in self.library.query("title", "новая КНИГА")], [1])
+        self.assertEqual([book.id for book in self.library.query("title", "ЕЛК")], [2])
+        self.assertEqual([book.id for book in self.library.query("author", "федор")], [2])
+        with self.assertRaises(DuplicateBookError):
+            self.library.add("ЕЛКА", "ФЕДОР СОЛОГУБ", 1906)
+
+    def test_find_and_advanced_search(self):
+        """
+        Test multi-criteria queries through the API and the interactive menu.
+        """
+        self.library.add("The Hobbit", "J.R.R. Tolkien", 1937)
+        self.library.add("The Silmarillion", "J.R.R. Tolkien", 1977)
+        self.library.add("Dune", "Frank Herbert", 1965)
+        self.library.set_status(2, "borrowed")
+        result = self.library.find("author:tolkien status:available OR year:1965", sort="-year")
+        self.assertEqual([book.id for book in result.books], [3, 1])
+        with self.assertRaises(ValidationError):
+            self.library.find("author:tolkien AND")
+        # Status filters are answered from the columnar view, which follows status changes
+        self.library.set_status(3, "borrowed")
+        result = self.library.find("status:borrowed")
+        self.assertEqual(result.plan["access"], "status/year columns (status = borrowed)")
+        self.assertEqual([book.id for book in result.books], [2, 3])
+
+        with patch("builtins.input", side_effect=["author:tolkien year:>=1950", ""]), \
+                patch("sys.stdout", new_callable=StringIO) as mock_stdout, patch("builtins.print") as mock_print:
+            self.library.advanced_search()
+        mock_print.assert_any_call("\nНайдено 1 книг(и):")
+        self.assertIn(f"{2:<5} {'The Silmarillion':<30} {'J.R.R. Tolkien':<20} {1977:<6} {'borrowed':<10}",
+                      mock_stdout.getvalue().splitlines())
+        with patch("builtins.input", side_effect=["color:red", ""]), patch("builtins.print") as mock_print:
+            self.library.advanced_search()
+        mock_print.assert_any_call("\nНекорректный запрос: unknown field: 'color'")
+
+    def test_query_cache_invalidation(self):
+        """
+        Test that repeated queries hit the cache and mutations invalidate it.
+        """
+        self.library.add("The Hobbit", "J.R.R. Tolkien", 1937)
+        self.assertEqual([book.id for book in self.library.query("author", "Tolkien")], [1])
+        self.assertEqual([book.id for book in self.library.query("author", " tolkien")], [1])
+        self.assertEqual(self.library.query_cache.hits, 1)
+
+        self.library.add("The Silmarillion", "J.R.R. Tolkien", 1977)
+        self.assertEqual([book.id for book in self.library.query("author", "tolkien")], [1, 2])
+        self.library.set_status(1, "borrowed")
+        self.assertEqual(self.library.query("author", "tolkien")[0].status, "borrowed")
+        self.library.delete(2)
+        self.assertEqual([book.id for book in self.library.query("author", "tolkien")], [1])
+        self.assertEqual(self.library.query_cache.hits, 1)
+
+    def test_commit_every_n_mutations(self):
+        """
+        Test that changes are persisted only after every N mutations or on flush.
+        """
+        library = Library(books_file=self.temp_books_file, commit_every=3)
+        with patch.object(library.storage, "save", wraps=library.storage.save) as mock_save:
+            library.add("Book 1", "Author", 2000)
+            library.add("Book 2", "Author", 2000)
+            self.assertTrue(library.dirty)
+            self.assertEqual(mock_save.call_count, 0)
+            library.add("Book 3", "Author", 2000)
+            self.assertFalse(library.dirty)
+            self.assertEqual(mock_save.call_count, 1)
+            library.set_status(1, "borrowed")
+            library.flush()
+            self.assertEqual(mock_save.call_count, 2)
+        self.assertEqual(Library(books_file=self.temp_books_file).get(1).status, "borrowed")
+
+    def test_failed_flush_keeps_changes_pending(self):
+        """
+        Test that a failed deferred save is retried by the next flush.
+        """
+        library = Library(books_file=self.temp_books_file, commit_every=10)
+        library.add("Book 1", "Author", 2000)
+        with patch.object(library.storage, "write_snapshot", side_effect=OSError("disk full")), \
+                patch("builtins.print"):
+            library.flush()
+        self.assertTrue(library.dirty)
+        library.flush()
+        self.assertFalse(library.dirty)
+        self.assertEqual(len(Library(books_file=self.temp_books_file).books), 1)
+
+    def test_commit_interval_and_close(self):
+        """
+        Test that the background flusher persists changes and close() flushes the rest.
+        """
+        library = Library(books_file=self.temp_books_file, commit_interval_ms=10)
+        self.addCleanup(library.close)
+        library.add("Book 1", "Author", 2000)
+        for _ in range(200):
+            if not library.dirty:
+                break
+            threading.Event().wait(0.01)
+        self.assertFalse(library.dirty)
+        self.assertEqual(len(Library(books_file=self.temp_books_file).books), 1)
+
+        library.commit_interval_ms = 60_000
+        library.add("Book 2", "Author", 2000)
+        library.close()
+        self.assertEqual(len(Library(books_file=self.temp_books_file).books), 2)
 
+    def test_invalid_commit_policy(self):
+        """
+        Test that invalid or unsafe commit policies are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Library(books_file=self.temp_books_file, commit_every=0)
+        with self.assertRaises(ValueError):
+            Library(books_file=self.temp_books_file, shared=True, commit_every=10)
 
     @patch("builtins.print")
     def test_is_library_empty(self, mock_print):
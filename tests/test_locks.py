@@ -0,0 +1,152 @@
+import json
+import multiprocessing
+import os
+import threading
+import unittest
+from unittest.mock import patch
+from library.library_management import Library
+from library.locks import ReadWriteLock, LOCK_SUFFIX
+
+BOOKS_FILE = "test_locks_books.json"
+
+
+def add_books_in_process(worker, count):
+    """
+    Worker process: add books to the shared catalog one by one.
+    """
+    with patch("builtins.print"):
+        library = Library(books_file=BOOKS_FILE, shared=True)
+        for i in range(count):
+            library.add(f"Book {worker}-{i}", f"Author {worker}", 2000)
+
+
+class TestReadWriteLock(unittest.TestCase):
+    def test_readers_share_the_lock(self):
+        """
+        Test that two readers can hold the lock at the same time.
+        """
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with lock.read():
+                barrier.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(barrier.broken)
+
+    def test_writer_excludes_readers(self):
+        """
+        Test that a reader waits while a writer holds the lock.
+        """
+        lock = ReadWriteLock()
+        events = []
+
+        def reader():
+            with lock.read():
+                events.append("read")
+
+        with lock.write():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join(0.1)
+            self.assertEqual(events, [])
+            events.append("write done")
+        thread.join(5)
+        self.assertEqual(events, ["write done", "read"])
+
+    def test_reentrancy(self):
+        """
+        Test nested writes, reads inside a write, and the upgrade error.
+        """
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with self.assertRaises(RuntimeError):
+                with lock.write():
+                    pass
+
+
+@patch("builtins.print")
+class TestConcurrentLibrary(unittest.TestCase):
+    def tearDown(self):
+        """
+        Clean up the shared books file and its side files.
+        """
+        for suffix in ("", ".meta", LOCK_SUFFIX):
+            if os.path.exists(BOOKS_FILE + suffix):
+                os.remove(BOOKS_FILE + suffix)
+
+    def test_threads_do_not_lose_updates(self, mock_print):
+        """
+        Stress test: concurrent writers and readers in one thread-safe library.
+        """
+        library = Library(books_file=BOOKS_FILE, thread_safe=True)
+        errors = []
+
+        def writer(worker):
+            try:
+                for i in range(50):
+                    book = library.add(f"Book {worker}-{i}", f"Author {worker}", 2000)
+                    library.set_status(book.id, "borrowed")
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            try:
+                for _ in range(50):
+                    library.query("author", "author")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(8)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual([book.id for book in library.books], list(range(1, 401)))
+        self.assertTrue(all(book.status == "borrowed" for book in library.books))
+        with open(BOOKS_FILE, "r", encoding="utf-8") as file:
+            self.assertEqual(len(json.load(file)), 400)
+
+    def test_processes_do_not_lose_updates(self, mock_print):
+        """
+        Stress test: several processes add books to one shared catalog file.
+        """
+        workers = [
+            multiprocessing.Process(target=add_books_in_process, args=(worker, 25)) for worker in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            self.assertEqual(worker.exitcode, 0)
+
+        library = Library(books_file=BOOKS_FILE, shared=True)
+        self.assertEqual([book.id for book in library.books], list(range(1, 101)))
+        self.assertEqual(len({(book.title, book.author) for book in library.books}), 100)
+
+    def test_shared_library_sees_changes_from_other_instances(self, mock_print):
+        """
+        Test that reads pick up books written by another instance of the shared catalog.
+        """
+        first = Library(books_file=BOOKS_FILE, shared=True)
+        second = Library(books_file=BOOKS_FILE, shared=True)
+        first.add("Dune", "Frank Herbert", 1965)
+        self.assertEqual(second.get(1).title, "Dune")
+        second.add("Emma", "Jane Austen", 1815)
+        self.assertEqual([book.title for book in first.query("year", "1800-2000")], ["Dune", "Emma"])
+
+
+if __name__ == "__main__":
+    unittest.main()
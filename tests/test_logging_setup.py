@@ -0,0 +1,86 @@
+import json
+import logging
+import unittest
+from library.logging_setup import SamplingFilter, setup_logging
+
+
+class ListHandler(logging.Handler):
+    """
+    Handler that keeps formatted records in memory.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+class TestLoggingSetup(unittest.TestCase):
+    def setUp(self):
+        """
+        Remember the root logger configuration.
+        """
+        self.saved_handlers = logging.root.handlers[:]
+        self.saved_level = logging.root.level
+        self.handler = ListHandler()
+
+    def tearDown(self):
+        """
+        Restore the root logger configuration.
+        """
+        for handler in logging.root.handlers[:]:
+            logging.root.removeHandler(handler)
+        for handler in self.saved_handlers:
+            logging.root.addHandler(handler)
+        logging.root.setLevel(self.saved_level)
+
+    def test_text_format_through_queue(self):
+        """
+        Test that records reach the target handler on the listener thread.
+        """
+        log_setup = setup_logging(handler=self.handler)
+        logging.info("Bulk export to %s: %s books", "out.csv", 3)
+        logging.debug("Filtered out: %s", "never formatted")
+        log_setup.shutdown()
+        self.assertEqual(len(self.handler.lines), 1)
+        self.assertTrue(self.handler.lines[0].endswith(" - INFO - Bulk export to out.csv: 3 books"))
+
+    def test_json_format(self):
+        """
+        Test that JSON records carry the message, level and extra fields.
+        """
+        log_setup = setup_logging(handler=self.handler, json_format=True)
+        logging.warning("Delete attempted for missing Book ID=%s", 7, extra={"book_id": 7})
+        log_setup.shutdown()
+        entry = json.loads(self.handler.lines[0])
+        self.assertEqual(entry["level"], "WARNING")
+        self.assertEqual(entry["message"], "Delete attempted for missing Book ID=7")
+        self.assertEqual(entry["book_id"], 7)
+
+    def test_sampling(self):
+        """
+        Test that frequent warnings are sampled and other records are not.
+        """
+        log_setup = setup_logging(handler=self.handler, sample_every=10)
+        for book_id in range(25):
+            logging.warning("Invalid book ID entered: %s", book_id)
+            logging.warning("Invalid year entered: %s", book_id)
+        log_setup.shutdown()
+        sampled = [line for line in self.handler.lines if "Invalid book ID" in line]
+        self.assertEqual(len(sampled), 3)
+        self.assertTrue(sampled[1].endswith("Invalid book ID entered: 10 (9 similar messages suppressed)"))
+        self.assertEqual(len([line for line in self.handler.lines if "Invalid year" in line]), 25)
+
+    def test_sampling_disabled(self):
+        """
+        Test that sample_every=1 lets every record through.
+        """
+        sampling = SamplingFilter(every=1)
+        record = logging.LogRecord("root", logging.WARNING, "", 0, "Invalid book ID entered: %s", (1,), None)
+        self.assertTrue(all(sampling.filter(record) for _ in range(5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import pstats
+import unittest
+from unittest.mock import patch
+from library.library_management import Library
+from library.metrics import LatencyHistogram, Metrics
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        """
+        Test that percentiles fall within one bucket (20%) of the true value.
+        """
+        histogram = LatencyHistogram()
+        for i in range(1, 101):
+            histogram.observe(i / 1000)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.percentile(0.50), 0.050, delta=0.050 * 0.2)
+        self.assertAlmostEqual(histogram.percentile(0.99), 0.099, delta=0.099 * 0.2)
+        self.assertEqual(histogram.percentile(1.0), 0.1)
+        self.assertEqual(LatencyHistogram().percentile(0.5), 0.0)
+
+
+class TestLibraryMetrics(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up an empty library backed by a temporary file.
+        """
+        self.temp_books_file = "test_metrics_books.json"
+        self.profile_file = "test_metrics.prof"
+        with patch("builtins.print"):
+            self.library = Library(books_file=self.temp_books_file)
+
+    def tearDown(self):
+        """
+        Disable metrics and clean up the temporary files.
+        """
+        if self.library is not None:
+            self.library.metrics.disable()
+        for path in (self.temp_books_file, self.temp_books_file + ".meta", self.profile_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_disabled_by_default(self):
+        """
+        Test that no timings are recorded unless metrics are enabled.
+        """
+        self.library.add("Dune", "Frank Herbert", 1965)
+        self.assertEqual(self.library.stats()["operations"], {})
+
+    def test_wrappers_installed_only_while_active(self):
+        """
+        Test that methods are called unwrapped while metrics are off and nothing is set on the instance.
+        """
+        get, add = Library.get, Library.add
+        attributes = set(vars(self.library))
+        self.library.metrics.enable()
+        self.assertIsNot(Library.get, get)
+        self.library.metrics.disable()
+        self.assertIs(Library.get, get)
+        self.assertIs(Library.add, add)
+        self.assertNotIn("get", vars(self.library))
+        self.assertNotIn("add", vars(self.library))
+        # The wrappers live on the class, so the instance attributes never change
+        self.assertEqual(set(vars(self.library)), attributes)
+        self.assertEqual(self.library.get.__func__, Library.get)
+
+    def test_metrics_are_per_library(self):
+        """
+        Test that another library is not timed and the class is restored when both are released.
+        """
+        get = Library.get
+        with patch("builtins.print"):
+            other = Library(books_file=self.temp_books_file)
+        self.library.metrics.enable()
+        other.metrics.enable()
+        other.metrics.disable()
+        self.assertIsNot(Library.get, get)
+        self.library.add("Dune", "Frank Herbert", 1965)
+        other.add("Emma", "Jane Austen", 1815)
+        self.assertEqual(self.library.stats()["operations"]["add"]["count"], 1)
+        self.assertEqual(other.stats()["operations"], {})
+        # A library that is garbage collected with metrics on releases the class too
+        self.library = None
+        self.assertIs(Library.get, get)
+
+    def test_status_change_is_one_operation(self):
+        """
+        Test that set_status does not also record a get.
+        """
+        self.library.metrics.enable()
+        self.library.add("Dune", "Frank Herbert", 1965)
+        self.library.set_status(1, "borrowed")
+        operations = self.library.stats()["operations"]
+        self.assertEqual(operations["set_status"]["count"], 1)
+        self.assertNotIn("get", operations)
+
+    def test_stats(self):
+        """
+        Test operation timings, storage bytes and cache and index hit rates.
+        """
+        self.library.metrics.enable()
+        self.library.add("Dune", "Frank Herbert", 1965)
+        self.library.query("author", "herbert")
+        self.library.query("author", "herbert")
+        stats = self.library.stats()
+        self.assertEqual(stats["operations"]["add"]["count"], 1)
+        self.assertEqual(stats["operations"]["query"]["count"], 2)
+        self.assertGreaterEqual(stats["operations"]["query"]["p99_ms"], 0)
+        self.assertEqual(stats["storage"]["bytes_written"], os.path.getsize(self.temp_books_file))
+        self.assertEqual(stats["query_cache"]["hit_rate"], 0.5)
+        self.assertEqual(stats["indexes"]["index_lookups"], 1)
+
+    def test_profile_next(self):
+        """
+        Test that the next call of an operation is profiled into a file.
+        """
+        metrics = self.library.metrics
+        metrics.profile_next("add", self.profile_file)
+        self.assertTrue(metrics.active)
+        self.library.add("Dune", "Frank Herbert", 1965)
+        self.assertFalse(metrics.active)
+        stats = pstats.Stats(self.profile_file)
+        self.assertTrue(any(name == "add" for _, _, name in stats.stats))
+
+    @patch("builtins.print")
+    def test_show_stats(self, mock_print):
+        """
+        Test that the menu command prints the statistics.
+        """
+        self.library.metrics = Metrics(enabled=True)
+        self.library.add("Dune", "Frank Herbert", 1965)
+        self.library.show_stats()
+        mock_print.assert_any_call("\nКниг в библиотеке: 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from library.models import Book
+from library.models import Book, STATUS_AVAILABLE, normalize_text, STATUS_BORROWED, status_code, status_name
 
 
 class TestBook(unittest.TestCase):
@@ -50,6 +50,18 @@ class TestBook(unittest.TestCase):
         self.assertEqual(book.year, 1932)
         self.assertEqual(book.status, "available")
 
+    def test_normalized_keys(self):
+        """
+        Test that search keys are computed once with NFKC, casefolding and ё/е folding.
+        """
+        book = Book(book_id=5, title="Ёлка ﬁ", author="ФЁДОР Сологуб", year=1906)
+        self.assertEqual(book.title_key, "елка fi")
+        self.assertEqual(book.author_key, "федор сологуб")
+        self.assertEqual(normalize_text("Straße"), "strasse")
+        # An already normalized title shares the string instead of storing a copy
+        book = Book(book_id=6, title="dune", author="Frank Herbert", year=1965)
+        self.assertIs(book.title_key, book.title)
+
     def test_default_status(self):
         """
         Test the default status of a Book instance.
@@ -58,6 +70,35 @@ class TestBook(unittest.TestCase):
         
         self.assertEqual(book.status, "available")
 
+    def test_status_stored_as_code(self):
+        """
+        Test that the status is stored as a small integer code.
+        """
+        book = Book(book_id=5, title="Dune", author="Frank Herbert", year=1965)
+        self.assertEqual(book.status_code, STATUS_AVAILABLE)
+        book.status = "borrowed"
+        self.assertEqual(book.status_code, STATUS_BORROWED)
+        self.assertEqual(book.status, "borrowed")
+
+    def test_custom_status_is_registered(self):
+        """
+        Test that statuses outside the known set still round-trip.
+        """
+        code = status_code("доступна")
+        self.assertEqual(status_code("доступна"), code)
+        self.assertEqual(status_name(code), "доступна")
+        book = Book(book_id=6, title="Книга", author="Автор", year=2020, status="доступна")
+        self.assertEqual(book.to_dict()["status"], "доступна")
+
+    def test_compact_layout(self):
+        """
+        Test that Book has no per-instance __dict__ and interns authors.
+        """
+        first = Book(book_id=7, title="A", author="".join(["Same ", "Author"]), year=2000)
+        second = Book(book_id=8, title="B", author="".join(["Same ", "Author"]), year=2001)
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.author, second.author)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import os
+import unittest
+from library.catalog import BookCatalog
+from library.library_management import Library
+from library.models import Book
+from library.parallel_search import ShardedSearch
+import library.helper_functions as helper_functions
+
+
+def make_books(count):
+    return [Book(i, f"Title {i} {'war' if i % 3 else 'peace'}", f"Author {i % 7}", 1900 + i % 120)
+            for i in range(1, count + 1)]
+
+
+class TestShardedSearch(unittest.TestCase):
+    def setUp(self):
+        """
+        Create a two-shard searcher that runs in parallel for any catalog size.
+        """
+        self.search = ShardedSearch(workers=2, min_size=0)
+        self.addCleanup(self.search.close)
+        self.books = BookCatalog(make_books(50))
+
+    def assertSameAsSerial(self, search_type, query):
+        expected = helper_functions.filter_books(self.books, search_type, query)
+        self.assertEqual(self.search.search(self.books, search_type, query), expected)
+
+    def test_matches_serial_search(self):
+        """
+        Test that merged shard results equal a serial scan, in ID order.
+        """
+        self.assertSameAsSerial("title", "war")
+        self.assertSameAsSerial("author", "author 3")
+        self.assertSameAsSerial("year", "1910-1930")
+        self.assertEqual(self.search.search(self.books, "title", "missing"), [])
+
+    def test_follows_catalog_changes(self):
+        """
+        Test that adds, deletes, status changes and out-of-order inserts are visible.
+        """
+        self.assertSameAsSerial("title", "peace")
+        self.books.append(Book(self.books.allocate_id(), "Peace again", "Author 1", 2000))
+        self.books.remove_by_id(3)
+        self.books.update_status(6, "borrowed")
+        self.assertSameAsSerial("title", "peace")
+        self.assertEqual(self.search.search(self.books, "title", "peace")[0].status, "borrowed")
+
+        # An ID below the sharded range forces the shards to be rebuilt
+        self.books.append(Book(3, "Peace restored", "Author 3", 2001))
+        self.assertSameAsSerial("title", "peace")
+
+    def test_accepts_by_size(self):
+        """
+        Test that small candidate sets are searched serially.
+        """
+        search = ShardedSearch(workers=2, min_size=100)
+        self.assertFalse(search.accepts(self.books, self.books))
+        self.assertTrue(search.accepts(BookCatalog(make_books(100)), range(100)))
+        self.assertFalse(search.accepts(list(self.books), range(100)))
+
+
+class TestLibraryParallelSearch(unittest.TestCase):
+    def setUp(self):
+        """
+        Create a library with two search workers and no size threshold.
+        """
+        self.books_file = "test_parallel_books.json"
+        self.library = Library(books_file=self.books_file, search_workers=2)
+        self.library.parallel_search.min_size = 0
+        self.addCleanup(self.library.close)
+
+    def tearDown(self):
+        for path in (self.books_file, self.books_file + ".meta"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_query_uses_shards(self):
+        """
+        Test that Library.query returns the same results through the worker processes.
+        """
+        with self.library.group_commit():
+            for title in ("War and Peace", "Peace Talks", "The Hobbit"):
+                self.library.add(title, "Author", 2000)
+        self.assertEqual([book.id for book in self.library.query("title", "pe")], [1, 2])
+        self.library.delete(1)
+        self.assertEqual([book.id for book in self.library.query("title", "pe")], [2])
+        self.assertIs(self.library.parallel_search._catalog, self.library.books)
+
+    def test_invalid_workers(self):
+        """
+        Test that a negative number of search workers is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Library(books_file=self.books_file, search_workers=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from library.query_cache import QueryCache
+
+
+class TestQueryCache(unittest.TestCase):
+    def test_hits_misses_and_eviction(self):
+        """
+        Test LRU order and the hit, miss and eviction counters.
+        """
+        cache = QueryCache(maxsize=2)
+        self.assertIsNone(cache.get(("title", "dune")))
+        cache.put(("title", "dune"), [1])
+        cache.put(("author", "tolkien"), [2, 3])
+        self.assertEqual(cache.get(("title", "dune")), (1,))
+        cache.put(("year", "2023"), [4])
+        self.assertIsNone(cache.get(("author", "tolkien")))
+        self.assertEqual(cache.get(("year", "2023")), (4,))
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_invalidate(self):
+        """
+        Test that entries from an older generation are never returned.
+        """
+        cache = QueryCache()
+        cache.put(("title", "dune"), [1])
+        cache.invalidate()
+        self.assertIsNone(cache.get(("title", "dune")))
+        self.assertEqual(len(cache), 0)
+        cache.put(("title", "dune"), [1, 2])
+        self.assertEqual(cache.get(("title", "dune")), (1, 2))
+
+    def test_disabled(self):
+        """
+        Test that a cache of size 0 stores nothing.
+        """
+        cache = QueryCache(maxsize=0)
+        cache.put(("title", "dune"), [1])
+        self.assertIsNone(cache.get(("title", "dune")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+from library.catalog import BookCatalog
+from library.columnar import ColumnarView
+from library.exceptions import ValidationError
+from library.models import Book
+from library.query_engine import And, Condition, Or, parse_query, run_query
+
+
+class TestParseQuery(unittest.TestCase):
+    def test_implicit_and_and_precedence(self):
+        """
+        Test that adjacent conditions are ANDed and AND binds tighter than OR.
+        """
+        node = parse_query('author:tolkien year:1990-2000 OR title:"war and peace" AND status:borrowed')
+        self.assertIsInstance(node, Or)
+        self.assertIsInstance(node.children[0], And)
+        self.assertEqual(str(node.children[1]), 'title contains "war and peace" AND status = borrowed')
+
+    def test_parentheses(self):
+        """
+        Test grouping with parentheses and case-insensitive operators.
+        """
+        node = parse_query("(title:война or title:мир) and year:>=1900")
+        self.assertIsInstance(node, And)
+        self.assertIsInstance(node.children[0], Or)
+        self.assertEqual(str(node), '(title contains "война" OR title contains "мир") AND year >=1900')
+
+    def test_invalid_queries(self):
+        """
+        Test that malformed expressions raise ValidationError.
+        """
+        for expression in ("", "tolkien", "author:", "color:red", "year:soon", "status:lost",
+                           "(author:tolkien", "author:tolkien)", "author:tolkien AND", 'title:"open'):
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValidationError):
+                    parse_query(expression)
+
+
+class TestRunQuery(unittest.TestCase):
+    def setUp(self):
+        """
+        Build a catalog with a few authors, years and statuses.
+        """
+        self.books = BookCatalog([
+            Book(1, "The Hobbit", "J.R.R. Tolkien", 1937),
+            Book(2, "The Silmarillion", "J.R.R. Tolkien", 1977, "borrowed"),
+            Book(3, "Unfinished Tales", "J.R.R. Tolkien", 1980),
+            Book(4, "Dune", "Frank Herbert", 1965),
+            Book(5, "Война и мир", "Лев Толстой", 1869),
+            Book(6, "Children of Dune", "Frank Herbert", 1976, "borrowed"),
+        ])
+
+    def ids(self, expression, **options):
+        return [book.id for book in run_query(self.books, parse_query(expression), **options).books]
+
+    def test_combined_predicates(self):
+        """
+        Test AND/OR combinations over title, author, year and status.
+        """
+        self.assertEqual(self.ids("author:tolkien year:1970-1990 status:available"), [3])
+        self.assertEqual(self.ids("author:herbert OR title:hobbit"), [1, 4, 6])
+        self.assertEqual(self.ids("(author:herbert OR author:толстой) status:available"), [4, 5])
+        self.assertEqual(self.ids("title:война"), [5])
+
+    def test_planner_picks_most_selective_index(self):
+        """
+        Test that the smallest index path is chosen and only its candidates are examined.
+        """
+        result = run_query(self.books, parse_query("author:tolkien year:1965"))
+        self.assertEqual(result.plan["access"], "year index (1965)")
+        self.assertEqual(result.plan["rows_examined"], 1)
+        self.assertEqual(result.books, [])
+
+        result = run_query(self.books, parse_query("status:borrowed"))
+        self.assertEqual(result.plan["access"], "full scan")
+        self.assertEqual(result.plan["rows_examined"], 6)
+
+        result = run_query(self.books, parse_query("title:hobbit OR year:1965"))
+        self.assertTrue(result.plan["access"].startswith("union of"))
+        self.assertEqual([book.id for book in result.books], [1, 4])
+        self.assertIn("Access:   union of", result.explain())
+
+    def test_status_uses_columns(self):
+        """
+        Test that status conditions are answered from the columnar view when one is given.
+        """
+        view = ColumnarView(self.books.iter_by_id())
+        result = run_query(self.books, parse_query("status:borrowed"), columns=lambda: view)
+        self.assertEqual(result.plan["access"], "status/year columns (status = borrowed)")
+        self.assertEqual(result.plan["rows_examined"], 2)
+        self.assertEqual([book.id for book in result.books], [2, 6])
+
+        result = run_query(self.books, parse_query("year:1930-1980 status:borrowed"), columns=lambda: view)
+        self.assertEqual(result.plan["access"],
+                         "status/year columns (status = borrowed, year 1930-1980)")
+        self.assertEqual(result.plan["rows_examined"], 2)
+        self.assertEqual([book.id for book in result.books], [2, 6])
+
+    def test_sort_limit_offset(self):
+        """
+        Test sorting, paging and early termination for ID-ordered results.
+        """
+        self.assertEqual(self.ids("year:>=1900", sort="-year"), [3, 2, 6, 4, 1])
+        self.assertEqual(self.ids("year:>=1900", sort="title", limit=2), [6, 4])
+        result = run_query(self.books, parse_query("status:available"), limit=2, offset=1)
+        self.assertEqual([book.id for book in result.books], [3, 4])
+        self.assertTrue(result.plan["stopped_early"])
+        self.assertEqual(result.plan["rows_examined"], 4)
+        with self.assertRaises(ValidationError):
+            run_query(self.books, parse_query("status:available"), sort="color")
+        with self.assertRaises(ValidationError):
+            run_query(self.books, parse_query("status:available"), limit=-1)
+        with self.assertRaises(ValidationError):
+            run_query(self.books, parse_query("status:available"), sort=5)
+        # offset=None (e.g. "offset": null in a batch line) means no offset
+        result = run_query(self.books, parse_query("status:available"), limit=1, offset=None)
+        self.assertEqual([book.id for book in result.books], [1])
+
+    def test_condition_matches_like_filter_books(self):
+        """
+        Test that a single condition uses the same normalization as filter_books.
+        """
+        self.assertTrue(Condition("title", "ВОЙНА").matches(self.books.get_by_id(5)))
+        self.assertFalse(Condition("year", "<1900").matches(self.books.get_by_id(1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import os
+import threading
+import unittest
+from unittest.mock import patch
+from library.library_management import Library
+from library.server import LibraryServer, route, HttpError
+from library.exceptions import ValidationError
+
+
+async def request(port, method, path, body=None):
+    """
+    Send one HTTP request over a fresh connection and return (status, payload).
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n"
+        f"Connection: close\r\n\r\n".encode("latin-1") + data
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+class TestRoute(unittest.TestCase):
+    def test_routes(self):
+        """
+        Test that HTTP requests map to batch commands.
+        """
+        self.assertEqual(route("GET", "/books/7", b""), ({"op": "get", "id": 7}, False))
+        self.assertEqual(route("GET", "/books?type=title&query=war%20and", b""),
+                         ({"op": "search", "type": "title", "query": "war and"}, False))
+        self.assertEqual(route("GET", "/books?where=author%3Atolkien%20year%3A1937&sort=-year&limit=5", b""),
+                         ({"op": "find", "where": "author:tolkien year:1937", "sort": "-year", "limit": 5}, False))
+        self.assertEqual(route("DELETE", "/books/3", b""), ({"op": "delete", "id": 3}, True))
+        self.assertEqual(route("PUT", "/books/3/status", b'{"status": "borrowed"}'),
+                         ({"op": "status", "id": 3, "status": "borrowed"}, True))
+        command, write = route("POST", "/books", b'{"title": "Dune", "author": "Frank Herbert", "year": 1965}')
+        self.assertTrue(write)
+        self.assertEqual(command["op"], "add")
+
+    def test_invalid_routes(self):
+        """
+        Test unknown paths, methods and malformed IDs or bodies.
+        """
+        with self.assertRaises(HttpError) as context:
+            route("GET", "/authors", b"")
+        self.assertEqual(context.exception.status, 404)
+        with self.assertRaises(HttpError) as context:
+            route("PATCH", "/books/1", b"")
+        self.assertEqual(context.exception.status, 405)
+        with self.assertRaises(ValidationError):
+            route("GET", "/books/abc", b"")
+        with self.assertRaises(ValidationError):
+            route("GET", "/books?where=year%3A1937&limit=ten", b"")
+        with self.assertRaises(ValidationError):
+            route("POST", "/books", b"[1, 2]")
+
+
+@patch("builtins.print")
+class TestLibraryServer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """
+        Set up an empty library backed by a temporary file.
+        """
+        self.temp_books_file = "test_server_books.json"
+        with patch("builtins.print"):
+            self.library = Library(books_file=self.temp_books_file)
+
+    def tearDown(self):
+        """
+        Clean up the temporary books file.
+        """
+        for path in (self.temp_books_file, self.temp_books_file + ".meta"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def test_crud_over_http(self, mock_print):
+        """
+        Test add, get, search, status change and delete against a local port.
+        """
+        async with LibraryServer(self.library, port=0) as server:
+            status, payload = await request(server.port, "POST", "/books",
+                                            {"title": "Dune", "author": "Frank Herbert", "year": 1965})
+            self.assertEqual(status, 201)
+            self.assertEqual(payload["result"]["id"], 1)
+
+            status, payload = await request(server.port, "POST", "/books",
+                                            {"title": "Dune", "author": "Frank Herbert", "year": 1965})
+            self.assertEqual((status, payload["error"]), (409, "DuplicateBookError"))
+
+            status, payload = await request(server.port, "PUT", "/books/1/status", {"status": "borrowed"})
+            self.assertEqual((status, payload["result"]["status"]), (200, "borrowed"))
+
+            status, payload = await request(server.port, "GET", "/books?type=author&query=herbert")
+            self.assertEqual([book["id"] for book in payload["result"]], [1])
+
+            status, payload = await request(server.port, "GET", "/books?type=year&query=abc")
+            self.assertEqual((status, payload["error"]), (400, "ValidationError"))
+
+            status, payload = await request(server.port, "DELETE", "/books/1")
+            self.assertEqual(status, 200)
+            status, payload = await request(server.port, "GET", "/books/1")
+            self.assertEqual((status, payload["error"]), (404, "BookNotFoundError"))
+
+        # Changes are persisted before the client gets a response
+        with open(self.temp_books_file, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), [])
+
+    async def test_concurrent_writes_are_batched(self, mock_print):
+        """
+        Test that concurrent writes are all applied and persisted in fewer saves.
+        """
+        async with LibraryServer(self.library, port=0) as server:
+            with patch.object(self.library, "save_books", wraps=self.library.save_books) as mock_save:
+                responses = await asyncio.gather(*(
+                    request(server.port, "POST", "/books", {"title": f"Book {i}", "author": "Author", "year": 2000})
+                    for i in range(20)
+                ))
+        self.assertTrue(all(status == 201 for status, _ in responses))
+        self.assertEqual(sorted(payload["result"]["id"] for _, payload in responses), list(range(1, 21)))
+        self.assertLess(mock_save.call_count, 20)
+        with open(self.temp_books_file, "r", encoding="utf-8") as file:
+            self.assertEqual(len(json.load(file)), 20)
+
+    async def test_writer_survives_unexpected_error(self, mock_print):
+        """
+        Test that an unexpected error in one write returns 500 and later writes still complete.
+        """
+        database = "test_server_books.sqlite"
+        library = Library(books_file=database)
+        try:
+            async with LibraryServer(library, port=0) as server:
+                # SQLite rejects IDs beyond 64 bits with OverflowError
+                status, payload = await asyncio.wait_for(
+                    request(server.port, "DELETE", "/books/99999999999999999999"), 5)
+                self.assertEqual((status, payload["error"]), (500, "OverflowError"))
+                status, payload = await asyncio.wait_for(
+                    request(server.port, "POST", "/books", {"title": "Dune", "author": "Frank Herbert", "year": 1965}),
+                    5)
+                self.assertEqual((status, payload["result"]["id"]), (201, 1))
+        finally:
+            library.storage.close()
+            for suffix in ("", "-journal", "-wal", "-shm"):
+                if os.path.exists(database + suffix):
+                    os.remove(database + suffix)
+
+    async def test_failed_save_is_reported(self, mock_print):
+        """
+        Test that a write whose batch could not be saved gets 500 instead of a success.
+        """
+        async with LibraryServer(self.library, port=0) as server:
+            with patch.object(self.library.storage, "write_snapshot", side_effect=OSError("disk full")):
+                status, payload = await request(server.port, "POST", "/books",
+                                                {"title": "Dune", "author": "Frank Herbert", "year": 1965})
+            self.assertEqual((status, payload["ok"]), (500, False))
+            self.assertTrue(self.library.dirty)
+
+    async def test_reads_run_concurrently(self, mock_print):
+        """
+        Test that two slow reads overlap instead of running one after another on the event loop.
+        """
+        library = Library(books_file=self.temp_books_file, thread_safe=True)
+        library.add("Dune", "Frank Herbert", 1965)
+        # Each read waits until the other one has started; sequential reads would time out
+        barrier = threading.Barrier(2, timeout=5)
+        get = library.get
+
+        def slow_get(book_id):
+            barrier.wait()
+            return get(book_id)
+
+        async with LibraryServer(library, port=0) as server:
+            with patch.object(library, "get", side_effect=slow_get):
+                responses = await asyncio.gather(request(server.port, "GET", "/books/1"),
+                                                 request(server.port, "GET", "/books/1"))
+            self.assertEqual([status for status, _ in responses], [200, 200])
+            status, payload = await request(server.port, "POST", "/books",
+                                            {"title": "Emma", "author": "Jane Austen", "year": 1815})
+            self.assertEqual((status, payload["result"]["id"]), (201, 2))
+
+    async def test_keep_alive(self, mock_print):
+        """
+        Test that several requests can share one connection.
+        """
+        self.library.add("Dune", "Frank Herbert", 1965)
+        async with LibraryServer(self.library, port=0) as server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            for _ in range(3):
+                writer.write(b"GET /books/1 HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                await writer.drain()
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.assertIn(b"200 OK", head)
+                length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                payload = json.loads(await reader.readexactly(length))
+                self.assertEqual(payload["result"]["title"], "Dune")
+            writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
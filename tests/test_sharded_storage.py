@@ -0,0 +1,174 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+from library.catalog import BookCatalog
+from library.library_management import Library
+from library.models import Book
+from library.sharded_storage import MANIFEST_FILE, ShardedStorage, main, migrate_to_shards
+from library.storage import JsonStorage, open_storage
+
+
+class TestShardedStorage(unittest.TestCase):
+    def setUp(self):
+        """
+        Create a temporary directory for the shards.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.directory = os.path.join(self.temp_dir, "books.shards")
+
+    def shard_files(self) -> list[str]:
+        return sorted(name for name in os.listdir(self.directory) if name.startswith("shard-"))
+
+    def test_save_and_load(self):
+        """
+        Test that books are split by ID range and read back with the ID counter.
+        """
+        storage = ShardedStorage(self.directory, shard_size=10)
+        books = BookCatalog(Book(i, f"Title {i}", "Author", 2000) for i in range(1, 26))
+        books.remove_by_id(25)
+        storage.save(books)
+        self.assertEqual(self.shard_files(), ["shard-00000.json", "shard-00001.json", "shard-00002.json"])
+
+        reloaded = ShardedStorage(self.directory, shard_size=3).load()
+        self.assertEqual([book.to_dict() for book in reloaded], [book.to_dict() for book in books])
+        self.assertEqual(reloaded.next_id, 26)
+
+    def test_only_changed_shards_are_written(self):
+        """
+        Test that commit and save rewrite only the shards whose books changed.
+        """
+        storage = ShardedStorage(self.directory, shard_size=10)
+        storage.save(BookCatalog(Book(i, f"Title {i}", "Author", 2000) for i in range(1, 31)))
+        storage = ShardedStorage(self.directory)
+        books = storage.load()
+        # Make any rewrite visible even on filesystems with coarse timestamps
+        for name in self.shard_files():
+            os.utime(os.path.join(self.directory, name), ns=(0, 0))
+
+        books.update_status(15, "borrowed")
+        storage.commit(books, "status", id=15, status="borrowed")
+        storage.save(books)
+        changed = [name for name in self.shard_files() if os.stat(os.path.join(self.directory, name)).st_mtime_ns]
+        self.assertEqual(changed, ["shard-00001.json"])
+
+        # Deleting every book of a shard removes its file and its manifest entry
+        for book_id in range(21, 31):
+            books.remove_by_id(book_id)
+        storage.save(books)
+        self.assertEqual(self.shard_files(), ["shard-00000.json", "shard-00001.json"])
+        with open(os.path.join(self.directory, MANIFEST_FILE)) as file:
+            self.assertEqual(json.load(file)["shards"], [0, 1])
+        self.assertEqual(ShardedStorage(self.directory).load().get_by_id(15).status, "borrowed")
+
+    def test_save_writes_only_tracked_shards(self):
+        """
+        Test that save rewrites only shards touched since the last save, including after a full save.
+        """
+        storage = ShardedStorage(self.directory, shard_size=10)
+        books = BookCatalog(Book(i, f"Title {i}", "Author", 2000) for i in range(1, 31))
+        storage.save(books)
+
+        def rewritten():
+            names = [name for name in self.shard_files() if os.stat(os.path.join(self.directory, name)).st_mtime_ns]
+            for name in self.shard_files():
+                os.utime(os.path.join(self.directory, name), ns=(0, 0))
+            return names
+
+        rewritten()
+        # The catalog saved in full is tracked from then on
+        books.remove_by_id(5)
+        books.append(Book(31, "Title 31", "Author", 2000))
+        with patch.object(storage, "_shard_books", wraps=storage._shard_books) as mock_shard_books:
+            storage.save(books)
+        # Untouched shards are not even sliced out of the catalog
+        self.assertEqual(mock_shard_books.call_count, 2)
+        self.assertEqual(rewritten(), ["shard-00000.json", "shard-00003.json"])
+        storage.save(books)
+        self.assertEqual(rewritten(), [])
+
+        # A rebuilt catalog is saved in full
+        books[0:1] = []
+        storage.save(books)
+        self.assertEqual(rewritten(), self.shard_files())
+        reloaded = ShardedStorage(self.directory).load()
+        self.assertEqual([book.id for book in reloaded], [book.id for book in books])
+
+    def test_unreadable_shard_is_preserved(self):
+        """
+        Test that a corrupted shard is skipped on load and never overwritten.
+        """
+        storage = ShardedStorage(self.directory, shard_size=10)
+        storage.save(BookCatalog(Book(i, f"Title {i}", "Author", 2000) for i in range(1, 21)))
+        with open(os.path.join(self.directory, "shard-00000.json"), "w") as file:
+            file.write("[{broken")
+        storage = ShardedStorage(self.directory)
+        with redirect_stdout(StringIO()):
+            books = storage.load()
+        self.assertEqual([book.id for book in books], list(range(11, 21)))
+        storage.save(books)
+        with open(os.path.join(self.directory, "shard-00000.json")) as file:
+            self.assertEqual(file.read(), "[{broken")
+
+    def test_new_book_in_unreadable_shard(self):
+        """
+        Test that a book added to a corrupted shard's range never replaces the shard file.
+        """
+        storage = ShardedStorage(self.directory, shard_size=10)
+        storage.save(BookCatalog(Book(i, f"Title {i}", "Author", 2000) for i in range(1, 4)))
+        with open(os.path.join(self.directory, "shard-00000.json"), "w") as file:
+            file.write("[{broken")
+        storage = ShardedStorage(self.directory)
+        output = StringIO()
+        with redirect_stdout(output):
+            books = storage.load()
+            books.append(Book(4, "Title 4", "Author", 2000))
+            books.append(Book(11, "Title 11", "Author", 2000))
+            storage.save(books)
+        self.assertIn("shard-00000.json", output.getvalue().splitlines()[-1])
+        with open(os.path.join(self.directory, "shard-00000.json")) as file:
+            self.assertEqual(file.read(), "[{broken")
+        # Books outside the unreadable shard are still saved
+        with open(os.path.join(self.directory, MANIFEST_FILE)) as file:
+            self.assertEqual(json.load(file)["shards"], [0, 1])
+        with redirect_stdout(StringIO()):
+            self.assertEqual([book.id for book in ShardedStorage(self.directory).load()], [11])
+
+    def test_library_and_migration(self):
+        """
+        Test migrating books.json into shards and using the shards from Library.
+        """
+        books_file = os.path.join(self.temp_dir, "books.json")
+        JsonStorage(books_file).save(BookCatalog([Book(1, "The Hobbit", "J.R.R. Tolkien", 1937),
+                                                  Book(2, "Dune", "Frank Herbert", 1965)]))
+        with redirect_stdout(StringIO()):
+            self.assertEqual(main([books_file, self.directory, "--shard-size", "1"]), 0)
+            self.assertEqual(main([books_file, self.directory]), 1)
+        self.assertIsInstance(open_storage(self.directory), ShardedStorage)
+        self.assertEqual(len(JsonStorage(books_file).load()), 2)
+
+        library = Library(books_file=self.directory)
+        self.assertEqual(library.add("Emma", "Jane Austen", 1815).id, 3)
+        library.delete(1)
+        self.assertEqual(self.shard_files(), ["shard-00001.json", "shard-00002.json"])
+        reloaded = Library(books_file=self.directory)
+        self.assertEqual([book.title for book in reloaded.books], ["Dune", "Emma"])
+
+    def test_migrate_refuses_existing_target(self):
+        """
+        Test that migration never overwrites an existing sharded library.
+        """
+        books_file = os.path.join(self.temp_dir, "books.json")
+        JsonStorage(books_file).save(BookCatalog([Book(1, "Dune", "Frank Herbert", 1965)]))
+        migrate_to_shards(books_file, self.directory)
+        with self.assertRaises(FileExistsError):
+            migrate_to_shards(books_file, self.directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import unittest
+from unittest.mock import patch
+from library.library_management import Library
+from library.models import Book
+from library.sqlite_storage import SqliteCatalog, SqliteStorage
+from library.storage import JsonStorage, StorageBackend, open_storage
+
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a library backed by a temporary SQLite database.
+        """
+        self.database = "test_books.sqlite"
+        self.library = Library(books_file=self.database)
+        self.library.books.extend([
+            Book(1, "The Hobbit", "J.R.R. Tolkien", 1937),
+            Book(2, "Новая Книга", "Арка", 2019, "borrowed"),
+            Book(3, "Silmarillion", "J.R.R. Tolkien", 1977),
+        ])
+        self.library.save_books()
+
+    def tearDown(self):
+        """
+        Close the connection and remove the temporary database.
+        """
+        self.library.storage.close()
+        if os.path.exists(self.database):
+            os.remove(self.database)
+
+    def reopen(self) -> Library:
+        self.library.storage.close()
+        self.library = Library(books_file=self.database)
+        return self.library
+
+    def test_backend_selection(self):
+        """
+        Test that the storage backend is picked by file extension.
+        """
+        self.assertIsInstance(self.library.storage, SqliteStorage)
+        self.assertIsInstance(self.library.books, SqliteCatalog)
+        self.assertIsInstance(open_storage("books.json"), JsonStorage)
+
+    def test_backend_must_implement_load_and_save(self):
+        """
+        Test that a storage backend without load or save cannot be instantiated.
+        """
+        class LoadOnly(StorageBackend):
+            def load(self):
+                return []
+
+        with self.assertRaises(TypeError):
+            StorageBackend()
+        with self.assertRaises(TypeError):
+            LoadOnly()
+
+    def test_lookup_and_search_pushdown(self):
+        """
+        Test ID lookups, duplicate checks and searches executed as SQL.
+        """
+        books = self.reopen().books
+        self.assertEqual(len(books), 3)
+        self.assertEqual(books.get_by_id(2).title, "Новая Книга")
+        self.assertTrue(books.find_duplicate("the hobbit", "j.r.r. tolkien", 1937))
+        self.assertEqual([book.id for book in books.find_candidates("author", "tolkien")], [1, 3])
+        self.assertEqual([book.id for book in books.find_candidates("title", "книга")], [2])
+        self.assertEqual([book.id for book in books.find_candidates("year", "1900-1950")], [1])
+        self.assertEqual([book.id for book in books.find_by_year(start=1970)], [2, 3])
+
+    @patch("builtins.input", side_effect=["Dune", "Frank Herbert", "1965", "3", "2", "1"])
+    def test_menu_operations_are_committed(self, mock_input):
+        """
+        Test that add, delete and status change are persisted transactionally.
+        """
+        self.library.add_book()
+        self.library.delete_book()
+        self.library.change_status()
+
+        books = self.reopen().books
+        self.assertEqual([book.id for book in books], [1, 2, 4])
+        self.assertEqual(books.get_by_id(4).title, "Dune")
+        self.assertEqual(books.get_by_id(2).status, "available")
+
+    @patch("builtins.input", side_effect=["3", "Dune", "Frank Herbert", "1965"])
+    def test_ids_not_reused(self, mock_input):
+        """
+        Test that the persistent ID counter survives deleting the last book.
+        """
+        self.library.delete_book()
+        self.reopen().add_book()
+        self.assertEqual(self.library.books.max_id(), 4)
+
+    def test_search_keys_are_recomputed(self):
+        """
+        Test that keys stored by older normalization rules are rebuilt on open.
+        """
+        connection = self.library.storage.connection
+        connection.execute("UPDATE books SET title_key = 'stale'")
+        connection.execute("DELETE FROM meta WHERE name = 'key_version'")
+        connection.commit()
+        books = self.reopen().books
+        self.assertEqual([book.id for book in books.find_candidates("title", "НОВАЯ")], [2])
+        self.assertTrue(books.find_duplicate("THE HOBBIT", "J.R.R. Tolkien", 1937))
+
+
+if __name__ == "__main__":
+    unittest.main()
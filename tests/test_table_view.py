@@ -0,0 +1,131 @@
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from library.catalog import BookCatalog
+from library.models import Book
+from library.table_view import HEADER, SEPARATOR, TablePager, format_row, render_table, truncate
+
+
+class CountingOutput(StringIO):
+    """
+    StringIO that counts write calls.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def make_catalog(count: int) -> BookCatalog:
+    return BookCatalog(Book(i, f"Title {i}", "Author", 2000) for i in range(1, count + 1))
+
+
+class TestFormatting(unittest.TestCase):
+    def test_truncate_and_row(self):
+        """
+        Test that long titles and authors are cut to the column width.
+        """
+        self.assertEqual(truncate("Dune", 30), "Dune")
+        self.assertEqual(truncate("x" * 31, 30), "x" * 29 + "…")
+        book = Book(7, "A" * 40, "Very Long Author Name Here", 1999, "borrowed")
+        row = format_row(book)
+        self.assertEqual(len(row), len(SEPARATOR))
+        self.assertEqual(row, f"{7:<5} {'A' * 29 + '…':<30} {'Very Long Author Na…':<20} {1999:<6} {'borrowed':<10}")
+
+    def test_render_table(self):
+        """
+        Test that a table is built as one string with an optional header.
+        """
+        books = [Book(1, "Dune", "Frank Herbert", 1965)]
+        self.assertEqual(render_table(books), f"{HEADER}\n{SEPARATOR}\n{format_row(books[0])}\n")
+        self.assertEqual(render_table(books, header=False), f"{format_row(books[0])}\n")
+        self.assertEqual(render_table([], header=False), "")
+
+
+class TestTablePager(unittest.TestCase):
+    def test_interactive_navigation(self):
+        """
+        Test next, previous, jump to ID and quit, with one write per page.
+        """
+        output = CountingOutput()
+        pager = TablePager(make_catalog(25), page_size=10, output=output)
+        commands = ["", "", "", "p", "p", "p", "23", "99", "x", "q"]
+        with patch("builtins.input", side_effect=commands), patch("builtins.print") as mock_print:
+            pager.show(interactive=True)
+        self.assertEqual(pager.page, 2)
+        # Pages 1, 2, 3, 2, 1 and page 3 after the jump; messages are printed separately
+        self.assertEqual(output.writes, 6)
+        self.assertIn("Страница 3 из 3 (книги 21-25 из 25)", output.getvalue())
+        mock_print.assert_any_call("Это последняя страница.")
+        mock_print.assert_any_call("Это первая страница.")
+        mock_print.assert_any_call("Книга с ID 99 не найдена.")
+        mock_print.assert_any_call("Неизвестная команда.")
+
+    def test_single_page_does_not_prompt(self):
+        """
+        Test that a table that fits on one page is written without asking for input.
+        """
+        output = CountingOutput()
+        with patch("builtins.input") as mock_input:
+            TablePager(make_catalog(3), page_size=10, output=output).show(interactive=True)
+        mock_input.assert_not_called()
+        self.assertEqual(output.writes, 1)
+        self.assertTrue(output.getvalue().endswith("Страница 1 из 1 (книги 1-3 из 3)\n"))
+
+    def test_stream_is_read_lazily(self):
+        """
+        Test that an iterator source is consumed only as far as the pages shown.
+        """
+        consumed = []
+
+        def books():
+            for book in make_catalog(1000):
+                consumed.append(book.id)
+                yield book
+
+        pager = TablePager(books(), page_size=10, output=StringIO())
+        self.assertEqual([book.id for book in pager.page_books()], list(range(1, 11)))
+        self.assertIn("Страница 1 (книги 1-10, есть еще)", pager.render_page())
+        self.assertLessEqual(len(consumed), 11)
+        self.assertIsNone(pager.total())
+
+        self.assertEqual(pager.find_page(305), 30)
+        self.assertLess(len(consumed), 320)
+        self.assertIsNone(pager.find_page(5000))
+        self.assertEqual(pager.total(), 1000)
+
+    def test_jump_in_unordered_results(self):
+        """
+        Test jumping to an ID when rows are not sorted by ID.
+        """
+        books = list(reversed(make_catalog(30)))
+        pager = TablePager(books, page_size=10, ordered_by_id=False)
+        self.assertEqual(pager.find_page(1), 2)
+        self.assertIsNone(pager.find_page(31))
+
+    def test_non_interactive_output(self):
+        """
+        Test that non-interactive output writes every row once, one chunk per page.
+        """
+        for source in (make_catalog(25), iter(make_catalog(25))):
+            output = CountingOutput()
+            TablePager(source, page_size=10, output=output).show(interactive=False)
+            lines = output.getvalue().splitlines()
+            self.assertEqual(lines[:2], [HEADER, SEPARATOR])
+            self.assertEqual(len(lines), 27)
+            self.assertEqual(output.writes, 3)
+
+    def test_invalid_page_size(self):
+        """
+        Test that the page size must be positive.
+        """
+        with self.assertRaises(ValueError):
+            TablePager([], page_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()